@@ -0,0 +1,227 @@
+# File: client_demo/benchmarks/attendance_math.py
+# Micro-benchmarks for the pure attendance functions
+# ============================================================
+# Needs frappe importable (bench virtualenv) but no site. Run with:
+#   ./env/bin/python -m client_demo.benchmarks.attendance_math
+#   ./env/bin/python -m client_demo.benchmarks.attendance_math --update-baseline
+#
+# Each benchmark runs on synthetic data at 1x, 10x and 100x our scale
+# (1x = 50 employees, 31 days, 4 punches a day) and reports ops/sec and
+# peak memory of one call. Results are compared with the stored baseline
+# (baselines/attendance_math.json, committed from the reference machine).
+# When that file does not exist yet, the first run writes it, says so and
+# exits 0; commit the file it wrote. Otherwise the exit status is non-zero
+# when any case is slower than --tolerance, or when a case is missing from
+# the baseline, so a new benchmark cannot pass as "no regressions".
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+import frappe
+
+from client_demo.services.checkin_dummy import (
+    calculate_daily_work_hours,
+    calculate_effective_working_days,
+    calculate_period_average_upto_yesterday,
+    process_daily_summaries,
+)
+from client_demo.services.remote_attendance import build_checkin_pairs
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "attendance_math.json")
+
+SCALES = {"1x": 1, "10x": 10, "100x": 100}
+EMPLOYEES = 50
+DAYS = 31
+START_DATE = date(2026, 1, 1)
+MIN_SECONDS = 0.5
+REPEATS = 3
+
+
+# ============================================================
+# SYNTHETIC DATA
+# ============================================================
+
+def _day_punches(rng, employee, day, pairs):
+    """
+    IN/OUT pairs through the day with a little jitter, like real devices produce.
+    """
+    logs = []
+    minute = 8 * 60 + rng.randint(0, 60)
+    for _ in range(pairs):
+        for log_type in ("IN", "OUT"):
+            logs.append(frappe._dict(
+                employee=employee,
+                department="Operations",
+                time=datetime.combine(day, datetime.min.time()) + timedelta(minutes=minute),
+                log_type=log_type,
+                end_time=timedelta(hours=18)
+            ))
+            minute += max(1, (600 // (pairs * 2)) + rng.randint(-2, 2))
+    return logs
+
+
+def _one_day(factor):
+    rng = random.Random(factor)
+    return _day_punches(rng, "EMP-0001", START_DATE, 2 * factor)
+
+
+def _checkin_rows(factor):
+    rng = random.Random(factor)
+    rows = []
+    for e in range(EMPLOYEES * factor):
+        for d in range(DAYS):
+            rows.extend(_day_punches(rng, f"EMP-{e:05d}", START_DATE + timedelta(days=d), 2))
+    return rows
+
+
+def _working_days_args(factor):
+    rng = random.Random(factor)
+    end = START_DATE + timedelta(days=DAYS * factor - 1)
+    days = [START_DATE + timedelta(days=i) for i in range(DAYS * factor)]
+    holidays = [d for d in days if rng.random() < 0.05]
+    leaves = {d.isoformat() for d in days if rng.random() < 0.05}
+    checkin_dates = {d for d in days if rng.random() < 0.8}
+    return START_DATE, end, holidays, leaves, checkin_dates
+
+
+def _period_average_args(factor):
+    start, end, holidays, leaves, checkin_dates = _working_days_args(factor)
+    records = [
+        {"date": d.isoformat(), "daily_working_hours": 8.0}
+        for d in sorted(checkin_dates)
+    ]
+    return records, start, end, holidays, leaves
+
+
+def _pairing_args(factor):
+    logs = _one_day(factor)
+    remote = [
+        frappe._dict(log_type=l.log_type, time=l.time, location_type="Field", workflow_state="Approved")
+        for l in logs[::2]
+    ]
+    checkins = [frappe._dict(log_type=l.log_type, time=l.time) for l in logs[1::2]]
+    return remote, checkins
+
+
+BENCHMARKS = {
+    "calculate_daily_work_hours": (_one_day, lambda logs: calculate_daily_work_hours(logs)),
+    "process_daily_summaries": (_checkin_rows, lambda rows: process_daily_summaries(rows)),
+    "calculate_effective_working_days": (_working_days_args, lambda args: calculate_effective_working_days(*args)),
+    "calculate_period_average_upto_yesterday": (
+        _period_average_args, lambda args: calculate_period_average_upto_yesterday(*args)
+    ),
+    "checkin_pairing": (_pairing_args, lambda args: build_checkin_pairs(*args)),
+}
+
+
+# ============================================================
+# RUNNER
+# ============================================================
+
+def measure(fn, data):
+    """
+    Best-of-REPEATS ops/sec, each repeat running for at least MIN_SECONDS,
+    plus the peak memory allocated by a single call.
+    """
+    best = 0.0
+    for _ in range(REPEATS):
+        loops = 0
+        started = time.perf_counter()
+        while True:
+            fn(data)
+            loops += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= MIN_SECONDS:
+                break
+        best = max(best, loops / elapsed)
+
+    tracemalloc.start()
+    fn(data)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"ops_per_sec": round(best, 2), "peak_kib": round(peak / 1024, 1)}
+
+
+def run(only=None):
+    results = {}
+    for name, (build, fn) in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        for scale, factor in SCALES.items():
+            results[f"{name}[{scale}]"] = measure(fn, build(factor))
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Print a table against the baseline and return the cases that regressed.
+    """
+    regressions = []
+    print(f"{'case':<52} {'ops/sec':>12} {'baseline':>12} {'change':>8} {'peak KiB':>10}")
+    for case, result in results.items():
+        base = baseline.get(case)
+        change = ""
+        if base and base["ops_per_sec"]:
+            ratio = result["ops_per_sec"] / base["ops_per_sec"]
+            change = f"{(ratio - 1) * 100:+.1f}%"
+            if ratio < 1 - tolerance:
+                regressions.append(case)
+        print(
+            f"{case:<52} {result['ops_per_sec']:>12.1f} "
+            f"{base['ops_per_sec'] if base else '-':>12} {change:>8} {result['peak_kib']:>10.1f}"
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--only", nargs="*", help="Run only these benchmarks")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before failing (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = run(args.only)
+
+    if not os.path.exists(BASELINE_PATH):
+        compare(results, {}, args.tolerance)
+        _write_baseline(results)
+        print(f"No baseline yet: wrote these results to {BASELINE_PATH}; commit it")
+        return 0
+
+    with open(BASELINE_PATH) as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.tolerance)
+    missing = [case for case in results if case not in baseline]
+
+    if args.update_baseline:
+        _write_baseline({**baseline, **results})
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0
+
+    if missing:
+        print(f"No baseline for {', '.join(missing)} in {BASELINE_PATH}; run with --update-baseline and commit it")
+        return 2
+    if regressions:
+        print(f"Slower than baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def _write_baseline(results):
+    os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+    with open(BASELINE_PATH, "w") as f:
+        json.dump(results, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+# File: client_demo/benchmarks/leave_approval.py
+# Compare bulk leave approval against one approve_leave call per leave
+# ============================================================
+# Run with:
+#   bench --site <site> execute client_demo.benchmarks.leave_approval.run \
+#       --kwargs "{'manager': 'HR-EMP-00001', 'count': 100}"
+#
+# Needs at least 2 x count open, unapproved leave applications for the
+# manager's reportees. Approvals are reset afterwards.
+
+import time
+
+import frappe
+
+from client_demo.services.leave_application import approve_leave, approve_leaves
+
+
+def run(manager, count=100):
+    count = int(count)
+    leaves = frappe.db.sql("""
+        SELECT la.name, la.employee
+        FROM `tabLeave Application` AS la
+        JOIN `tabEmployee` AS em ON la.employee = em.name
+        WHERE em.reports_to = %(manager)s
+          AND la.docstatus = 0
+          AND IFNULL(la.custom_approved_by, '') = ''
+        ORDER BY la.name
+        LIMIT %(limit)s
+    """, {"manager": manager, "limit": count * 2}, as_dict=True)
+
+    if len(leaves) < count * 2:
+        print(f"Need {count * 2} open leave applications for reportees of {manager}, found {len(leaves)}")
+        return
+
+    single_batch, bulk_batch = leaves[:count], leaves[count:]
+
+    try:
+        start = time.perf_counter()
+        for leave in single_batch:
+            approve_leave(leave.name, leave.employee)
+        single_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = approve_leaves([l.name for l in bulk_batch], manager)
+        bulk_seconds = time.perf_counter() - start
+    finally:
+        frappe.db.sql("""
+            UPDATE `tabLeave Application`
+            SET custom_approved_by = NULL
+            WHERE name IN %(names)s
+        """, {"names": [l.name for l in leaves]})
+        frappe.db.commit()
+
+    print(f"approve_leave x {count}:  {single_seconds:.3f}s ({single_seconds / count * 1000:.1f} ms/leave)")
+    print(f"approve_leaves ({count}): {bulk_seconds:.3f}s ({bulk_seconds / count * 1000:.1f} ms/leave)")
+    print(f"approved in bulk: {result.get('approved_count')}/{count}")
+    if bulk_seconds:
+        print(f"speedup: {single_seconds / bulk_seconds:.1f}x")
+
+    return {"single_seconds": single_seconds, "bulk_seconds": bulk_seconds}
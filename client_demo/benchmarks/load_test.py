@@ -0,0 +1,279 @@
+# File: client_demo/benchmarks/load_test.py
+# Load-test harness replaying the mobile app and biometric device traffic
+# ============================================================
+# Runs against a live site populated with client-demo-generate-data (the
+# same --employees count must be passed here). Needs httpx, installed with
+# the app's dev dependencies. Run with:
+#   ./env/bin/python -m client_demo.benchmarks.load_test --url http://site.local:8000 \
+#       --employees 10000 --concurrency 200 --duration 300 --api-key KEY --api-secret SECRET
+#
+# Three flows are replayed by `--concurrency` virtual users:
+#   device   a biometric device flushing a burst of punches (add_checkin)
+#   remote   an employee marking remote attendance, then refreshing the
+#            status screen (mark_remote_attendance, get_today_attendance_status)
+#   manager  a manager polling pending approvals and approving a batch of
+#            remote attendance and leaves (get_pending_approvals,
+#            approve_remote_attendance, get_unapproved_leaves, approve_leaves)
+# The first --rush-seconds use the --rush-mix (the morning rush at the
+# gates), the rest of the run uses --mix. p50/p95/p99 latency, throughput
+# and errors are reported per endpoint; the exit status is non-zero when
+# the error rate is above --max-error-rate.
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+import httpx
+
+from client_demo.benchmarks.synthetic_data import DEVICES, PREFIX, TEAM_SIZE, device_code, manager_user
+
+
+METHODS = {
+    "add_checkin": "client_demo.services.biometric_checkin_demo.add_checkin",
+    "mark_remote_attendance": "client_demo.services.remote_attendance.mark_remote_attendance",
+    "get_today_attendance_status": "client_demo.services.remote_attendance.get_today_attendance_status",
+    "get_pending_approvals": "client_demo.services.remote_attendance.get_pending_approvals",
+    "approve_remote_attendance": "client_demo.services.remote_attendance.approve_remote_attendance",
+    "get_unapproved_leaves": "client_demo.services.leave_application.get_unapproved_leaves",
+    "approve_leaves": "client_demo.services.leave_application.approve_leaves",
+}
+
+LOCATION_TYPES = ["Work From Home", "Field", "Service Center"]
+
+
+# ============================================================
+# STATS
+# ============================================================
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(Counter)
+
+    def record(self, endpoint, seconds, error=None):
+        self.latencies[endpoint].append(seconds)
+        if error:
+            self.errors[endpoint][error] += 1
+
+    def summary(self, elapsed):
+        rows = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            samples = sorted(samples)
+            errors = sum(self.errors[endpoint].values())
+            rows[endpoint] = {
+                "calls": len(samples),
+                "rps": round(len(samples) / elapsed, 2),
+                "p50": round(_percentile(samples, 50), 4),
+                "p95": round(_percentile(samples, 95), 4),
+                "p99": round(_percentile(samples, 99), 4),
+                "max": round(samples[-1], 4),
+                "errors": errors,
+                "error_rate": round(errors / len(samples), 4),
+                "error_kinds": dict(self.errors[endpoint]),
+            }
+        return rows
+
+
+def _percentile(samples, pct):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not samples:
+        return 0.0
+    rank = max(1, -(-len(samples) * pct // 100))
+    return samples[int(rank) - 1]
+
+
+# ============================================================
+# FLOWS
+# ============================================================
+
+class Session:
+    """
+    One virtual user: a shared httpx client plus the dataset it draws
+    employees, devices and managers from.
+    """
+
+    def __init__(self, client, stats, args, rng):
+        self.client = client
+        self.stats = stats
+        self.args = args
+        self.rng = rng
+
+    async def call(self, endpoint, **params):
+        """
+        POST to a whitelisted method. Returns the "message" payload, or None
+        when the call failed at the HTTP or application level.
+        """
+        started = time.perf_counter()
+        error = None
+        message = None
+        try:
+            response = await self.client.post(f"/api/method/{METHODS[endpoint]}", json=params)
+            if response.status_code >= 400:
+                error = f"HTTP {response.status_code}"
+            else:
+                message = response.json().get("message")
+                if isinstance(message, dict) and (
+                    message.get("success") is False or message.get("status") == "error"
+                ):
+                    error = "app error"
+        except httpx.HTTPError as e:
+            error = type(e).__name__
+        except ValueError:
+            error = "invalid JSON"
+
+        self.stats.record(endpoint, time.perf_counter() - started, error)
+        return None if error else message
+
+    def employee_index(self):
+        return self.rng.randrange(self.args.employees)
+
+    def manager_index(self):
+        return self.rng.randrange(max(1, (self.args.employees - 2) // TEAM_SIZE + 1))
+
+    async def device(self):
+        serial = f"{PREFIX}DEV-{self.rng.randrange(DEVICES):02d}"
+        for _ in range(self.rng.randint(1, self.args.burst)):
+            await self.call(
+                "add_checkin",
+                punchingcode=device_code(self.employee_index()),
+                employee_name="",
+                time=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                device_id=serial
+            )
+
+    async def remote(self):
+        employee = f"{PREFIX}EMP-{self.employee_index():06d}"
+        await self.call(
+            "mark_remote_attendance",
+            employee=employee,
+            latitude=12.9 + self.rng.random() / 10,
+            longitude=77.5 + self.rng.random() / 10,
+            location_type=self.rng.choice(LOCATION_TYPES)
+        )
+        await self.call("get_today_attendance_status", employee=employee)
+
+    async def manager(self):
+        index = self.manager_index()
+        user = manager_user(index, self.args.employees)
+        manager = f"{PREFIX}EMP-{index:06d}"
+
+        pending = await self.call("get_pending_approvals", user_id=user)
+        for request in ((pending or {}).get("data") or [])[:self.args.approve_batch]:
+            await self.call("approve_remote_attendance", name=request["name"], manager=manager)
+
+        leaves = await self.call("get_unapproved_leaves", user_id=user)
+        names = [leave["name"] for leave in ((leaves or {}).get("leaves") or [])[:self.args.approve_batch]]
+        if names:
+            await self.call("approve_leaves", leave_names=json.dumps(names), manager=manager)
+
+
+# ============================================================
+# RUNNER
+# ============================================================
+
+def parse_mix(value):
+    """
+    "device=60,remote=30,manager=10" -> {"device": 60.0, ...}
+    """
+    mix = {}
+    for part in value.split(","):
+        flow, _, weight = part.partition("=")
+        if flow.strip() not in ("device", "remote", "manager"):
+            raise argparse.ArgumentTypeError(f"Unknown flow {flow!r}")
+        mix[flow.strip()] = float(weight or 1)
+    return mix
+
+
+async def virtual_user(session, started, deadline):
+    args = session.args
+    while time.perf_counter() < deadline:
+        mix = args.rush_mix if time.perf_counter() - started < args.rush_seconds else args.mix
+        flow = session.rng.choices(list(mix), weights=list(mix.values()))[0]
+        await getattr(session, flow)()
+        if args.think:
+            await asyncio.sleep(session.rng.expovariate(1 / args.think))
+
+
+async def run(args):
+    stats = Stats()
+    headers = {"Accept": "application/json"}
+    if args.api_key:
+        headers["Authorization"] = f"token {args.api_key}:{args.api_secret}"
+    if args.site:
+        # Frappe picks the site from the Host header
+        headers["Host"] = args.site
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, limits=limits, timeout=args.timeout) as client:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            virtual_user(Session(client, stats, args, random.Random(args.seed + n)), started, deadline)
+            for n in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    return stats.summary(elapsed), elapsed
+
+
+def report(rows, elapsed):
+    print(f"{'endpoint':<30} {'calls':>8} {'rps':>8} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'max s':>8} {'errors':>8}")
+    for endpoint, r in rows.items():
+        print(
+            f"{endpoint:<30} {r['calls']:>8} {r['rps']:>8.1f} {r['p50']:>8.3f} {r['p95']:>8.3f} "
+            f"{r['p99']:>8.3f} {r['max']:>8.3f} {r['errors']:>8}"
+        )
+        for kind, count in r["error_kinds"].items():
+            print(f"    {kind}: {count}")
+    total = sum(r["calls"] for r in rows.values())
+    print(f"{total} calls in {elapsed:.1f}s ({total / elapsed:.1f}/s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay client_demo mobile and device traffic against a site")
+    parser.add_argument("--url", required=True, help="Base URL of the site, e.g. http://site.local:8000")
+    parser.add_argument("--site", help="Host header to send, when the URL does not name the site")
+    parser.add_argument("--employees", type=int, default=100, help="--employees used for client-demo-generate-data")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to run")
+    parser.add_argument("--rush-seconds", type=float, default=0, help="Length of the morning-rush phase")
+    parser.add_argument("--mix", type=parse_mix, default="device=30,remote=50,manager=20",
+                        help="Flow weights after the rush")
+    parser.add_argument("--rush-mix", type=parse_mix, default="device=85,remote=10,manager=5",
+                        help="Flow weights during the rush")
+    parser.add_argument("--burst", type=int, default=10, help="Most punches a device sends in one burst")
+    parser.add_argument("--approve-batch", type=int, default=5, help="Most requests a manager approves per poll")
+    parser.add_argument("--think", type=float, default=0.5, help="Mean think time between flows, seconds")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout, seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--api-key")
+    parser.add_argument("--api-secret")
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Fail above this overall error rate")
+    args = parser.parse_args(argv)
+
+    rows, elapsed = asyncio.run(run(args))
+    report(rows, elapsed)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"elapsed": round(elapsed, 2), "concurrency": args.concurrency, "endpoints": rows}, f, indent=1)
+            f.write("\n")
+
+    total = sum(r["calls"] for r in rows.values())
+    errors = sum(r["errors"] for r in rows.values())
+    if total and errors / total > args.max_error_rate:
+        print(f"Error rate {errors / total:.2%} is above {args.max_error_rate:.2%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
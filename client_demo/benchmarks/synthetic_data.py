@@ -0,0 +1,365 @@
+# File: client_demo/benchmarks/synthetic_data.py
+# Synthetic attendance dataset for load and scale testing
+# ============================================================
+# Run with:
+#   bench --site <site> client-demo-generate-data --employees 10000 --months 12 --seed 42
+#
+# Everything generated is named with the SYN- prefix so it can be removed
+# again with --clear. Rows are produced lazily and written with
+# frappe.db.bulk_insert in committed chunks, so memory stays flat and 10k
+# employees x 12 months (roughly 10M check-ins) takes minutes.
+
+import random
+from datetime import date, datetime, time, timedelta
+
+import frappe
+from frappe.utils import add_months, getdate, now_datetime, today
+
+
+PREFIX = "SYN-"
+CHUNK_SIZE = 10000
+TEAM_SIZE = 10
+DEVICES = 20
+
+SHIFTS = [
+    (f"{PREFIX}Morning", time(6), time(14)),
+    (f"{PREFIX}General", time(9), time(18)),
+    (f"{PREFIX}Evening", time(14), time(22)),
+]
+
+LOCATIONS = ["Head Office", "Plant 1", "Plant 2", "Warehouse", "Service Center"]
+LEAVE_TYPES = ["Casual Leave", "Sick Leave", "Privilege Leave"]
+REMOTE_STATES = ["Approved", "Approved", "Approved", "Rejected", "Cancelled"]
+LEAVE_STATES = [("Approved", 1), ("Approved", 1), ("Rejected", 1), ("Cancelled", 2), ("Open", 0)]
+
+COMMON_FIELDS = ["name", "creation", "modified", "modified_by", "owner", "docstatus"]
+
+
+def generate(employees=100, months=1, seed=42, company=None):
+    """
+    Create `employees` employees in a reports_to tree with shifts, holiday
+    lists, biometric device ids, a User for every manager and `months`
+    months of check-ins, remote attendance and leave applications ending today.
+    """
+    rng = random.Random(seed)
+    company = company or frappe.defaults.get_user_default("Company") or frappe.db.get_value("Company", {}, "name")
+    end_date = getdate(today())
+    start_date = getdate(add_months(end_date, -int(months)))
+
+    holiday_lists = _make_holiday_lists(start_date, end_date)
+    shifts = _make_shifts()
+    devices = _make_device_mapping()
+
+    staff = _make_employees(rng, int(employees), company, shifts, holiday_lists)
+    holidays = _get_holidays(holiday_lists)
+
+    _insert("Employee Checkin", *_checkin_rows(rng, staff, devices, holidays, start_date, end_date))
+    _insert("Remote Attendance", *_remote_attendance_rows(rng, staff, holidays, start_date, end_date))
+    _insert("Leave Application", *_leave_rows(rng, staff, company, start_date, end_date))
+
+    return {"employees": len(staff), "from_date": str(start_date), "to_date": str(end_date)}
+
+
+def clear():
+    """
+    Remove everything created by generate().
+    """
+    like = f"{PREFIX}%"
+    for doctype, field in (
+        ("Employee Checkin", "employee"),
+        ("Remote Attendance", "employee"),
+        ("Leave Application", "employee"),
+        ("Employee", "name"),
+        ("User", "name"),
+        ("Holiday", "parent"),
+        ("Holiday List", "name"),
+        ("Shift Type", "name"),
+    ):
+        frappe.db.sql(f"DELETE FROM `tab{doctype}` WHERE `{field}` LIKE %s", like)
+
+    if frappe.db.exists("DocType", "Biometric Device Mapping"):
+        mapping = frappe.get_single("Biometric Device Mapping")
+        mapping.table_sgvh = [r for r in mapping.table_sgvh if not (r.serial_number or "").startswith(PREFIX)]
+        mapping.save(ignore_permissions=True)
+
+    frappe.db.commit()
+
+
+# ============================================================
+# MASTER DATA
+# ============================================================
+
+def _make_holiday_lists(start_date, end_date):
+    """
+    One holiday list per location: weekends plus a few fixed public holidays.
+    """
+    names = []
+    for location in LOCATIONS:
+        name = f"{PREFIX}{location}"
+        names.append(name)
+        if frappe.db.exists("Holiday List", name):
+            continue
+
+        holidays = []
+        day = start_date
+        while day <= end_date:
+            if day.weekday() >= 5 or (day.month, day.day) in ((1, 1), (1, 26), (5, 1), (8, 15), (10, 2), (12, 25)):
+                holidays.append({"holiday_date": day, "description": "Weekly Off" if day.weekday() >= 5 else "Public Holiday"})
+            day += timedelta(days=1)
+
+        frappe.get_doc({
+            "doctype": "Holiday List",
+            "holiday_list_name": name,
+            "from_date": start_date,
+            "to_date": end_date,
+            "holidays": holidays
+        }).insert(ignore_permissions=True)
+
+    frappe.db.commit()
+    return names
+
+
+def _make_shifts():
+    for name, start_time, end_time in SHIFTS:
+        if not frappe.db.exists("Shift Type", name):
+            frappe.get_doc({
+                "doctype": "Shift Type",
+                "name": name,
+                "start_time": start_time,
+                "end_time": end_time
+            }).insert(ignore_permissions=True)
+    frappe.db.commit()
+    return [s[0] for s in SHIFTS]
+
+
+def _make_device_mapping():
+    """
+    Device serial -> location. Added to Biometric Device Mapping when that
+    doctype exists on the site.
+    """
+    devices = {f"{PREFIX}DEV-{i:02d}": LOCATIONS[i % len(LOCATIONS)] for i in range(DEVICES)}
+    if frappe.db.exists("DocType", "Biometric Device Mapping"):
+        mapping = frappe.get_single("Biometric Device Mapping")
+        existing = {r.serial_number for r in mapping.table_sgvh}
+        for serial, location in devices.items():
+            if serial not in existing:
+                mapping.append("table_sgvh", {"serial_number": serial, "location": location})
+        mapping.save(ignore_permissions=True)
+        frappe.db.commit()
+    return devices
+
+
+def _make_employees(rng, count, company, shifts, holiday_lists):
+    """
+    Employees in a TEAM_SIZE-ary reports_to tree: employee i reports to
+    employee (i - 1) // TEAM_SIZE, so managers exist at several levels.
+    """
+    current_time = now_datetime()
+    staff = []
+    rows = []
+    for i in range(count):
+        name = _employee_name(i)
+        reports_to = _manager_of(i)
+        location = rng.randrange(len(LOCATIONS))
+        employee = frappe._dict(
+            name=name,
+            shift=rng.choice(shifts),
+            holiday_list=holiday_lists[location],
+            location=LOCATIONS[location],
+            remote_worker=rng.random() < 0.2
+        )
+        staff.append(employee)
+        rows.append((
+            name, current_time, current_time, "Administrator", "Administrator", 0,
+            name, name, company, "Active", reports_to, device_code(i), manager_user(i, count),
+            employee.shift, employee.holiday_list, rng.choice(["Male", "Female"]),
+            date(1970 + rng.randrange(35), rng.randint(1, 12), rng.randint(1, 28)),
+            date(2015 + rng.randrange(10), rng.randint(1, 12), rng.randint(1, 28))
+        ))
+
+    _insert(
+        "User",
+        [*COMMON_FIELDS, "email", "first_name", "enabled", "user_type"],
+        (
+            (user, current_time, current_time, "Administrator", "Administrator", 0, user, _employee_name(i), 1,
+             "Website User")
+            for i in range(count)
+            if (user := manager_user(i, count))
+        )
+    )
+    _insert(
+        "Employee",
+        [*COMMON_FIELDS, "first_name", "employee_name", "company", "status", "reports_to", "attendance_device_id",
+         "user_id", "default_shift", "holiday_list", "gender", "date_of_birth", "date_of_joining"],
+        rows
+    )
+    return staff
+
+
+def _employee_name(i):
+    return f"{PREFIX}EMP-{i:06d}"
+
+
+def device_code(i):
+    """
+    Biometric punching code (attendance_device_id) of the i-th employee.
+    """
+    return f"SYN{i:07d}"
+
+
+def manager_user(i, employees):
+    """
+    Login of the i-th employee when they have reportees, else None. Only
+    managers get a User, which is all the approval endpoints need.
+    """
+    if i * TEAM_SIZE + 1 >= employees:
+        return None
+    return f"{_employee_name(i).lower()}@example.com"
+
+
+def _manager_of(i):
+    return _employee_name((i - 1) // TEAM_SIZE) if i else None
+
+
+def _get_holidays(holiday_lists):
+    holidays = {name: set() for name in holiday_lists}
+    for row in frappe.get_all("Holiday", filters={"parent": ["in", holiday_lists]}, fields=["parent", "holiday_date"]):
+        holidays[row.parent].add(row.holiday_date)
+    return holidays
+
+
+# ============================================================
+# TRANSACTIONS
+# ============================================================
+
+def _workdays(employee, holidays, start_date, end_date):
+    day = start_date
+    while day <= end_date:
+        if day not in holidays[employee.holiday_list]:
+            yield day
+        day += timedelta(days=1)
+
+
+def _checkin_rows(rng, staff, devices, holidays, start_date, end_date):
+    shift_start = {name: start for name, start, _end in SHIFTS}
+    serials_by_location = {}
+    for serial, location in devices.items():
+        serials_by_location.setdefault(location, []).append(serial)
+
+    with_location = frappe.db.has_column("Employee Checkin", "custom_device_location")
+    fields = [*COMMON_FIELDS, "employee", "employee_name", "time", "log_type", "device_id"]
+    if with_location:
+        fields.append("custom_device_location")
+
+    def rows():
+        current_time = now_datetime()
+        for employee in staff:
+            serials = serials_by_location[employee.location]
+            start_minute = shift_start[employee.shift].hour * 60
+            for day in _workdays(employee, holidays, start_date, end_date):
+                # About 5% absent, 20% take a punched lunch break
+                if rng.random() < 0.05:
+                    continue
+                minutes = [start_minute + rng.randint(-30, 30)]
+                if rng.random() < 0.2:
+                    minutes += [start_minute + 240 + rng.randint(0, 20), start_minute + 285 + rng.randint(0, 20)]
+                minutes.append(start_minute + 480 + rng.randint(-20, 60))
+                # A forgotten OUT punch now and then
+                if rng.random() < 0.02:
+                    minutes.pop()
+
+                serial = rng.choice(serials)
+                for n, minute in enumerate(minutes):
+                    punch = datetime.combine(day, time()) + timedelta(minutes=minute)
+                    row = (
+                        f"{employee.name}-{day:%Y%m%d}-{n}", current_time, current_time, "Administrator",
+                        "Administrator", 0, employee.name, employee.name, punch,
+                        "IN" if n % 2 == 0 else "OUT", serial
+                    )
+                    yield (*row, employee.location) if with_location else row
+
+    return fields, rows()
+
+
+def _remote_attendance_rows(rng, staff, holidays, start_date, end_date):
+    fields = [
+        *COMMON_FIELDS, "employee", "employee_name", "log_type", "time", "latitude", "longitude",
+        "location_type", "workflow_state", "approved_by", "approved_on", "rejection_reason"
+    ]
+    recent = end_date - timedelta(days=3)
+
+    def rows():
+        current_time = now_datetime()
+        for i, employee in enumerate(staff):
+            manager = _manager_of(i)
+            chance = 0.6 if employee.remote_worker else 0.03
+            for day in _workdays(employee, holidays, start_date, end_date):
+                if rng.random() >= chance:
+                    continue
+                # Requests from the last few days are still waiting for the manager
+                state = "Pending" if day >= recent else rng.choice(REMOTE_STATES)
+                location_type = rng.choice(["Work From Home", "Field", "Service Center"])
+                lat, lng = 12.9 + rng.random() / 10, 77.5 + rng.random() / 10
+                for n, (log_type, hour) in enumerate((("IN", 9), ("OUT", 18))):
+                    punch = datetime.combine(day, time(hour, rng.randint(0, 59)))
+                    decided = state in ("Approved", "Rejected")
+                    yield (
+                        f"{employee.name}-RA-{day:%Y%m%d}-{n}", current_time, current_time, "Administrator",
+                        "Administrator", 1 if state == "Approved" else 0, employee.name, employee.name,
+                        log_type, punch, lat, lng, location_type if log_type == "IN" else None, state,
+                        manager if decided else None, punch + timedelta(hours=2) if decided else None,
+                        "Location not verified" if state == "Rejected" else None
+                    )
+
+    return fields, rows()
+
+
+def _leave_rows(rng, staff, company, start_date, end_date):
+    fields = [
+        *COMMON_FIELDS, "employee", "employee_name", "leave_type", "from_date", "to_date",
+        "total_leave_days", "half_day", "status", "company", "posting_date", "description",
+        "custom_approved_by"
+    ]
+    span = (end_date - start_date).days
+
+    def rows():
+        current_time = now_datetime()
+        for i, employee in enumerate(staff):
+            manager = _manager_of(i)
+            for n in range(max(1, round(span / 30 * 1.5 * rng.random() * 2))):
+                from_date = start_date + timedelta(days=rng.randrange(span + 30))
+                days = rng.choice([1, 1, 1, 2, 3, 5])
+                status, docstatus = rng.choice(LEAVE_STATES)
+                if from_date > end_date:
+                    status, docstatus = "Open", 0
+                yield (
+                    f"{employee.name}-LA-{n:03d}", current_time, current_time, "Administrator", "Administrator",
+                    docstatus, employee.name, employee.name, rng.choice(LEAVE_TYPES),
+                    from_date, from_date + timedelta(days=days - 1), days, 0, status, company,
+                    from_date - timedelta(days=rng.randint(1, 14)), "Synthetic leave",
+                    f"Approved by {manager}" if status == "Approved" and manager else None
+                )
+
+    return fields, rows()
+
+
+def _insert(doctype, fields, rows):
+    """
+    Bulk insert in CHUNK_SIZE batches, committing each so progress is kept
+    and the transaction stays small.
+    """
+    batch = []
+    total = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= CHUNK_SIZE:
+            frappe.db.bulk_insert(doctype, fields, batch, ignore_duplicates=True)
+            frappe.db.commit()
+            total += len(batch)
+            batch = []
+    if batch:
+        frappe.db.bulk_insert(doctype, fields, batch, ignore_duplicates=True)
+        frappe.db.commit()
+        total += len(batch)
+    print(f"{doctype}: {total} rows")
+    return total
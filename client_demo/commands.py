@@ -0,0 +1,71 @@
+import click
+import frappe
+from frappe.commands import get_site, pass_context
+
+
+@click.command("client-demo-top-endpoints")
+@click.option(
+    "--sort-by",
+    default="p95_wall_seconds",
+    type=click.Choice(
+        ["p95_wall_seconds", "p50_wall_seconds", "avg_db_seconds", "avg_query_count", "max_response_bytes"]
+    ),
+    help="Column to rank endpoints by",
+)
+@click.option("--limit", default=10, help="Number of endpoints to show")
+@click.option("--reset", is_flag=True, default=False, help="Clear collected metrics after printing")
+@pass_context
+def top_endpoints(context, sort_by, limit, reset):
+    "Print the slowest client_demo endpoints from recent calls"
+    from client_demo.services.metrics import get_top_offenders
+    from client_demo.services.metrics import reset as reset_metrics
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        rows = get_top_offenders(sort_by=sort_by, limit=limit)
+        if not rows:
+            click.echo("No samples recorded yet")
+            return
+
+        click.echo(
+            f"{'endpoint':<70} {'calls':>6} {'p50 s':>8} {'p95 s':>8} {'db s':>8} {'queries':>8} {'max q':>6} {'max KB':>8}"
+        )
+        for r in rows:
+            click.echo(
+                f"{r['endpoint']:<70} {r['calls']:>6} {r['p50_wall_seconds']:>8.3f} {r['p95_wall_seconds']:>8.3f} "
+                f"{r['avg_db_seconds']:>8.3f} {r['avg_query_count']:>8.1f} {r['max_query_count']:>6} "
+                f"{r['max_response_bytes'] / 1024:>8.1f}"
+            )
+
+        if reset:
+            reset_metrics()
+    finally:
+        frappe.destroy()
+
+
+@click.command("client-demo-generate-data")
+@click.option("--employees", default=100, help="Number of employees to create")
+@click.option("--months", default=1, help="Months of attendance history, ending today")
+@click.option("--seed", default=42, help="Random seed, same seed gives the same dataset")
+@click.option("--company", default=None, help="Company for employees and leaves (default: site default)")
+@click.option("--clear", is_flag=True, default=False, help="Remove previously generated data first")
+@pass_context
+def generate_data(context, employees, months, seed, company, clear):
+    "Generate a synthetic attendance dataset for load testing"
+    from client_demo.benchmarks import synthetic_data
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        if clear:
+            synthetic_data.clear()
+        result = synthetic_data.generate(employees=employees, months=months, seed=seed, company=company)
+        click.echo(f"Generated {result['employees']} employees from {result['from_date']} to {result['to_date']}")
+    finally:
+        frappe.destroy()
+
+
+commands = [top_endpoints, generate_data]
@@ -1,9 +1,274 @@
 # Copyright (c) 2026, sil and Contributors
 # See license.txt
 
-# import frappe
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate, now_datetime, today
+
+from client_demo.install import ensure_indexes
+from client_demo.services import (
+	biometric_checkin_demo,
+	checkin_dummy,
+	employee_home,
+	leave_application,
+	manager_inbox,
+	reference_data,
+	remote_attendance,
+)
+
+PREFIX = "_T-PERF-"
+MANAGERS = 3
+REPORTEES_PER_MANAGER = 20
+HISTORY_DAYS = 20
+MANAGER_USER = "perf-manager@example.com"
+EMPLOYEE_USER = "perf-employee@example.com"
+
+# Maximum statements per call. These must not depend on how many employees,
+# reportees or check-ins exist; a per-row query (N+1) blows through them.
+QUERY_BUDGETS = {
+	"get_employee_details": 7,
+	"get_employee_checkins": 2,
+	"get_today_attendance_status": 6,
+	"get_today_checkin_pairs": 3,
+	"get_checkin_pairs": 3,
+	"get_pending_remote_attendance": 2,
+	"get_remote_attendance_history": 2,
+	"get_pending_approvals": 3,
+	"get_approval_history": 2,
+	"approve_remote_attendance": 40,
+	"add_checkin": 12,
+	"get_unapproved_leaves": 3,
+	"view_leave_status": 3,
+	"get_team_leave_coverage": 3,
+	"get_manager_inbox": 4,
+	"get_home_screen": 9,
+}
+
+# Small lookup tables a full scan is acceptable on
+FULL_SCAN_ALLOWED = {"tabShift Type", "st", "tabLeave Type", "tabHoliday", "tabSeries"}
 
 
 class TestRemoteAttendance(FrappeTestCase):
-	pass
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		ensure_indexes()
+		cls.data = seed_dataset()
+
+	@classmethod
+	def tearDownClass(cls):
+		clear_dataset()
+		super().tearDownClass()
+
+	def setUp(self):
+		# Each call below stands for a fresh request
+		frappe.local.client_demo_employee_cache = None
+		reference_data.get_dataset("location_types")
+
+	def endpoint_calls(self):
+		data = self.data
+		return {
+			"get_employee_details": lambda: checkin_dummy.get_employee_details(EMPLOYEE_USER),
+			"get_employee_checkins": lambda: checkin_dummy.get_employee_checkins(
+				data.employee, str(add_days(today(), -7)), today()
+			),
+			"get_today_attendance_status": lambda: remote_attendance.get_today_attendance_status(data.employee),
+			"get_today_checkin_pairs": lambda: remote_attendance.get_today_checkin_pairs(data.employee),
+			"get_checkin_pairs": lambda: remote_attendance.get_checkin_pairs(
+				data.employee, str(add_days(today(), -HISTORY_DAYS)), today()
+			),
+			"get_pending_remote_attendance": lambda: remote_attendance.get_pending_remote_attendance(
+				data.employee
+			),
+			"get_remote_attendance_history": lambda: remote_attendance.get_remote_attendance_history(
+				data.employee
+			),
+			"get_pending_approvals": lambda: remote_attendance.get_pending_approvals(MANAGER_USER),
+			"get_approval_history": lambda: remote_attendance.get_approval_history(MANAGER_USER),
+			"get_unapproved_leaves": lambda: leave_application.get_unapproved_leaves(MANAGER_USER),
+			"view_leave_status": lambda: leave_application.view_leave_status(data.employee),
+			"get_team_leave_coverage": lambda: leave_application.get_team_leave_coverage(MANAGER_USER),
+			"get_manager_inbox": lambda: manager_inbox.get_manager_inbox(MANAGER_USER),
+			"get_home_screen": lambda: employee_home.get_home_screen(EMPLOYEE_USER),
+		}
+
+	def test_read_endpoint_query_budgets(self):
+		for name, call in self.endpoint_calls().items():
+			with self.subTest(endpoint=name):
+				frappe.local.client_demo_employee_cache = None
+				with self.assertQueryCount(QUERY_BUDGETS[name]):
+					result = call()
+				self.assertNotEqual(result.get("success"), False, msg=result)
+
+	def test_approve_remote_attendance_query_budget(self):
+		with self.assertQueryCount(QUERY_BUDGETS["approve_remote_attendance"]):
+			result = remote_attendance.approve_remote_attendance(self.data.pending_request, self.data.manager)
+		self.assertTrue(result["success"], msg=result)
+
+	def test_add_checkin_query_budget(self):
+		try:
+			reference_data.get_dataset("device_locations")
+		except frappe.DoesNotExistError:
+			self.skipTest("Biometric Device Mapping is not installed on this site")
+
+		with self.assertQueryCount(QUERY_BUDGETS["add_checkin"]):
+			result = biometric_checkin_demo.add_checkin(
+				self.data.device_code, "", str(now_datetime().replace(microsecond=0)), "PERF-DEVICE"
+			)
+		self.assertEqual(result["status"], "success")
+
+	def test_key_queries_use_indexes(self):
+		calls = self.endpoint_calls()
+		calls["get_employee_checkin_data_for_period"] = lambda: checkin_dummy._get_employee_checkin_data_for_period(
+			self.data.employee, str(add_days(today(), -HISTORY_DAYS)), today()
+		)
+		calls["biometric_last_log_type"] = lambda: frappe.db.sql(
+			"""
+			SELECT log_type FROM `tabEmployee Checkin`
+			WHERE employee = %s AND DATE(time) = %s
+			ORDER BY time DESC LIMIT 1
+			""",
+			(self.data.employee, getdate(today())),
+		)
+
+		for name, call in calls.items():
+			frappe.local.client_demo_employee_cache = None
+			with capture_queries() as queries:
+				call()
+
+			for query in queries:
+				if not query.lstrip().upper().startswith("SELECT"):
+					continue
+				with self.subTest(endpoint=name, query=query):
+					full_scans = [
+						row
+						for row in frappe.db.sql(f"EXPLAIN {query}", as_dict=True)
+						if row.get("type") == "ALL" and row.get("table") not in FULL_SCAN_ALLOWED
+					]
+					self.assertFalse(full_scans, msg=f"Full table scan in {name}:\n{query}\n{full_scans}")
+
+
+@contextmanager
+def capture_queries():
+	"""
+	Collect every statement run through frappe.db.sql, with values interpolated.
+	"""
+	queries = []
+	orig_sql = frappe.db.__class__.sql
+
+	def sql(self, *args, **kwargs):
+		result = orig_sql(self, *args, **kwargs)
+		queries.append(str(self.last_query))
+		return result
+
+	frappe.db.__class__.sql = sql
+	try:
+		yield queries
+	finally:
+		frappe.db.__class__.sql = orig_sql
+
+
+def seed_dataset():
+	"""
+	Three managers with twenty reportees each, twenty days of punches,
+	remote attendance in every state and open/approved leaves, inserted in bulk.
+	"""
+	clear_dataset()
+	company = frappe.db.get_value("Company", {}, "name")
+	current_time = now_datetime()
+	today_date = getdate(today())
+
+	employees, checkins, remote_rows, leaves = [], [], [], []
+	for m in range(MANAGERS):
+		manager = f"{PREFIX}M{m}"
+		team = [(manager, None)] + [(f"{PREFIX}M{m}-E{e:02d}", manager) for e in range(REPORTEES_PER_MANAGER)]
+
+		for name, reports_to in team:
+			employees.append(
+				(name, current_time, current_time, "Administrator", "Administrator", 0, name, name, company,
+				"Active", reports_to, f"PERF{len(employees):04d}", "Male", "1990-01-01", "2020-01-01")
+			)
+
+			for day in range(HISTORY_DAYS, -1, -1):
+				punch_date = today_date - timedelta(days=day)
+				punches = [("IN", 9), ("OUT", 13), ("IN", 14), ("OUT", 18)] if day else [("IN", 9)]
+				for log_type, hour in punches:
+					checkins.append(
+						(f"{name}-{punch_date}-{hour}", current_time, current_time, "Administrator",
+						"Administrator", 0, name, name, datetime.combine(punch_date, time(hour)), log_type)
+					)
+
+			for i, state in enumerate(["Approved", "Approved", "Rejected", "Cancelled", "Pending"]):
+				punch_time = datetime.combine(today_date - timedelta(days=4 - i), time(10))
+				remote_rows.append(
+					(f"{name}-RA-{i}", current_time, current_time, "Administrator", "Administrator",
+					1 if state == "Approved" else 0, name, name, "IN", punch_time, "Field", state,
+					reports_to if state in ("Approved", "Rejected") else None,
+					punch_time + timedelta(hours=1) if state in ("Approved", "Rejected") else None)
+				)
+
+			leaves.append(
+				(f"{name}-LA-0", current_time, current_time, "Administrator", "Administrator", 1, name, name,
+				"Casual Leave", add_days(today_date, -10), add_days(today_date, -9), 2, "Approved", company,
+				add_days(today_date, -12))
+			)
+			leaves.append(
+				(f"{name}-LA-1", current_time, current_time, "Administrator", "Administrator", 0, name, name,
+				"Casual Leave", add_days(today_date, 5), add_days(today_date, 6), 2, "Open", company,
+				today_date)
+			)
+
+	common = ["name", "creation", "modified", "modified_by", "owner", "docstatus"]
+	frappe.db.bulk_insert(
+		"Employee",
+		[*common, "first_name", "employee_name", "company", "status", "reports_to", "attendance_device_id",
+		"gender", "date_of_birth", "date_of_joining"],
+		employees,
+	)
+	frappe.db.bulk_insert(
+		"Employee Checkin", [*common, "employee", "employee_name", "time", "log_type"], checkins
+	)
+	frappe.db.bulk_insert(
+		"Remote Attendance",
+		[*common, "employee", "employee_name", "log_type", "time", "location_type", "workflow_state",
+		"approved_by", "approved_on"],
+		remote_rows,
+	)
+	frappe.db.bulk_insert(
+		"Leave Application",
+		[*common, "employee", "employee_name", "leave_type", "from_date", "to_date", "total_leave_days",
+		"status", "company", "posting_date"],
+		leaves,
+	)
+
+	manager = f"{PREFIX}M0"
+	employee = f"{PREFIX}M0-E00"
+	for user, emp in ((MANAGER_USER, manager), (EMPLOYEE_USER, employee)):
+		if not frappe.db.exists("User", user):
+			frappe.get_doc(
+				{"doctype": "User", "email": user, "first_name": emp, "send_welcome_email": 0}
+			).insert(ignore_permissions=True)
+		frappe.db.set_value("Employee", emp, "user_id", user)
+
+	frappe.db.commit()
+	return frappe._dict(
+		manager=manager,
+		employee=employee,
+		pending_request=f"{employee}-RA-4",
+		device_code=frappe.db.get_value("Employee", employee, "attendance_device_id"),
+	)
+
+
+def clear_dataset():
+	like = f"{PREFIX}%"
+	for doctype, field in (
+		("Employee Checkin", "employee"),
+		("Remote Attendance", "employee"),
+		("Leave Application", "employee"),
+		("Employee", "name"),
+	):
+		frappe.db.sql(f"DELETE FROM `tab{doctype}` WHERE `{field}` LIKE %s", like)
+	frappe.db.commit()
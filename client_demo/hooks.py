@@ -115,7 +115,8 @@ fixtures = [
 # ------------
 
 # before_install = "client_demo.install.before_install"
-# after_install = "client_demo.install.after_install"
+after_install = "client_demo.install.after_install"
+after_migrate = "client_demo.install.after_migrate"
 
 # Uninstallation
 # ------------
@@ -169,34 +170,74 @@ fixtures = [
 # ---------------
 # Hook on document methods and events
 
-# doc_events = {
-# 	"*": {
-# 		"on_update": "method",
-# 		"on_cancel": "method",
-# 		"on_trash": "method"
-# 	}
-# }
+doc_events = {
+	"Leave Allocation": {
+		"on_submit": "client_demo.services.leave_balance.on_allocation_submit",
+		"on_cancel": "client_demo.services.leave_balance.on_allocation_cancel"
+	},
+	"Leave Application": {
+		"after_insert": "client_demo.services.leave_balance.on_application_insert",
+		"on_update": "client_demo.services.leave_balance.on_application_update",
+		"on_submit": "client_demo.services.leave_balance.on_application_submit",
+		"on_cancel": "client_demo.services.leave_balance.on_application_cancel",
+		"on_trash": "client_demo.services.leave_balance.on_application_trash"
+	},
+	# Reference data served by client_demo.services.reference_data
+	"Leave Type": {
+		"on_update": "client_demo.services.reference_data.invalidate_for_doc",
+		"on_trash": "client_demo.services.reference_data.invalidate_for_doc"
+	},
+	"User": {
+		"on_update": "client_demo.services.reference_data.invalidate_for_doc",
+		"on_trash": "client_demo.services.reference_data.invalidate_for_doc"
+	},
+	"Shift Type": {
+		"on_update": "client_demo.services.reference_data.invalidate_for_doc",
+		"on_trash": "client_demo.services.reference_data.invalidate_for_doc"
+	},
+	"Holiday List": {
+		"on_update": "client_demo.services.reference_data.invalidate_for_doc",
+		"on_trash": "client_demo.services.reference_data.invalidate_for_doc"
+	},
+	"Biometric Device Mapping": {
+		"on_update": "client_demo.services.reference_data.invalidate_for_doc"
+	},
+	# Live occupancy counters; add_checkin records its raw-SQL inserts itself
+	"Employee Checkin": {
+		"after_insert": "client_demo.services.occupancy.on_checkin_insert"
+	},
+	# Per-employee assignment cache in client_demo.services.shift_resolver
+	"Shift Assignment": {
+		"on_submit": "client_demo.services.shift_resolver.invalidate_for_doc",
+		"on_cancel": "client_demo.services.shift_resolver.invalidate_for_doc",
+		"on_update_after_submit": "client_demo.services.shift_resolver.invalidate_for_doc",
+		"on_trash": "client_demo.services.shift_resolver.invalidate_for_doc"
+	}
+}
 
 # Scheduled Tasks
 # ---------------
 
-# scheduler_events = {
-# 	"all": [
-# 		"client_demo.tasks.all"
-# 	],
-# 	"daily": [
-# 		"client_demo.tasks.daily"
-# 	],
-# 	"hourly": [
-# 		"client_demo.tasks.hourly"
-# 	],
-# 	"weekly": [
-# 		"client_demo.tasks.weekly"
-# 	],
-# 	"monthly": [
-# 		"client_demo.tasks.monthly"
-# 	],
-# }
+scheduler_events = {
+	"cron": {
+		# Close or flag IN punches left without an OUT, before Attendance is built
+		"5 0 * * *": [
+			"client_demo.services.open_punches.close_unpaired_punches"
+		],
+		# Build Attendance for the last two days shortly after midnight (days still open wait a night)
+		"15 0 * * *": [
+			"client_demo.services.attendance_scheduler.generate_daily_attendance"
+		],
+		# Move check-ins and remote attendance past retention to the archive tables
+		"30 1 * * *": [
+			"client_demo.services.archival.archive_old_rows"
+		],
+		# Parquet files for offline analytics
+		"45 2 * * *": [
+			"client_demo.services.analytics_export.export_recent_months"
+		]
+	}
+}
 
 # Testing
 # -------
@@ -228,8 +269,16 @@ fixtures = [
 
 # Request Events
 # ----------------
-# before_request = ["client_demo.utils.before_request"]
-# after_request = ["client_demo.utils.after_request"]
+before_request = [
+	"client_demo.services.rate_limit.before_request",
+	"client_demo.services.metrics.before_request",
+	"client_demo.services.profiling.before_request"
+]
+after_request = [
+	"client_demo.services.rate_limit.after_request",
+	"client_demo.services.metrics.after_request",
+	"client_demo.services.profiling.after_request"
+]
 
 # Job Events
 # ----------
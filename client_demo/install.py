@@ -0,0 +1,76 @@
+import frappe
+
+from client_demo.services.archival import ARCHIVE_RULES
+
+
+# Composite indexes backing the per-employee and per-manager queries in client_demo.services
+ATTENDANCE_INDEXES = {
+    "Employee": [
+        ["reports_to"],
+        ["user_id"],
+        ["attendance_device_id"]
+    ],
+    "Employee Checkin": [
+        ["employee", "time"],
+        ["time"]
+    ],
+    "Remote Attendance": [
+        ["employee", "workflow_state", "time"],
+        ["workflow_state", "time"],
+        ["approved_by", "approved_on"],
+        ["time"]
+    ],
+    "Leave Application": [
+        ["employee", "from_date", "to_date"]
+    ],
+    "Attendance": [
+        ["employee", "attendance_date"]
+    ]
+}
+
+
+def after_install():
+    ensure_indexes()
+    ensure_archive_tables()
+
+
+def after_migrate():
+    ensure_indexes()
+    ensure_archive_tables()
+
+
+def ensure_indexes():
+    """
+    Create missing attendance indexes. add_index skips indexes that already exist.
+    """
+    for doctype, indexes in ATTENDANCE_INDEXES.items():
+        if not frappe.db.table_exists(doctype):
+            continue
+        for fields in indexes:
+            frappe.db.add_index(doctype, fields, index_name=f"client_demo_{'_'.join(fields)}")
+
+
+def ensure_archive_tables():
+    """
+    Create `tab<Doctype> Archive` as a copy of each archived table (columns
+    and indexes) and add the columns the hot table has gained since.
+    """
+    for doctype in ARCHIVE_RULES:
+        if not frappe.db.table_exists(doctype):
+            continue
+        table, archive = f"tab{doctype}", f"tab{doctype} Archive"
+        frappe.db.sql_ddl(f"CREATE TABLE IF NOT EXISTS `{archive}` LIKE `{table}`")
+
+        archive_columns = set(_get_columns(archive))
+        for column, column_type in _get_columns(table).items():
+            if column not in archive_columns:
+                frappe.db.sql_ddl(f"ALTER TABLE `{archive}` ADD COLUMN `{column}` {column_type} NULL")
+
+
+def _get_columns(table):
+    return dict(frappe.db.sql("""
+        SELECT COLUMN_NAME, COLUMN_TYPE
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ORDER BY ORDINAL_POSITION
+    """, (table,)))
@@ -0,0 +1,300 @@
+# File: client_demo/services/analytics_export.py
+# Columnar (Parquet) export of attendance history for offline analytics
+# ============================================================
+#
+# A nightly job writes the current month (and the previous one for the
+# first days of a month, to pick up late approvals) of three datasets to
+# hive-partitioned Parquet files:
+#   <analytics path>/<dataset>/month=YYYY-MM/department=<name>/part-0.parquet
+#   checkins            Employee Checkin rows
+#   remote_attendance   Remote Attendance rows with location and decision timing
+#   daily_summaries     one row per employee-day, as in the HR export
+# Archived rows (see archival) are included. A month is written to a temporary
+# directory and swapped in, so readers never see a half-written month.
+# read_dataset() reads them back, pruning partitions by month and department.
+#
+# Needs pyarrow. Site config:
+#   client_demo_analytics_path  default <site>/private/analytics
+
+import os
+import shutil
+from datetime import datetime, timedelta
+from itertools import groupby
+from urllib.parse import quote
+
+import frappe
+from frappe.utils import add_days, add_months, get_first_day, getdate, today
+
+from client_demo.services.archival import reaches_archive
+from client_demo.services.checkin_dummy import PAIR_WINDOW, process_daily_summaries
+from client_demo.services.shift_resolver import get_shift_schedules
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+BATCH_ROWS = 20000
+PREVIOUS_MONTH_GRACE_DAYS = 5
+NO_DEPARTMENT = "none"
+
+
+# ============================================================
+# SCHEDULER ENTRY POINT
+# ============================================================
+
+def export_recent_months():
+    """
+    Queue the export of the current month, plus the previous month during
+    its first PREVIOUS_MONTH_GRACE_DAYS days.
+    """
+    current = getdate(today())
+    months = [get_first_day(current)]
+    if current.day <= PREVIOUS_MONTH_GRACE_DAYS:
+        months.append(get_first_day(add_months(current, -1)))
+
+    for month in months:
+        frappe.enqueue(
+            "client_demo.services.analytics_export.export_month",
+            queue="long",
+            timeout=4 * 60 * 60,
+            job_id=f"client_demo::analytics::{month:%Y-%m}",
+            deduplicate=True,
+            month=f"{month:%Y-%m}"
+        )
+
+
+# ============================================================
+# BACKGROUND JOB
+# ============================================================
+
+def export_month(month):
+    """
+    (Re)write every dataset for one month, "YYYY-MM". Returns rows written
+    per dataset.
+    """
+    _require_pyarrow()
+    month_start = get_first_day(getdate(f"{month}-01"))
+    month_end = get_first_day(add_months(month_start, 1))
+    from_time = datetime.combine(month_start, datetime.min.time())
+    to_time = datetime.combine(month_end, datetime.min.time())
+
+    written = {}
+    for dataset, (schema, build_query, transform, padding) in _datasets().items():
+        values = {"from_time": from_time - padding, "to_time": to_time + padding}
+        rows = _iter_rows(build_query(values["from_time"]), values)
+        output = transform(rows, month_start, add_days(month_end, -1))
+        written[dataset] = _write_month(dataset, schema, f"{month_start:%Y-%m}", output)
+    return written
+
+
+# ============================================================
+# QUERY HELPER
+# ============================================================
+
+def read_dataset(dataset, months=None, departments=None, columns=None, filter=None):
+    """
+    Read an exported dataset as a pyarrow Table. `months` ("YYYY-MM") and
+    `departments` prune whole partition directories before any file is
+    opened; `filter` is an extra pyarrow.dataset expression on the columns.
+
+        read_dataset("checkins", months=["2026-01"], departments=["Operations"],
+                     filter=ds.field("log_type") == "IN").to_pandas()
+    """
+    _require_pyarrow()
+    partitioning = ds.partitioning(
+        pa.schema([("month", pa.string()), ("department", pa.string())]), flavor="hive"
+    )
+    source = ds.dataset(os.path.join(get_analytics_path(), dataset), format="parquet", partitioning=partitioning)
+
+    expression = None
+    for field, wanted in (("month", months), ("department", departments)):
+        if wanted:
+            condition = ds.field(field).isin([w or NO_DEPARTMENT for w in wanted])
+            expression = condition if expression is None else expression & condition
+    if filter is not None:
+        expression = filter if expression is None else expression & filter
+
+    return source.to_table(columns=columns, filter=expression)
+
+
+def get_analytics_path():
+    return frappe.conf.get("client_demo_analytics_path") or frappe.get_site_path("private", "analytics")
+
+
+# ============================================================
+# DATASETS
+# ============================================================
+
+def _datasets():
+    """
+    dataset -> (schema, query builder for the read start, row transform for
+    the month's first and last day, padding read either side of the month).
+    Every row the transform yields has "department"; it is stored as the
+    partition directory, not as a column in the files.
+    """
+    return {
+        "checkins": (
+            pa.schema([
+                ("name", pa.string()), ("employee", pa.string()),
+                ("time", pa.timestamp("us")), ("log_type", pa.string()), ("device_id", pa.string()),
+                ("device_location", pa.string())
+            ]),
+            _checkin_query,
+            lambda rows, *_: rows,
+            timedelta(0)
+        ),
+        "remote_attendance": (
+            pa.schema([
+                ("name", pa.string()), ("employee", pa.string()),
+                ("log_type", pa.string()), ("time", pa.timestamp("us")), ("latitude", pa.float64()),
+                ("longitude", pa.float64()), ("location_type", pa.string()), ("workflow_state", pa.string()),
+                ("approved_by", pa.string()), ("requested_on", pa.timestamp("us")),
+                ("approved_on", pa.timestamp("us")), ("decision_seconds", pa.int64())
+            ]),
+            _remote_attendance_query,
+            lambda rows, *_: rows,
+            timedelta(0)
+        ),
+        "daily_summaries": (
+            pa.schema([
+                ("employee", pa.string()), ("date", pa.date32()),
+                ("daily_working_hours", pa.float64()), ("entry_time", pa.string()), ("exit_time", pa.string()),
+                ("checkin_pairs", pa.int32()), ("late_minutes", pa.int32()),
+                ("early_exit_minutes", pa.int32()), ("overtime_hours", pa.float64()), ("status", pa.string())
+            ]),
+            _summary_query,
+            _iter_summaries,
+            # Overnight pairs at the month's edges are read whole
+            PAIR_WINDOW
+        )
+    }
+
+
+def _source(doctype, read_from, columns):
+    """
+    The hot table, or hot and archive tables combined when the read
+    reaches into the archive.
+    """
+    select = f"SELECT {columns} FROM `tab{doctype}` WHERE time >= %(from_time)s AND time < %(to_time)s"
+    if not reaches_archive(doctype, read_from):
+        return f"({select})"
+    archived = select.replace(f"`tab{doctype}`", f"`tab{doctype} Archive`")
+    return f"({select} UNION ALL {archived})"
+
+
+def _checkin_query(read_from):
+    location = "custom_device_location" if frappe.db.has_column("Employee Checkin", "custom_device_location") else "NULL"
+    source = _source("Employee Checkin", read_from, f"name, employee, time, log_type, device_id, {location} AS device_location")
+    return f"""
+        SELECT ec.name, ec.employee, IFNULL(em.department, '') AS department, ec.time,
+            ec.log_type, ec.device_id, ec.device_location
+        FROM {source} AS ec
+        LEFT JOIN `tabEmployee` AS em ON em.name = ec.employee
+    """
+
+
+def _remote_attendance_query(read_from):
+    source = _source(
+        "Remote Attendance", read_from,
+        "name, employee, log_type, time, latitude, longitude, location_type, workflow_state, "
+        "approved_by, creation, approved_on"
+    )
+    return f"""
+        SELECT ra.name, ra.employee, IFNULL(em.department, '') AS department, ra.log_type, ra.time,
+            ra.latitude, ra.longitude, ra.location_type, ra.workflow_state, ra.approved_by,
+            ra.creation AS requested_on, ra.approved_on,
+            TIMESTAMPDIFF(SECOND, ra.creation, ra.approved_on) AS decision_seconds
+        FROM {source} AS ra
+        LEFT JOIN `tabEmployee` AS em ON em.name = ra.employee
+    """
+
+
+def _summary_query(read_from):
+    source = _source("Employee Checkin", read_from, "employee, time, log_type")
+    return f"""
+        SELECT ec.employee, IFNULL(em.department, '') AS department, ec.time, ec.log_type, st.end_time
+        FROM {source} AS ec
+        JOIN `tabEmployee` AS em ON em.name = ec.employee
+        LEFT JOIN `tabShift Type` AS st ON st.name = em.default_shift
+        ORDER BY ec.employee, ec.time
+    """
+
+
+def _iter_summaries(rows, first_day, last_day):
+    # Shift Assignments and Shift Types are loaded before the first row is
+    # pulled, while the connection is still free; nothing below queries
+    shift_schedules = get_shift_schedules()
+    # Rows arrive ordered by (employee, time): one employee's month in memory at a time
+    for _employee, logs in groupby(rows, key=lambda r: r["employee"]):
+        for summary in process_daily_summaries(list(logs), shift_schedules, first_day, last_day):
+            yield {
+                **summary,
+                "date": getdate(summary["date"]),
+                "checkin_pairs": len(summary.get("checkin_pairs") or [])
+            }
+
+
+# ============================================================
+# HELPER FUNCTIONS (Private)
+# ============================================================
+
+def _iter_rows(query, values):
+    """
+    Stream rows with a server-side cursor. No other query may run on this
+    connection until the generator is exhausted.
+    """
+    with frappe.db.unbuffered_cursor():
+        yield from frappe.db.sql(query, values, as_dict=True, as_iterator=True)
+
+
+def _write_month(dataset, schema, month, rows):
+    """
+    Write rows into one file per department under a temporary directory,
+    then swap it in for month=<month>. Returns the number of rows written.
+    """
+    dataset_path = os.path.join(get_analytics_path(), dataset)
+    final_path = os.path.join(dataset_path, f"month={month}")
+    tmp_path = os.path.join(dataset_path, f".tmp-month={month}-{frappe.generate_hash(length=8)}")
+
+    writers = {}
+    buffers = {}
+    count = 0
+
+    def flush(department):
+        if department not in writers:
+            directory = os.path.join(tmp_path, f"department={quote(department, safe='')}")
+            os.makedirs(directory, exist_ok=True)
+            writers[department] = pq.ParquetWriter(os.path.join(directory, "part-0.parquet"), schema)
+        writers[department].write_batch(pa.RecordBatch.from_pylist(buffers.pop(department), schema=schema))
+
+    try:
+        for row in rows:
+            department = row.get("department") or NO_DEPARTMENT
+            buffers.setdefault(department, []).append(row)
+            count += 1
+            if len(buffers[department]) >= BATCH_ROWS:
+                flush(department)
+
+        for department in list(buffers):
+            flush(department)
+    except Exception:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    if os.path.exists(final_path):
+        shutil.rmtree(final_path)
+    if os.path.exists(tmp_path):
+        os.rename(tmp_path, final_path)
+    return count
+
+
+def _require_pyarrow():
+    if pa is None:
+        frappe.throw("pyarrow is required for the analytics export. Install it in the bench environment.")
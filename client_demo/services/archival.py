@@ -0,0 +1,189 @@
+# File: client_demo/services/archival.py
+# Hot/cold archival of old Employee Checkin and Remote Attendance rows
+# ============================================================
+#
+# A nightly job moves rows older than the retention window out of the hot
+# tables into `tab<Doctype> Archive` tables (same columns and indexes,
+# created by install.ensure_archive_tables), ARCHIVE_CHUNK_SIZE rows per
+# committed batch. Only rows whose summaries are final are moved:
+#   Employee Checkin   an Attendance exists for the employee and day
+#   Remote Attendance  the request is Approved, Rejected or Cancelled
+# The newest archived time per doctype is kept as a watermark; history
+# reads whose range starts before it also read the archive table (see
+# get_history), so callers do not need to know where rows live.
+#
+# Site config:
+#   client_demo_archive_after_days   default 365
+#   client_demo_archive_max_batches  default 200 per doctype per run
+
+import frappe
+from frappe.utils import add_days, get_datetime, today
+
+
+ARCHIVE_CHUNK_SIZE = 5000
+DEFAULT_RETENTION_DAYS = 365
+DEFAULT_MAX_BATCHES = 200
+
+# doctype -> condition a row must meet to be archived, on alias `t`
+ARCHIVE_RULES = {
+    "Employee Checkin": """
+        EXISTS (
+            SELECT 1 FROM `tabAttendance` a
+            WHERE a.employee = t.employee
+            AND a.attendance_date = DATE(t.time)
+            AND a.docstatus < 2
+        )
+    """,
+    "Remote Attendance": "t.workflow_state IN ('Approved', 'Rejected', 'Cancelled')"
+}
+
+
+# ============================================================
+# SCHEDULER ENTRY POINT
+# ============================================================
+
+def archive_old_rows():
+    """
+    Queue one archival job per doctype. De-duplicated by id so a slow run
+    is not overlapped by the next night's.
+    """
+    for doctype in ARCHIVE_RULES:
+        frappe.enqueue(
+            "client_demo.services.archival.archive_doctype",
+            queue="long",
+            timeout=4 * 60 * 60,
+            job_id=f"client_demo::archive::{doctype}",
+            deduplicate=True,
+            doctype=doctype
+        )
+
+
+# ============================================================
+# BACKGROUND JOB
+# ============================================================
+
+def archive_doctype(doctype, before=None):
+    """
+    Move archivable rows with time < `before` (default: retention cut-off)
+    into the archive table. Each batch is copied and deleted in one
+    transaction, so a row is always in exactly one of the two tables.
+    Returns the number of rows moved.
+    """
+    before = get_datetime(before or add_days(today(), -get_retention_days()))
+    columns = get_archive_columns(doctype)
+    column_list = ", ".join(f"`{c}`" for c in columns)
+    max_batches = frappe.utils.cint(frappe.conf.get("client_demo_archive_max_batches", DEFAULT_MAX_BATCHES))
+
+    moved = 0
+    for _batch in range(max_batches):
+        rows = frappe.db.sql(f"""
+            SELECT t.name, t.time
+            FROM `tab{doctype}` t
+            WHERE t.time < %s
+            AND {ARCHIVE_RULES[doctype]}
+            ORDER BY t.time
+            LIMIT {ARCHIVE_CHUNK_SIZE}
+        """, (before,))
+        if not rows:
+            break
+
+        names = [r[0] for r in rows]
+        frappe.db.sql(f"""
+            INSERT IGNORE INTO `tab{doctype} Archive` ({column_list})
+            SELECT {column_list} FROM `tab{doctype}` WHERE name IN %s
+        """, (names,))
+        frappe.db.sql(f"DELETE FROM `tab{doctype}` WHERE name IN %s", (names,))
+        _set_watermark(doctype, max(r[1] for r in rows))
+        frappe.db.commit()
+        moved += len(names)
+
+    return moved
+
+
+# ============================================================
+# READ PATH
+# ============================================================
+
+def get_history(doctype, fields, employee, from_time=None, to_time=None, order="asc", time_field="time",
+        owner_field="employee", filters=None):
+    """
+    Rows for one employee (or whoever `owner_field` names, e.g. approved_by)
+    from the hot table and, when the range starts before the archive
+    watermark, from the archive table too, ordered by `time_field`.
+    `fields` are column names or SQL expressions as for frappe.get_all;
+    `filters` maps further columns to a value or a list of values.
+    Returns a list of frappe._dict.
+    """
+    conditions = [f"`{owner_field}` = %(employee)s"]
+    values = {"employee": employee}
+    for i, (column, value) in enumerate((filters or {}).items()):
+        operator = "IN" if isinstance(value, (list, tuple)) else "="
+        conditions.append(f"`{column}` {operator} %(filter_{i})s")
+        values[f"filter_{i}"] = tuple(value) if operator == "IN" else value
+    if from_time:
+        conditions.append(f"`{time_field}` >= %(from_time)s")
+        values["from_time"] = get_datetime(from_time)
+    if to_time:
+        conditions.append(f"`{time_field}` <= %(to_time)s")
+        values["to_time"] = get_datetime(to_time)
+
+    # DATE_FORMAT patterns would be read as placeholders
+    select = ", ".join(f"`{f}`" if f.isidentifier() else f.replace("%", "%%") for f in fields)
+    query = "SELECT {select}, `{time_field}` AS _sort FROM `{table}` WHERE {conditions}"
+
+    # The watermark is on `time`; another time field (approved_on) can be
+    # later than an archived row's time, so any archive may hold matches
+    tables = [f"tab{doctype}"]
+    if reaches_archive(doctype, from_time if time_field == "time" else None):
+        tables.append(f"tab{doctype} Archive")
+
+    rows = []
+    for table in tables:
+        rows.extend(frappe.db.sql(
+            query.format(select=select, time_field=time_field, table=table, conditions=" AND ".join(conditions)),
+            values,
+            as_dict=True
+        ))
+
+    rows.sort(key=lambda r: (r._sort is None, r._sort), reverse=order == "desc")
+    for row in rows:
+        del row["_sort"]
+    return rows
+
+
+def reaches_archive(doctype, from_time=None):
+    watermark = get_watermark(doctype)
+    if not watermark:
+        return False
+    return not from_time or get_datetime(from_time) <= watermark
+
+
+def get_watermark(doctype):
+    value = frappe.db.get_global(_watermark_key(doctype))
+    return get_datetime(value) if value else None
+
+
+def get_retention_days():
+    return frappe.utils.cint(frappe.conf.get("client_demo_archive_after_days", DEFAULT_RETENTION_DAYS))
+
+
+def get_archive_columns(doctype):
+    """
+    Columns present in both the hot and the archive table.
+    """
+    archive_columns = set(frappe.db.get_table_columns(f"{doctype} Archive"))
+    return [c for c in frappe.db.get_table_columns(doctype) if c in archive_columns]
+
+
+# ============================================================
+# HELPER FUNCTIONS (Private)
+# ============================================================
+
+def _set_watermark(doctype, archived_time):
+    current = get_watermark(doctype)
+    if not current or archived_time > current:
+        frappe.db.set_global(_watermark_key(doctype), str(archived_time))
+
+
+def _watermark_key(doctype):
+    return f"client_demo_archived_until:{frappe.scrub(doctype)}"
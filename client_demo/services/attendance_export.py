@@ -0,0 +1,188 @@
+# File: client_demo/services/attendance_export.py
+# Company-wide attendance export for HR
+# ============================================================
+
+import csv
+import os
+from itertools import groupby
+
+import frappe
+from frappe.utils import add_days, get_datetime, getdate, now_datetime
+
+from client_demo.services.checkin_dummy import CHECKIN_SHIFT_QUERY, PAIR_WINDOW, process_daily_summaries
+from client_demo.services.shift_resolver import get_shift_schedules
+
+
+EXPORT_FORMATS = ("csv", "xlsx")
+
+EXPORT_COLUMNS = [
+    "Employee", "Department", "Date", "Working Hours",
+    "Entry Time", "Exit Time", "Checkin Pairs", "Late (min)", "Early Exit (min)",
+    "Overtime (h)", "Status"
+]
+
+
+# ============================================================
+# API
+# ============================================================
+
+@frappe.whitelist()
+def export_company_attendance(from_date, to_date, file_format="csv", company=None):
+    """
+    Queue a company-wide attendance export for the given date range.
+    The file is attached as a private File and the requesting user is
+    notified over realtime when it is ready.
+    """
+    frappe.only_for(["HR Manager", "System Manager"])
+
+    file_format = (file_format or "csv").lower()
+    if file_format not in EXPORT_FORMATS:
+        return {"success": False, "message": f"file_format must be one of: {', '.join(EXPORT_FORMATS)}"}
+
+    if getdate(from_date) > getdate(to_date):
+        return {"success": False, "message": "from_date cannot be after to_date"}
+
+    job = frappe.enqueue(
+        "client_demo.services.attendance_export.build_attendance_export",
+        queue="long",
+        timeout=3600,
+        from_date=str(getdate(from_date)),
+        to_date=str(getdate(to_date)),
+        file_format=file_format,
+        company=company,
+        user=frappe.session.user
+    )
+
+    return {
+        "success": True,
+        "message": "Attendance export queued. You will be notified when the file is ready.",
+        "job_id": job.id if job else None
+    }
+
+
+# ============================================================
+# BACKGROUND JOB
+# ============================================================
+
+def build_attendance_export(from_date, to_date, file_format="csv", company=None, user=None):
+    """
+    Stream check-ins for every employee through daily summaries into a file.
+    Rows are read with an unbuffered cursor and written as they are produced,
+    so memory use does not grow with the number of employees.
+    """
+    file_name = f"attendance-{from_date}-to-{to_date}-{now_datetime().strftime('%Y%m%d%H%M%S')}.{file_format}"
+    file_path = frappe.get_site_path("private", "files", file_name)
+
+    summaries = _iter_daily_summaries(_iter_checkin_rows(from_date, to_date, company), from_date, to_date)
+    writer = _write_xlsx if file_format == "xlsx" else _write_csv
+
+    try:
+        row_count = writer(file_path, _iter_export_rows(summaries))
+    except Exception:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        frappe.log_error(frappe.get_traceback(), "Attendance Export Error")
+        raise
+
+    # The unbuffered cursor is closed by now, so the connection is free for writes
+    file_doc = frappe.get_doc({
+        "doctype": "File",
+        "file_name": file_name,
+        "file_url": f"/private/files/{file_name}",
+        "is_private": 1
+    })
+    file_doc.insert(ignore_permissions=True)
+    frappe.db.commit()
+
+    if user:
+        frappe.publish_realtime(
+            "attendance_export_ready",
+            {"file_url": file_doc.file_url, "rows": row_count},
+            user=user
+        )
+
+    return file_doc.name
+
+
+# ============================================================
+# HELPER FUNCTIONS (Private)
+# ============================================================
+
+def _iter_checkin_rows(from_date, to_date, company=None):
+    """
+    Yield check-in rows for all employees ordered by (employee, time)
+    using a server-side cursor, reading PAIR_WINDOW beyond the range so
+    overnight pairs at its edges are whole. No other query may run on
+    this connection until the generator is exhausted.
+    """
+    conditions = "ec.time >= %(from_dt)s AND ec.time < %(to_dt)s"
+    values = {
+        "from_dt": get_datetime(f"{from_date} 00:00:00") - PAIR_WINDOW,
+        "to_dt": get_datetime(f"{add_days(to_date, 1)} 00:00:00") + PAIR_WINDOW
+    }
+    if company:
+        conditions += " AND em.company = %(company)s"
+        values["company"] = company
+
+    query = CHECKIN_SHIFT_QUERY.format(conditions=conditions, order_by="ec.employee, ec.time")
+
+    with frappe.db.unbuffered_cursor():
+        yield from frappe.db.sql(query, values, as_dict=True, as_iterator=True)
+
+
+def _iter_daily_summaries(rows, from_date, to_date):
+    """
+    Group an (employee, time) ordered row stream one employee at a time and
+    yield the summaries of the days from from_date to to_date. Only a single
+    employee's range is held in memory.
+    """
+    # Shift Assignments and Shift Types are loaded before the first row is
+    # pulled, while the connection is still free; nothing below queries
+    shift_schedules = get_shift_schedules()
+    for _employee, logs in groupby(rows, key=lambda r: r["employee"]):
+        yield from process_daily_summaries(list(logs), shift_schedules, from_date, to_date)
+
+
+def _iter_export_rows(summaries):
+    for summary in summaries:
+        yield [
+            summary.get("employee"),
+            summary.get("department"),
+            summary.get("date"),
+            summary.get("daily_working_hours"),
+            summary.get("entry_time"),
+            summary.get("exit_time"),
+            len(summary.get("checkin_pairs") or []),
+            summary.get("late_minutes"),
+            summary.get("early_exit_minutes"),
+            summary.get("overtime_hours"),
+            summary.get("status")
+        ]
+
+
+def _write_csv(file_path, rows):
+    count = 0
+    with open(file_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _write_xlsx(file_path, rows):
+    from openpyxl import Workbook
+
+    # write_only mode flushes rows to disk instead of keeping cells in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Attendance")
+    sheet.append(EXPORT_COLUMNS)
+
+    count = 0
+    for row in rows:
+        sheet.append(row)
+        count += 1
+
+    workbook.save(file_path)
+    return count
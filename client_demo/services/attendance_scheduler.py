@@ -0,0 +1,281 @@
+# File: client_demo/services/attendance_scheduler.py
+# Nightly generation of Attendance records from check-ins
+# ============================================================
+
+from collections import defaultdict
+from datetime import timedelta
+
+import frappe
+from frappe.utils import add_days, get_datetime, getdate, now_datetime, today
+
+import client_demo.services.checkin_pairing as checkin_pairing
+from client_demo.services.checkin_dummy import PAIR_WINDOW, summarize_pairs
+from client_demo.services.shift_resolver import get_shift_schedules
+
+
+ATTENDANCE_CHUNK_SIZE = 500
+# Days re-checked every night: an employee still on a night shift (or with
+# an IN that may yet be closed) when the job runs is decided the next night
+LOOKBACK_DAYS = 2
+
+ATTENDANCE_FIELDS = [
+    "name", "creation", "modified", "modified_by", "owner", "docstatus", "idx",
+    "naming_series", "employee", "employee_name", "company", "department", "shift",
+    "attendance_date", "status", "working_hours", "in_time", "out_time",
+    "leave_type", "leave_application"
+]
+
+
+# ============================================================
+# SCHEDULER ENTRY POINT
+# ============================================================
+
+def generate_daily_attendance(attendance_date=None):
+    """
+    Queue one attendance job per department for the given date, or by
+    default for each of the last LOOKBACK_DAYS days. Jobs are de-duplicated
+    by id, so re-running the scheduler for the same day does not queue the
+    same department twice.
+    """
+    if attendance_date:
+        dates = [str(getdate(attendance_date))]
+    else:
+        dates = [str(add_days(today(), -days)) for days in range(LOOKBACK_DAYS, 0, -1)]
+
+    departments = frappe.db.sql_list("""
+        SELECT DISTINCT IFNULL(department, '')
+        FROM `tabEmployee`
+        WHERE status = 'Active'
+    """)
+
+    for day in dates:
+        for department in departments:
+            frappe.enqueue(
+                "client_demo.services.attendance_scheduler.generate_department_attendance",
+                queue="long",
+                job_id=f"client_demo::attendance::{day}::{department or 'none'}",
+                deduplicate=True,
+                attendance_date=day,
+                department=department
+            )
+
+
+# ============================================================
+# BACKGROUND JOB
+# ============================================================
+
+def generate_department_attendance(attendance_date, department=""):
+    """
+    Build and insert Attendance for every active employee of one department
+    who has no Attendance for the date yet. Safe to re-run: employees that
+    already have a record are skipped and names are deterministic per
+    (employee, date), so duplicate inserts are ignored. Employees whose day
+    is not over yet (see _day_still_open) are left for a later run.
+    """
+    attendance_date = getdate(attendance_date)
+    employees = _get_employees_without_attendance(attendance_date, department)
+    if not employees:
+        return 0
+
+    employee_ids = [e.name for e in employees]
+    pairs_by_employee = _get_pairs_by_employee(employee_ids, attendance_date)
+    schedules = get_shift_schedules(employee_ids)
+    on_leave = _get_employees_on_leave(employee_ids, attendance_date)
+    on_holiday = _get_employees_on_holiday(employee_ids, attendance_date)
+
+    half_day_hours = frappe.conf.get("client_demo_half_day_hours", 4)
+    current_time = now_datetime()
+    inserted = 0
+    rows = []
+
+    for employee in employees:
+        pairs = pairs_by_employee.get(employee.name)
+        schedule = schedules.get(employee.name)
+        shift = schedule.shift_for(attendance_date) if schedule else None
+        if _day_still_open(pairs, shift, current_time):
+            continue
+
+        leave = on_leave.get(employee.name)
+        status, hours, in_time, out_time = _resolve_attendance(
+            pairs,
+            bool(leave),
+            employee.name in on_holiday,
+            half_day_hours
+        )
+        if not status:
+            continue
+        leave_type, leave_application = leave if status == "On Leave" else (None, None)
+
+        rows.append((
+            _attendance_name(employee.name, attendance_date), current_time, current_time,
+            "Administrator", "Administrator", 1, 0,
+            "HR-ATT-.YYYY.-", employee.name, employee.employee_name, employee.company,
+            employee.department, employee.default_shift,
+            attendance_date, status, hours, in_time, out_time,
+            leave_type, leave_application
+        ))
+
+        if len(rows) >= ATTENDANCE_CHUNK_SIZE:
+            inserted += _insert_chunk(rows)
+            rows = []
+
+    if rows:
+        inserted += _insert_chunk(rows)
+
+    return inserted
+
+
+# ============================================================
+# HELPER FUNCTIONS (Private)
+# ============================================================
+
+def _attendance_name(employee, attendance_date):
+    return f"HR-ATT-AUTO-{attendance_date.strftime('%Y%m%d')}-{employee}"
+
+
+def _insert_chunk(rows):
+    # Commit per chunk so an interrupted job resumes from where it stopped
+    frappe.db.bulk_insert("Attendance", ATTENDANCE_FIELDS, rows, ignore_duplicates=True)
+    frappe.db.commit()
+    return len(rows)
+
+
+def _get_employees_without_attendance(attendance_date, department):
+    return frappe.db.sql("""
+        SELECT em.name, em.employee_name, em.company, em.department, em.default_shift
+        FROM `tabEmployee` AS em
+        LEFT JOIN `tabAttendance` AS att
+            ON att.employee = em.name
+            AND att.attendance_date = %(attendance_date)s
+            AND att.docstatus < 2
+        WHERE em.status = 'Active'
+          AND IFNULL(em.department, '') = %(department)s
+          AND att.name IS NULL
+    """, {"attendance_date": attendance_date, "department": department or ""}, as_dict=True)
+
+
+def _get_pairs_by_employee(employee_ids, attendance_date):
+    """
+    The IN/OUT pairs of the day per employee, from Employee Checkins and
+    approved Remote Attendance that has not been turned into a checkin yet.
+    Punches are read PAIR_WINDOW either side of the day so a pair crossing
+    midnight is whole; it belongs to the day of its IN.
+    """
+    day_start = get_datetime(attendance_date)
+    values = {
+        "employees": employee_ids,
+        "read_from": day_start - PAIR_WINDOW,
+        "read_until": day_start + timedelta(days=1) + PAIR_WINDOW
+    }
+    logs = frappe.db.sql("""
+        SELECT employee, time, log_type, NULL AS location_type
+        FROM `tabEmployee Checkin`
+        WHERE employee IN %(employees)s
+          AND time >= %(read_from)s AND time < %(read_until)s
+        UNION ALL
+        SELECT employee, time, log_type, location_type
+        FROM `tabRemote Attendance`
+        WHERE employee IN %(employees)s
+          AND workflow_state = 'Approved'
+          AND IFNULL(linked_checkin, '') = ''
+          AND time >= %(read_from)s AND time < %(read_until)s
+        ORDER BY employee, time
+    """, values, as_dict=True)
+
+    grouped = defaultdict(list)
+    for log in logs:
+        grouped[log.employee].append(log)
+    return {employee: pairs_for_day(rows, attendance_date) for employee, rows in grouped.items()}
+
+
+def pairs_for_day(logs, attendance_date):
+    """
+    Pair one employee's time-ordered punches and keep the pairs of the day:
+    those whose IN (or, for an OUT that closes nothing, whose OUT) is on it.
+    """
+    attendance_date = getdate(attendance_date)
+    return [
+        pair for pair in checkin_pairing.iter_pairs(checkin_pairing.punches(logs))
+        if getdate((pair.check_in or pair.check_out).time) == attendance_date
+    ]
+
+
+def _day_still_open(pairs, shift, current_time):
+    """
+    Whether the employee may still be working the day: the shift has not
+    ended, or the last IN is open and could yet be closed by an OUT.
+    """
+    if shift and shift.end > current_time:
+        return True
+    last = pairs[-1] if pairs else None
+    return bool(
+        last and last.check_in and not last.check_out
+        and current_time - last.check_in.time < PAIR_WINDOW
+    )
+
+
+def _get_employees_on_leave(employee_ids, attendance_date):
+    """
+    {employee: (leave_type, leave_application)} for approved leave covering the date.
+    """
+    return {row[0]: (row[1], row[2]) for row in frappe.db.sql("""
+        SELECT employee, leave_type, name
+        FROM `tabLeave Application`
+        WHERE employee IN %(employees)s
+          AND status = 'Approved'
+          AND docstatus = 1
+          AND from_date <= %(attendance_date)s
+          AND to_date >= %(attendance_date)s
+        ORDER BY from_date
+    """, {"employees": employee_ids, "attendance_date": attendance_date})}
+
+
+def _get_employees_on_holiday(employee_ids, attendance_date):
+    return set(frappe.db.sql_list("""
+        SELECT em.name
+        FROM `tabEmployee` AS em
+        JOIN `tabHoliday` AS h ON h.parent = em.holiday_list
+        WHERE em.name IN %(employees)s
+          AND h.holiday_date = %(attendance_date)s
+    """, {"employees": employee_ids, "attendance_date": attendance_date}))
+
+
+def _resolve_attendance(pairs, is_on_leave, is_holiday, half_day_hours):
+    """
+    Return (status, working_hours, in_time, out_time) for one employee-day's
+    pairs, or a None status when no Attendance should be created.
+    """
+    if not pairs:
+        if is_on_leave:
+            return "On Leave", 0.0, None, None
+        if is_holiday:
+            return None, 0.0, None, None
+        return "Absent", 0.0, None, None
+
+    summary = summarize_pairs(pairs)
+    hours = summary["daily_working_hours"]
+    in_times = [p.check_in.time for p in pairs if p.check_in]
+    out_times = [p.check_out.time for p in pairs if p.check_out]
+
+    # Punches without a single completed IN/OUT pair are not a worked day;
+    # open_punches has already closed or flagged the IN for review
+    if not any(p.check_in and p.check_out for p in pairs):
+        if is_on_leave:
+            return "On Leave", 0.0, None, None
+        if is_holiday:
+            return None, 0.0, None, None
+        return "Absent", 0.0, min(in_times) if in_times else None, None
+
+    if hours < half_day_hours:
+        status = "Half Day"
+    elif any(p.check_in and p.check_in.row.location_type == "Work From Home" for p in pairs):
+        status = "Work From Home"
+    else:
+        status = "Present"
+
+    return (
+        status,
+        hours,
+        min(in_times) if in_times else None,
+        max(out_times) if out_times else None
+    )
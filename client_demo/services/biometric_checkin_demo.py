@@ -2,20 +2,20 @@ import frappe
 from frappe.utils import get_datetime, getdate
 from frappe import _
 from frappe.model.naming import make_autoname
+import client_demo.services.helper_functions as helpers
+import client_demo.services.reference_data as reference_data
+from client_demo.services.occupancy import record_punch_after_commit
+from client_demo.services.replica import mark_write
 
 @frappe.whitelist(allow_guest=True)
 def add_checkin(punchingcode, employee_name, time, device_id):
     # Get employee by biometric ID
-    employee = frappe.db.get_value(
-        "Employee",
-        {"attendance_device_id": punchingcode},
-        ["name", "employee_name"]
-    )
+    employee = helpers.get_employee_context_by("attendance_device_id", punchingcode)
 
     if not employee:
         frappe.throw(_("No Employee found for Biometric ID: {0}").format(punchingcode), frappe.DoesNotExistError)
 
-    employee_id, full_name = employee
+    employee_id, full_name = employee.name, employee.employee_name
     checkin_time = get_datetime(time)
     checkin_date = getdate(checkin_time)
 
@@ -37,14 +37,10 @@ def add_checkin(punchingcode, employee_name, time, device_id):
     # Generate name using naming series (e.g., CHKIN-00001)
     name = make_autoname('CHKIN-.#####')
 
-    device_doc = frappe.get_single("Biometric Device Mapping")
-    # Search in the child table
+    # Device -> location mapping is served from the reference-data cache
     location = None
     try:
-        for row in device_doc.table_sgvh:
-            if row.serial_number == device_id:
-                location = row.location
-                break 
+        location = reference_data.get_device_location(device_id)
     except Exception as e:
         frappe.log_error(f"Error while fetching device location: {str(e)}", "Biometric Lookup Error")
 
@@ -59,6 +55,8 @@ def add_checkin(punchingcode, employee_name, time, device_id):
         name, frappe.session.user, frappe.session.user,
         employee_id, full_name, checkin_time, device_id, log_type,location
     ))
+    mark_write(employee_id)
+    record_punch_after_commit(employee_id, log_type, checkin_time, location, employee.department)
 
     return {
         "status": "success",
@@ -7,6 +7,17 @@ import calendar
 from frappe.utils import time_diff_in_hours, getdate, today
 from collections import defaultdict
 from datetime import datetime, date, timedelta
+import client_demo.services.helper_functions as helpers
+import client_demo.services.reference_data as reference_data
+from client_demo.services.fast_response import datetime_field, fast_json
+from client_demo.services.replica import replica_read
+import client_demo.services.archival as archival
+import client_demo.services.shift_resolver as shift_resolver
+import client_demo.services.checkin_pairing as checkin_pairing
+
+
+# How far beyond a date range check-ins are read so pairs crossing its edges stay whole
+PAIR_WINDOW = timedelta(hours=checkin_pairing.MAX_PAIR_HOURS)
 
 
 @frappe.whitelist(allow_guest=True)
@@ -19,12 +30,13 @@ def mark_attendance(employee, log_type=None, device_id=None, shift=None):
     """
 
     # Validate employee exists
-    if not frappe.db.exists("Employee", employee):
+    if not helpers.get_employee_context(employee):
         return {"success": False, "message": _(f"Employee {employee} not found")}
     
     user = frappe.session.user
     # Get the default shift for the employee
-    shift_type = frappe.db.get_value("Employee", {"user_id": user}, ["default_shift"])
+    session_employee = helpers.get_employee_context_by("user_id", user)
+    shift_type = session_employee.default_shift if session_employee else None
 
 
 
@@ -83,32 +95,29 @@ def get_employee_details_old(user_id):
         return {"success": False, "message": _(f"User {user_id} not found")}
 
     # Find employee linked to this user
-    employee = frappe.db.get_value(
-        "Employee",
-        {"user_id": user_id},
-        ["name", "employee_name", "department", "designation"],
-        as_dict=True
-    )
+    employee = helpers.get_employee_context_by("user_id", user_id)
 
     if not employee:
         return {"success": False, "message": _(f"No Employee linked with user {user_id}")}
 
     return {
         "success": True,
-        "data": employee
+        "data": {k: employee[k] for k in ("name", "employee_name", "department", "designation")}
     }
 
 
 
 
 @frappe.whitelist(allow_guest=True)
+@fast_json
+@replica_read
 def get_employee_checkins(employee, from_date, to_date):
     """
     Fetch check-in records for an employee between from_date and to_date.
     Dates should be in YYYY-MM-DD format. Inclusive of both dates.
     """
 
-    if not frappe.db.exists("Employee", employee):
+    if not helpers.get_employee_context(employee):
         return {"success": False, "message": _(f"Employee {employee} not found")}
 
     try:
@@ -116,15 +125,21 @@ def get_employee_checkins(employee, from_date, to_date):
         # set to_date as end of day 23:59:59
         to_dt = datetime.strptime(to_date, "%Y-%m-%d") + timedelta(days=1) - timedelta(seconds=1)
 
-        checkins = frappe.get_all(
-            "Employee Checkin",
-            filters={
-                "employee": employee,
-                "time": ["between", [from_dt, to_dt]]
-            },
-            fields=["name", "time", "log_type"],
-            order_by="time asc"
-        )
+        fields = ["name", datetime_field("time"), "log_type"]
+
+        # Ranges older than the retention window are partly in the archive table
+        if archival.reaches_archive("Employee Checkin", from_dt):
+            checkins = archival.get_history("Employee Checkin", fields, employee, from_dt, to_dt)
+        else:
+            checkins = frappe.get_all(
+                "Employee Checkin",
+                filters={
+                    "employee": employee,
+                    "time": ["between", [from_dt, to_dt]]
+                },
+                fields=fields,
+                order_by="time asc"
+            )
 
         return {
             "success": True,
@@ -136,76 +151,124 @@ def get_employee_checkins(employee, from_date, to_date):
         return {"success": False, "message": str(e)}
 
 
-# Calculate total work hours for one employee on one day from check-in logs
-def calculate_daily_work_hours(logs: list, shift_end_time: datetime = None) -> dict:
+# Calculate total work hours for one employee on one day from check-in logs.
+# With a shift (see shift_resolver) late arrival, early exit and overtime are
+# derived from the same pass; shift_end_time alone gives early exit and overtime.
+def calculate_daily_work_hours(logs: list, shift_end_time: datetime = None, shift: dict = None) -> dict:
     if not logs:
         return {}
 
+    # logs must be ordered by time, as every query feeding this returns them
+    pairs = list(checkin_pairing.iter_pairs(checkin_pairing.punches(logs)))
+    return summarize_pairs(pairs, shift_end_time, shift)
+
+
+# The daily summary of one employee-day's pairs (checkin_pairing.Pair, in time order).
+# The day and the employee fields are taken from the first pair.
+def summarize_pairs(pairs: list, shift_end_time: datetime = None, shift: dict = None) -> dict:
+    if not pairs:
+        return {}
+
     total_hours = 0.0
-    last_in_time = None
     first_in_time = None
     last_out_time = None
+    open_at_end = False
     checkin_pairs = []
 
-    for log in sorted(logs, key=lambda x: x['time']):
-        if log['log_type'] == "IN":
-            if first_in_time is None:
-                first_in_time = log['time']
-            if last_in_time is None:
-                last_in_time = log['time']
-
-        elif log['log_type'] == "OUT":
-            if last_in_time:
-                duration = time_diff_in_hours(log['time'], last_in_time)
-                total_hours += duration
-                checkin_pairs.append({
-                    "in_time": last_in_time.strftime("%H:%M"),
-                    "out_time": log['time'].strftime("%H:%M"),
-                    "duration": round(duration, 2)
-                })
-                last_in_time = None
-            last_out_time = log['time']
-    
-    # Handle unpaired IN - show it in checkin_pairs with None values
-    if last_in_time:
+    for pair in pairs:
+        if pair.check_in is None:
+            # An OUT without an IN still marks when the day ended
+            last_out_time = pair.check_out.time
+            open_at_end = False
+            continue
+
+        in_time = pair.check_in.time
+        if first_in_time is None:
+            first_in_time = in_time
+
+        if pair.check_out is None:
+            # Unpaired IN - show it in checkin_pairs with None values
+            checkin_pairs.append({"in_time": in_time.strftime("%H:%M"), "out_time": None, "duration": None})
+            open_at_end = True
+            continue
+
+        duration = pair.hours
+        total_hours += duration
+        last_out_time = pair.check_out.time
+        open_at_end = False
         checkin_pairs.append({
-            "in_time": last_in_time.strftime("%H:%M"),
-            "out_time": None,
-            "duration": None
+            "in_time": in_time.strftime("%H:%M"),
+            "out_time": last_out_time.strftime("%H:%M"),
+            "duration": round(duration, 2)
         })
 
-    # Exit time logic - only show if there's a completed pair (no unpaired IN)
+    # Exit time logic - only show if the day ends with a completed pair (no unpaired IN)
     exit_time = None
-    if last_out_time and not last_in_time:
+    if last_out_time and not open_at_end:
         exit_time = last_out_time.strftime("%H:%M")
 
+    shift_start = shift["start"] if shift else None
+    shift_end = shift["end"] if shift else shift_end_time
+
+    late_minutes = None
+    if shift_start and first_in_time:
+        late_minutes = _minutes_beyond(first_in_time, shift_start, shift.get("late_entry_grace_minutes"))
+
+    early_exit_minutes = None
+    overtime_hours = None
+    if shift_end and exit_time:
+        early_exit_minutes = _minutes_beyond(shift_end, last_out_time, shift.get("early_exit_grace_minutes") if shift else 0)
+        overtime_hours = round(max(0.0, time_diff_in_hours(last_out_time, shift_end)), 2)
+
+    first = pairs[0].check_in or pairs[0].check_out
     return {
-        "employee": logs[0].get('employee'),
-        "department": logs[0].get('department'),
-        "date": getdate(logs[0]['time']).isoformat(),
+        "employee": first.row.get('employee'),
+        "department": first.row.get('department'),
+        "date": getdate(first.time).isoformat(),
         "daily_working_hours": round(total_hours, 2),
         "entry_time": first_in_time.strftime("%H:%M") if first_in_time else None,
         "exit_time": exit_time,
         "checkin_pairs": checkin_pairs,
+        "late_minutes": late_minutes,
+        "early_exit_minutes": early_exit_minutes,
+        "overtime_hours": overtime_hours,
         "status": "Present"
     }
 
-# Group raw check-in data by employee and date, then calculate daily work summaries
-def process_daily_summaries(checkin_data: list) -> list:
-    grouped_data = defaultdict(lambda: defaultdict(list))
+
+# Whole minutes `later` is after `earlier`, 0 when within the grace period
+def _minutes_beyond(later, earlier, grace_minutes=0) -> int:
+    minutes = int((later - earlier).total_seconds() // 60)
+    return minutes if minutes > (grace_minutes or 0) else 0
+
+# Pair each employee's check-ins, then calculate daily work summaries. Each
+# employee's rows must be ordered by time. Pairing runs over the employee's
+# whole stream, so a pair crossing midnight stays whole and counts for the day
+# of its IN; callers read MAX_PAIR_HOURS beyond their range on both sides and
+# pass from_date/to_date to drop the days outside it.
+# shift_schedules ({employee: ShiftSchedule}) take precedence over a row's end_time.
+def process_daily_summaries(checkin_data: list, shift_schedules: dict = None,
+                            from_date: date = None, to_date: date = None) -> list:
+    grouped_data = defaultdict(list)
     for entry in checkin_data:
-        date_str = getdate(entry['time']).isoformat()
-        grouped_data[entry['employee']][date_str].append(entry)
+        grouped_data[entry['employee']].append(entry)
+
+    from_date = getdate(from_date) if from_date else None
+    to_date = getdate(to_date) if to_date else None
 
     daily_summaries = []
-    for employee, days in grouped_data.items():
-        for date_iso, logs in days.items():
-            if not logs:
+    for employee, logs in grouped_data.items():
+        days = defaultdict(list)
+        for pair in checkin_pairing.iter_pairs(checkin_pairing.punches(logs)):
+            days[getdate((pair.check_in or pair.check_out).time)].append(pair)
+
+        schedule = shift_schedules.get(employee) if shift_schedules else None
+        for log_date, pairs in days.items():
+            if (from_date and log_date < from_date) or (to_date and log_date > to_date):
                 continue
 
-            shift_end = logs[0].get('end_time')
+            shift_end = (pairs[0].check_in or pairs[0].check_out).row.get('end_time')
             shift_end_datetime = None
-            log_date = getdate(logs[0]['time'])
 
             if isinstance(shift_end, timedelta):
                 shift_end_datetime = datetime.combine(log_date, (datetime.min + shift_end).time())
@@ -217,7 +280,9 @@ def process_daily_summaries(checkin_data: list) -> list:
             elif isinstance(shift_end, datetime):
                  shift_end_datetime = shift_end
 
-            summary = calculate_daily_work_hours(logs, shift_end_datetime)
+            shift = schedule.shift_for(log_date) if schedule else None
+
+            summary = summarize_pairs(pairs, shift_end_datetime, shift)
             if summary:
                 daily_summaries.append(summary)
 
@@ -291,25 +356,34 @@ def calculate_period_average_upto_yesterday(
         "total_working_days_in_period": effective_working_days
     }
 
-# Fetch all check-in data for a specific employee within a date range
+# Check-in rows joined with the employee's default shift; callers supply WHERE and ORDER BY
+CHECKIN_SHIFT_QUERY = """
+    SELECT
+        ec.name AS checkin, ec.employee, ec.time, ec.log_type,
+        em.name, em.department, em.default_shift,
+        st.end_time
+    FROM `tabEmployee Checkin` AS ec
+    JOIN `tabEmployee` AS em ON ec.employee = em.name
+    LEFT JOIN `tabShift Type` AS st ON em.default_shift = st.name
+    WHERE {conditions}
+    ORDER BY {order_by}
+"""
+
+# Fetch all check-in data for a specific employee within a date range, plus
+# MAX_PAIR_HOURS either side so pairs crossing the range edges are whole.
+# Shift times come from shift_resolver, so no per-row Shift Type join is needed.
 def _get_employee_checkin_data_for_period(employee_name: str, start_date: str, end_date: str) -> list:
     try:
-        query = """
-            SELECT
-                ec.employee, ec.time, ec.log_type,
-                em.name, em.department, em.default_shift,
-                st.end_time
-            FROM `tabEmployee Checkin` AS ec
-            JOIN `tabEmployee` AS em ON ec.employee = em.name
-            LEFT JOIN `tabShift Type` AS st ON em.default_shift = st.name
-            WHERE ec.employee = %(employee_name)s
-              AND DATE(ec.time) BETWEEN %(start_date)s AND %(end_date)s
-            ORDER BY ec.time
-        """
-        return frappe.db.sql(query, {
+        return frappe.db.sql("""
+            SELECT name AS checkin, employee, time, log_type
+            FROM `tabEmployee Checkin`
+            WHERE employee = %(employee_name)s
+            AND time >= %(start_date)s AND time < %(end_date)s
+            ORDER BY time
+        """, {
             "employee_name": employee_name,
-            "start_date": start_date,
-            "end_date": end_date
+            "start_date": datetime.combine(getdate(start_date), datetime.min.time()) - PAIR_WINDOW,
+            "end_date": datetime.combine(getdate(end_date) + timedelta(days=1), datetime.min.time()) + PAIR_WINDOW
         }, as_dict=True)
     except Exception as e:
         frappe.log_error("Error fetching employee check-in data", str(e))
@@ -345,40 +419,40 @@ def _get_employee_leaves_for_period(employee_name: str, start_date: str, end_dat
 # Fetch all holiday dates for a specific employee (includes weekends)
 def _get_employee_holidays_for_period(employee_name: str, start_date: str, end_date: str) -> list:
     try:
-        holiday_list = frappe.db.get_value("Employee", employee_name, "holiday_list")
+        employee = helpers.get_employee_context(employee_name)
+        holiday_list = employee.holiday_list if employee else None
         if not holiday_list:
             return []
         
-        holidays = frappe.get_all(
-            "Holiday",
-            filters={
-                "parent": holiday_list,
-                "holiday_date": ["between", [start_date, end_date]]
-            },
-            pluck="holiday_date"
-        )
-        return holidays or []
+        start, end = getdate(start_date), getdate(end_date)
+        return [d for d in reference_data.get_holidays(holiday_list) if start <= d <= end]
     except Exception as e:
         frappe.log_error("Error fetching employee holidays", str(e))
         return []
 
 # get check-in summary
 @frappe.whitelist(allow_guest=True)
+@replica_read
 def get_employee_details(user_id: str, select_date: str = None):
     if not frappe.db.exists("User", user_id):
         return {"success": False, "message": f"User {user_id} not found"}
 
-    employee = frappe.db.get_value(
-        "Employee",
-        {"user_id": user_id, "status": "Active"},
-        ["name", "employee_name", "department", "designation"],
-        as_dict=True
-    )
+    employee = helpers.get_employee_context_by("user_id", user_id, active_only=True)
 
     if not employee:
         return {"success": False, "message": f"No active Employee linked with user {user_id}"}
 
     target_date = getdate(select_date) if select_date else getdate(today())
+    return build_employee_dashboard(employee, target_date)
+
+
+# The earliest date the dashboard needs data from (start of month or week, whichever is first)
+def get_dashboard_period_start(target_date: date) -> date:
+    return min(target_date.replace(day=1), target_date - timedelta(days=target_date.weekday()))
+
+
+# Build the dashboard payload; callers that already fetched the period's check-ins can pass them in
+def build_employee_dashboard(employee: dict, target_date: date, all_checkin_data: list = None) -> dict:
     yesterday = target_date - timedelta(days=1)
     emp_name = employee['name']
 
@@ -391,15 +465,17 @@ def get_employee_details(user_id: str, select_date: str = None):
     month_end = yesterday
 
     # The earliest date we need data from
-    earliest_date = min(month_start, week_start)
+    earliest_date = get_dashboard_period_start(target_date)
 
     # Single fetch including today's data
-    all_checkin_data = _get_employee_checkin_data_for_period(emp_name, earliest_date.isoformat(), target_date.isoformat())
+    if all_checkin_data is None:
+        all_checkin_data = _get_employee_checkin_data_for_period(emp_name, earliest_date.isoformat(), target_date.isoformat())
     leaves = _get_employee_leaves_for_period(emp_name, earliest_date.isoformat(), target_date.isoformat())
     holidays = _get_employee_holidays_for_period(emp_name, earliest_date.isoformat(), target_date.isoformat())
 
     # Process all data including today
-    all_daily_summaries = process_daily_summaries(all_checkin_data)
+    shift_schedules = shift_resolver.get_shift_schedules([emp_name])
+    all_daily_summaries = process_daily_summaries(all_checkin_data, shift_schedules, earliest_date, target_date)
 
     # Separate historical data (up to yesterday) for averages
     historical_summaries = [s for s in all_daily_summaries if getdate(s['date']) <= yesterday]
@@ -0,0 +1,74 @@
+# File: client_demo/services/checkin_pairing.py
+# The one IN/OUT pairing engine behind every hours and pairs calculation
+# ============================================================
+#
+# Sources (Employee Checkin rows, approved Remote Attendance, ...) are each
+# already ordered by time, so they are merged with heapq.merge rather than
+# concatenated and re-sorted, and the merged stream is paired as it is read:
+#   - an IN opens a pair; an OUT closes the open pair
+#   - an IN while a pair is open leaves that pair without an OUT
+#   - an OUT with no open pair (or more than MAX_PAIR_HOURS after it) is
+#     yielded on its own with check_in None
+# The stream may span days: an overnight pair belongs to the day of its IN.
+
+import heapq
+from collections import namedtuple
+from datetime import timedelta
+
+
+MAX_PAIR_HOURS = 20
+
+Punch = namedtuple("Punch", "time log_type source row")
+
+
+class Pair(namedtuple("Pair", "check_in check_out")):
+    __slots__ = ()
+
+    @property
+    def hours(self):
+        if self.check_in is None or self.check_out is None:
+            return None
+        return (self.check_out.time - self.check_in.time).total_seconds() / 3600
+
+
+def punches(rows, source=None):
+    """
+    Wrap time-ordered rows (dicts with time and log_type) as punches,
+    without copying or modifying them.
+    """
+    for row in rows:
+        yield Punch(row["time"], row["log_type"], source, row)
+
+
+def merge_punches(*sources):
+    """
+    One time-ordered stream from already time-ordered punch streams. Punches
+    at the same time keep the order of the sources.
+    """
+    return heapq.merge(*sources, key=lambda p: p.time)
+
+
+def iter_pairs(stream, max_hours=MAX_PAIR_HOURS):
+    """
+    Yield a Pair for every IN, and for every OUT that closes nothing, from
+    a time-ordered punch stream.
+    """
+    max_span = timedelta(hours=max_hours)
+    open_in = None
+
+    for punch in stream:
+        if punch.log_type == "IN":
+            if open_in is not None:
+                yield Pair(open_in, None)
+            open_in = punch
+        elif punch.log_type == "OUT":
+            if open_in is not None and punch.time - open_in.time <= max_span:
+                yield Pair(open_in, punch)
+            else:
+                if open_in is not None:
+                    yield Pair(open_in, None)
+                yield Pair(None, punch)
+            open_in = None
+
+    if open_in is not None:
+        yield Pair(open_in, None)
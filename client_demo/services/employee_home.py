@@ -0,0 +1,110 @@
+# File: client_demo/services/employee_home.py
+# Composite home-screen API for the employee app
+# ============================================================
+
+import frappe
+from frappe.utils import getdate, today
+
+import client_demo.services.checkin_dummy as checkin
+import client_demo.services.helper_functions as helpers
+import client_demo.services.remote_attendance as remote
+
+
+HOME_PANELS = ("details", "status", "pairs", "pending")
+
+
+# ============================================================
+# EMPLOYEE APIs
+# ============================================================
+
+@frappe.whitelist(allow_guest=True)
+def get_home_screen(user_id, panels=None):
+    """
+    Everything the employee home screen shows, from one shared fetch.
+
+    panels: list (or comma separated string) of details, status, pairs,
+    pending. Defaults to all. Each panel has the same shape as its
+    standalone endpoint:
+      details -> checkin_dummy.get_employee_details
+      status  -> remote_attendance.get_today_attendance_status
+      pairs   -> remote_attendance.get_today_checkin_pairs
+      pending -> remote_attendance.get_pending_remote_attendance
+    """
+    panels = _parse_panels(panels)
+    if not panels:
+        return {"success": False, "message": f"panels must be any of: {', '.join(HOME_PANELS)}"}
+
+    employee = helpers.get_employee_context_by("user_id", user_id, active_only=True)
+    if not employee:
+        return {"success": False, "message": f"No active Employee linked with user {user_id}"}
+
+    today_date = getdate(today())
+    result = {"success": True, "employee": employee.name, "date": str(today_date)}
+
+    # ---------------- SHARED FETCH ----------------
+    period_checkins = None
+    if "details" in panels:
+        # The dashboard period ends today, so it already contains today's punches
+        period_checkins = checkin._get_employee_checkin_data_for_period(
+            employee.name,
+            checkin.get_dashboard_period_start(today_date).isoformat(),
+            today_date.isoformat()
+        )
+
+    remote_today, checkins_today, pending = [], [], []
+    if panels & {"status", "pairs"}:
+        remote_today, checkins_today = _get_today_logs(employee.name, today_date, period_checkins)
+    if panels & {"status", "pending"}:
+        pending = remote.get_pending_list(employee.name)
+
+    # ---------------- PANELS ----------------
+    if "details" in panels:
+        result["details"] = checkin.build_employee_dashboard(employee, today_date, period_checkins)
+
+    if "status" in panels:
+        result["status"] = remote.build_today_status(
+            employee.name, today_date, remote_today, checkins_today, len(pending)
+        )
+
+    if "pairs" in panels:
+        pairs, total_hours = remote.build_checkin_pairs(remote_today, checkins_today)
+        result["pairs"] = {
+            "success": True,
+            "date": str(today_date),
+            "pairs": pairs,
+            "total_hours": total_hours
+        }
+
+    if "pending" in panels:
+        result["pending"] = {"success": True, "count": len(pending), "data": pending}
+
+    return result
+
+
+# ============================================================
+# HELPER FUNCTIONS (Private)
+# ============================================================
+
+def _parse_panels(panels):
+    if not panels:
+        return set(HOME_PANELS)
+    if isinstance(panels, str):
+        panels = frappe.parse_json(panels) if panels.startswith("[") else panels.split(",")
+    panels = {p.strip() for p in panels}
+    return panels if panels <= set(HOME_PANELS) else None
+
+
+def _get_today_logs(employee, today_date, period_checkins=None):
+    """
+    Today's Remote Attendance and Employee Checkins. When the dashboard
+    period was fetched, today's checkins are taken from it instead of
+    querying again.
+    """
+    checkins_today = None
+    if period_checkins is not None:
+        checkins_today = [
+            frappe._dict(name=row.checkin, log_type=row.log_type, time=row.time)
+            for row in period_checkins
+            if getdate(row.time) == today_date
+        ]
+    return remote.get_today_logs(employee, today_date, checkins_today)
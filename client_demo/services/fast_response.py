@@ -0,0 +1,113 @@
+# File: client_demo/services/fast_response.py
+# Opt-in fast serialization path for the large client_demo list endpoints
+# ============================================================
+#
+# Endpoints decorated with @fast_json build their own response when the
+# caller sends "X-Client-Demo-Fast-Json: 1" (or the site sets
+# client_demo_fast_json = 1) instead of going through frappe's encoder:
+#   - the payload is encoded with orjson when it is installed, falling back
+#     to the standard library encoder, both using frappe's json_handler for
+#     the types they cannot encode, so the output matches frappe's
+#   - datetime columns are formatted by the database (datetime_field), so no
+#     per-row Python conversion is needed; values are to the second
+#   - bodies over MIN_COMPRESS_BYTES are brotli or gzip compressed, as
+#     negotiated with Accept-Encoding
+# The response keeps frappe's {"message": ...} envelope.
+
+import functools
+import gzip
+import json
+
+import frappe
+from frappe.utils.response import json_handler
+from werkzeug.wrappers import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+FAST_JSON_HEADER = "X-Client-Demo-Fast-Json"
+MIN_COMPRESS_BYTES = 2048
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+
+# ============================================================
+# PUBLIC HELPERS
+# ============================================================
+
+def fast_json(fn):
+    """
+    Serve the endpoint's return value through the fast path when it is
+    requested. Goes below @frappe.whitelist.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        result = fn(*args, **kwargs)
+        if not is_requested():
+            return result
+        return build_response(result)
+
+    return wrapper
+
+
+def is_requested():
+    if not getattr(frappe.local, "request", None):
+        return False
+    if frappe.utils.cint(frappe.conf.get("client_demo_fast_json")):
+        return True
+    return frappe.utils.cint(frappe.get_request_header(FAST_JSON_HEADER)) == 1
+
+
+def datetime_field(fieldname):
+    """
+    Field expression for frappe.get_all: formatted by the database on the
+    fast path, the plain column otherwise.
+    """
+    if not is_requested():
+        return fieldname
+    return f"DATE_FORMAT(`{fieldname}`, '%Y-%m-%d %H:%i:%s') as {fieldname}"
+
+
+def dumps(payload):
+    """
+    Encode to bytes the way frappe does, only faster.
+    """
+    if orjson:
+        return orjson.dumps(payload, default=json_handler, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(payload, default=json_handler, separators=(",", ":")).encode()
+
+
+def build_response(payload):
+    body = dumps({"message": payload})
+    response = Response(mimetype="application/json")
+    response.headers["Vary"] = "Accept-Encoding"
+
+    encoding = _negotiate_encoding(len(body))
+    if encoding == "br":
+        body = brotli.compress(body, quality=BROTLI_QUALITY)
+    elif encoding == "gzip":
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+
+    response.set_data(body)
+    return response
+
+
+# ============================================================
+# HELPER FUNCTIONS (Private)
+# ============================================================
+
+def _negotiate_encoding(size):
+    if size < MIN_COMPRESS_BYTES:
+        return None
+    offered = ["br", "gzip"] if brotli else ["gzip"]
+    return frappe.local.request.accept_encodings.best_match(offered)
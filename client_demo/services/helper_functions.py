@@ -1,5 +1,15 @@
 import frappe
 
+# Employee fields the services need; loaded together so one query serves a whole request
+EMPLOYEE_CONTEXT_FIELDS = [
+    "name", "employee_name", "user_id", "status", "company", "department",
+    "designation", "reports_to", "default_shift", "holiday_list", "attendance_device_id"
+]
+
+# Non-name fields an Employee can be looked up by
+EMPLOYEE_LOOKUP_FIELDS = ("user_id", "attendance_device_id")
+
+
 @frappe.whitelist(allow_guest=True)
 def get_employee_docname(employee_input):
     """
@@ -12,7 +22,97 @@ def get_employee_docname(employee_input):
     """
 
     # Validate that the employee exists by name
-    if frappe.db.exists("Employee", employee_input):
-        return employee_input
+    employee = get_employee_context(employee_input)
+    if employee:
+        return employee.name
 
     return None
+
+
+def get_employee_context(employee):
+    """
+    Return the common Employee fields for an Employee docname, or None.
+    Results are memoized for the rest of the request.
+    """
+    if not employee:
+        return None
+
+    cache = _employee_cache()
+    if employee not in cache["by_name"]:
+        get_employee_contexts([employee])
+    return cache["by_name"].get(employee)
+
+
+def get_employee_context_by(field, value, active_only=False):
+    """
+    Same as get_employee_context but looks the Employee up by user_id or
+    attendance_device_id. With active_only, Left/Inactive Employees sharing
+    the value are ignored.
+    """
+    if field not in EMPLOYEE_LOOKUP_FIELDS:
+        raise ValueError(f"Cannot look up Employee by {field}")
+    if not value:
+        return None
+
+    cache = _employee_cache()
+    lookup_key = (field, value, "Active") if active_only else (field, value)
+    if lookup_key not in cache["lookups"]:
+        filters = {field: value, "status": "Active"} if active_only else {field: value}
+        employee = frappe.db.get_value("Employee", filters, EMPLOYEE_CONTEXT_FIELDS, as_dict=True)
+        cache["lookups"][lookup_key] = employee.name if employee else None
+        if employee:
+            _remember(employee)
+
+    name = cache["lookups"][lookup_key]
+    return cache["by_name"].get(name) if name else None
+
+
+def get_employee_contexts(employees):
+    """
+    Batch-load contexts for a list of Employee docnames in one query.
+    Returns {name: context}; unknown names are left out.
+    """
+    cache = _employee_cache()
+    missing = [e for e in set(employees) if e and e not in cache["by_name"]]
+
+    if missing:
+        for employee in frappe.get_all(
+            "Employee",
+            filters={"name": ["in", missing]},
+            fields=EMPLOYEE_CONTEXT_FIELDS
+        ):
+            _remember(employee)
+        for name in missing:
+            cache["by_name"].setdefault(name, None)
+
+    return {e: cache["by_name"][e] for e in employees if e and cache["by_name"].get(e)}
+
+
+def get_reportee_contexts(manager, active_only=False):
+    """
+    Contexts of everyone reporting to a manager, loaded in one query and
+    kept for the rest of the request.
+    """
+    filters = {"reports_to": manager}
+    if active_only:
+        filters["status"] = "Active"
+
+    reportees = frappe.get_all("Employee", filters=filters, fields=EMPLOYEE_CONTEXT_FIELDS)
+    for employee in reportees:
+        _remember(employee)
+    return reportees
+
+
+def _employee_cache():
+    # frappe.local is reset for every request and job, so this never outlives one call
+    if not getattr(frappe.local, "client_demo_employee_cache", None):
+        frappe.local.client_demo_employee_cache = {"by_name": {}, "lookups": {}}
+    return frappe.local.client_demo_employee_cache
+
+
+def _remember(employee):
+    cache = _employee_cache()
+    cache["by_name"][employee.name] = employee
+    for field in EMPLOYEE_LOOKUP_FIELDS:
+        if employee.get(field):
+            cache["lookups"][(field, employee.get(field))] = employee.name
@@ -1,18 +1,22 @@
 import frappe 
 from frappe import _
+from datetime import timedelta
 import client_demo.services.helper_functions as helpers
+import client_demo.services.leave_balance as leave_balance
+import client_demo.services.reference_data as reference_data
+from client_demo.services.fast_response import fast_json
+from client_demo.services.replica import replica_read
 
 @frappe.whitelist(allow_guest=True)
 def apply_leave(employee, leave_type, from_date, to_date, reason, half_day=None):
-    # normalize input -> employee docname
-    emp_docname = helpers.get_employee_docname(employee)
-    if not emp_docname:
+    # normalize input -> employee context (one query for docname, approver, company, name)
+    emp = helpers.get_employee_context(employee)
+    if not emp:
         return {"status": "error", "message": f"Employee not found: {employee}"}
-     
-    leave_approver = get_leave_approver(employee)
 
-    # fetch company from employee doc
-    company = frappe.db.get_value("Employee", emp_docname, "company")
+    emp_docname = emp.name
+    leave_approver = emp.reports_to
+    company = emp.company
     if not company:
         return {"status": "error", "message": "Employee has no Company set and no default available."}
 
@@ -20,10 +24,20 @@ def apply_leave(employee, leave_type, from_date, to_date, reason, half_day=None)
     if not frappe.db.exists("Leave Type", leave_type):
         return {"status": "error", "message": f"Leave Type not found: {leave_type}"}
 
+    # reject early from the cached ledger instead of failing inside doc.insert()
+    available = leave_balance.get_available_balance(emp_docname, leave_type, from_date)
+    if available is not None:
+        requested = leave_balance.get_requested_leave_days(emp_docname, from_date, to_date, half_day == 1)
+        if requested > available:
+            return {
+                "status": "error",
+                "message": f"Insufficient leave balance for {leave_type}: {available} available, {requested} requested"
+            }
+
     try:
         doc = frappe.new_doc("Leave Application")
         doc.employee = emp_docname               # <- use docname
-        doc.employee_name = frappe.db.get_value("Employee", emp_docname, "employee_name")
+        doc.employee_name = emp.employee_name
         doc.leave_type = leave_type
         doc.from_date = from_date
         doc.to_date = to_date
@@ -51,8 +65,7 @@ def apply_leave(employee, leave_type, from_date, to_date, reason, half_day=None)
 @frappe.whitelist(allow_guest=True)
 def get_leave_types():
     try:
-        leave_types = frappe.db.get_all("Leave Type", pluck= "name")
-        return leave_types
+        return reference_data.get_dataset("leave_types")
     
     except Exception as e:
         frappe.log_error(frappe.get_traceback(), "Error fetching Leave Types")
@@ -63,12 +76,11 @@ def get_leave_types():
 @frappe.whitelist(allow_guest=True)
 def get_leave_approver(employee):
     try:
-        emp_docname = helpers.get_employee_docname(employee)
-        if not emp_docname:
+        emp = helpers.get_employee_context(employee)
+        if not emp:
             return None
-        return frappe.db.get_value("Employee", emp_docname, "reports_to")
+        return emp.reports_to
 
-        
     except Exception as e:
         frappe.log_error(frappe.get_traceback(), "Error fetching Leave Approver")
         return {"error": str(e)}
@@ -79,32 +91,21 @@ def get_hr_manager_user():
     """
     Returns the first active user with the role 'HR Manager'.
     """
-    user = frappe.get_all(
-        "Has Role",
-        filters={"role": "HR Manager", "parenttype": "User"},
-        fields=["parent"],
-        limit_page_length=1
-    )
-    
-    if user:
-        return user  
-    return None
+    return reference_data.get_dataset("hr_manager_user")
 
 
 @frappe.whitelist(allow_guest=True)
+@fast_json
 def get_unapproved_leaves(user_id):
     # get manager id (Employee.name)
-    manager_id = frappe.db.get_value("Employee", {"user_id": user_id}, "name")
+    manager = helpers.get_employee_context_by("user_id", user_id)
 
-    if not manager_id:
+    if not manager:
         return {"status": "error", "message": f"No employee found for user {user_id}"}
+    manager_id = manager.name
 
     # Get reportees by reports_to = manager_id (Employee.name)
-    reportees = frappe.get_all(
-        "Employee",
-        filters={"reports_to": manager_id},
-        fields=["name", "employee_name", "user_id"]
-    )
+    reportees = helpers.get_reportee_contexts(manager_id)
 
     if not reportees:
         return {
@@ -150,7 +151,89 @@ def get_unapproved_leaves(user_id):
 
 @frappe.whitelist(allow_guest=True)
 def approve_leaves(leave_names, manager):
-    pass
+    """
+    Approve many leave applications for one manager in a single transaction.
+    Authority is checked for the whole list in one query and eligible rows
+    are stamped with one UPDATE. Returns an outcome for every requested name.
+    """
+    if isinstance(leave_names, str):
+        leave_names = frappe.parse_json(leave_names)
+    leave_names = list(dict.fromkeys(leave_names or []))
+
+    if not leave_names:
+        return {"status": "error", "message": "leave_names is required"}
+    if not manager:
+        return {"status": "error", "message": "manager is required"}
+    if not helpers.get_employee_context(manager):
+        return {"status": "error", "message": f"Manager not found: {manager}"}
+
+    rows = frappe.db.sql("""
+        SELECT la.name, la.docstatus, la.custom_approved_by, em.reports_to
+        FROM `tabLeave Application` AS la
+        LEFT JOIN `tabEmployee` AS em ON la.employee = em.name
+        WHERE la.name IN %(leave_names)s
+    """, {"leave_names": leave_names}, as_dict=True)
+    rows_by_name = {r.name: r for r in rows}
+
+    value = f"Approved by {manager}"
+    results = {}
+    eligible = []
+
+    for leave_name in leave_names:
+        row = rows_by_name.get(leave_name)
+        if not row:
+            results[leave_name] = {"status": "error", "message": "Leave Application not found"}
+        elif row.reports_to != manager:
+            results[leave_name] = {"status": "error", "message": f"Not authorized. Expected manager: {row.reports_to}"}
+        elif row.docstatus != 0:
+            results[leave_name] = {"status": "error", "message": "Leave Application already submitted"}
+        elif row.custom_approved_by:
+            results[leave_name] = {"status": "error", "message": f"Leave already approved by {row.custom_approved_by}"}
+        else:
+            eligible.append(leave_name)
+
+    try:
+        if eligible:
+            # Guard conditions are repeated so a concurrent approval is not overwritten
+            frappe.db.sql("""
+                UPDATE `tabLeave Application`
+                SET custom_approved_by = %(value)s, modified = %(now)s, modified_by = %(user)s
+                WHERE name IN %(leave_names)s
+                  AND docstatus = 0
+                  AND IFNULL(custom_approved_by, '') = ''
+            """, {
+                "value": value,
+                "now": frappe.utils.now_datetime(),
+                "user": frappe.session.user,
+                "leave_names": eligible
+            })
+
+            approved = set(frappe.get_all(
+                "Leave Application",
+                filters={"name": ["in", eligible], "custom_approved_by": value},
+                pluck="name"
+            ))
+            frappe.db.commit()
+
+            for leave_name in eligible:
+                if leave_name in approved:
+                    results[leave_name] = {"status": "success", "message": f"Leave approved: {value}"}
+                else:
+                    results[leave_name] = {"status": "error", "message": "Leave was approved concurrently"}
+
+    except Exception as e:
+        frappe.db.rollback()
+        frappe.log_error(frappe.get_traceback(), "Error approving leaves")
+        return {"status": "error", "message": str(e)}
+
+    approved_count = sum(1 for r in results.values() if r["status"] == "success")
+    return {
+        "status": "success",
+        "manager": manager,
+        "approved_count": approved_count,
+        "failed_count": len(leave_names) - approved_count,
+        "results": [{"leave_name": n, **results[n]} for n in leave_names]
+    }
 
 
 @frappe.whitelist(allow_guest=True)
@@ -162,12 +245,12 @@ def approve_leave(leave_name, employee):
         return {"status": "error", "message": "employee is required"}
     
     # Resolve employee correctly
-    emp_docname = helpers.get_employee_docname(employee)
-    if not emp_docname:
+    emp = helpers.get_employee_context(employee)
+    if not emp:
         return {"status": "error", "message": f"Employee not found: {employee}"}
 
     # Get manager info - get the manager's ID (name field)
-    manager_id = frappe.db.get_value("Employee", emp_docname, "reports_to")
+    manager_id = emp.reports_to
 
     try:
         # Load the Leave Application
@@ -201,7 +284,7 @@ def get_pending_leave_application_status(employee, month=None, year=None):
     try:
         # Convert employee input → Employee Docname
         emp_docname = helpers.get_employee_docname(employee)
-        if not frappe.db.exists("Employee", {"name": emp_docname}): return {"success": False, "message": f"Employee {employee} not found"}
+        if not emp_docname: return {"success": False, "message": f"Employee {employee} not found"}
 
 
         # ---------------- YEAR ----------------
@@ -268,6 +351,205 @@ def get_pending_leave_application_status(employee, month=None, year=None):
 
     
 
+LEAVE_STATUS_FIELDS = [
+    "name", "leave_type", "from_date", "to_date", "total_leave_days",
+    "half_day", "status", "custom_approved_by", "posting_date"
+]
+
+# Buckets shown in the app; evaluated in SQL so counts and rows agree
+LEAVE_STATUS_BUCKET = """
+    CASE
+        WHEN status = 'Rejected' THEN 'rejected'
+        WHEN status = 'Cancelled' OR docstatus = 2 THEN 'cancelled'
+        WHEN status = 'Approved' OR IFNULL(custom_approved_by, '') != '' THEN 'approved'
+        ELSE 'pending'
+    END
+"""
+
+
+@frappe.whitelist(allow_guest=True)
+@fast_json
+@replica_read
+def view_leave_status(employee, from_date=None, to_date=None, start=0, page_length=20):
+    """
+    Leave status for an employee over a date range (up to one year).
+    Returns per-status counts and day totals computed in one GROUP BY,
+    plus one page of leave applications with only the fields the app shows.
+    """
+    try:
+        emp_docname = helpers.get_employee_docname(employee)
+        if not emp_docname:
+            return {"success": False, "message": f"Employee {employee} not found"}
+
+        current_year = frappe.utils.now_datetime().year
+        from_date = frappe.utils.getdate(from_date or f"{current_year}-01-01")
+        to_date = frappe.utils.getdate(to_date or f"{current_year}-12-31")
+
+        if from_date > to_date:
+            return {"success": False, "message": "from_date cannot be after to_date"}
+        if frappe.utils.date_diff(to_date, from_date) > 366:
+            return {"success": False, "message": "Date range cannot be longer than one year"}
+
+        start = max(frappe.utils.cint(start), 0)
+        page_length = min(max(frappe.utils.cint(page_length) or 20, 1), 100)
+
+        values = {"employee": emp_docname, "from_date": from_date, "to_date": to_date}
+        conditions = """
+            employee = %(employee)s
+            AND from_date <= %(to_date)s
+            AND to_date >= %(from_date)s
+        """
+
+        # ---------------- SUMMARY ----------------
+        summary = {
+            bucket: {"count": 0, "days": 0.0}
+            for bucket in ("approved", "pending", "rejected", "cancelled")
+        }
+        for row in frappe.db.sql(f"""
+            SELECT {LEAVE_STATUS_BUCKET} AS bucket,
+                COUNT(*) AS count,
+                IFNULL(SUM(total_leave_days), 0) AS days
+            FROM `tabLeave Application`
+            WHERE {conditions}
+            GROUP BY bucket
+        """, values, as_dict=True):
+            summary[row.bucket] = {"count": row.count, "days": frappe.utils.flt(row.days)}
+
+        total = sum(b["count"] for b in summary.values())
+
+        # ---------------- PAGE ----------------
+        leaves = frappe.db.sql(f"""
+            SELECT {", ".join(LEAVE_STATUS_FIELDS)}, {LEAVE_STATUS_BUCKET} AS leave_status
+            FROM `tabLeave Application`
+            WHERE {conditions}
+            ORDER BY from_date DESC, name DESC
+            LIMIT %(start)s, %(page_length)s
+        """, {**values, "start": start, "page_length": page_length}, as_dict=True)
+
+        return {
+            "success": True,
+            "from_date": str(from_date),
+            "to_date": str(to_date),
+            "summary": summary,
+            "total": total,
+            "start": start,
+            "page_length": page_length,
+            "has_more": start + len(leaves) < total,
+            "data": leaves
+        }
+
+    except Exception as e:
+        frappe.log_error(frappe.get_traceback(), "Leave Status API Error")
+        return {"success": False, "error": str(e)}
+
+
 @frappe.whitelist(allow_guest=True)
-def view_leave_status():
-    pass
+@replica_read
+def get_team_leave_coverage(user_id, from_date=None, to_date=None, include_pending=1):
+    """
+    Per-day count and names of a manager's reportees who are on leave.
+    All overlapping leave intervals are loaded in one query and walked once
+    with a sweep line, so cost grows with leaves + days, not reportees x days.
+    Pending (open, not yet submitted) leaves are included unless include_pending=0.
+    """
+    try:
+        manager = helpers.get_employee_context_by("user_id", user_id)
+        if not manager:
+            return {"success": False, "message": f"No employee found for user {user_id}"}
+
+        from_date = frappe.utils.getdate(from_date or frappe.utils.today())
+        to_date = frappe.utils.getdate(to_date or frappe.utils.add_days(from_date, 90))
+
+        if from_date > to_date:
+            return {"success": False, "message": "from_date cannot be after to_date"}
+        if frappe.utils.date_diff(to_date, from_date) > 184:
+            return {"success": False, "message": "Date range cannot be longer than six months"}
+
+        reportees = helpers.get_reportee_contexts(manager.name, active_only=True)
+        if not reportees:
+            return {
+                "success": True,
+                "manager": manager.name,
+                "reportees_count": 0,
+                "peak_absent_count": 0,
+                "days": []
+            }
+
+        statuses = ["Approved", "Open"] if frappe.utils.cint(include_pending) else ["Approved"]
+        leaves = frappe.db.sql("""
+            SELECT name, employee, employee_name, leave_type, from_date, to_date, status
+            FROM `tabLeave Application`
+            WHERE employee IN %(employees)s
+              AND status IN %(statuses)s
+              AND docstatus < 2
+              AND from_date <= %(to_date)s
+              AND to_date >= %(from_date)s
+        """, {
+            "employees": [r.name for r in reportees],
+            "statuses": statuses,
+            "from_date": from_date,
+            "to_date": to_date
+        }, as_dict=True)
+
+        days = _sweep_leave_coverage(leaves, from_date, to_date)
+
+        return {
+            "success": True,
+            "manager": manager.name,
+            "reportees_count": len(reportees),
+            "peak_absent_count": max((d["absent_count"] for d in days), default=0),
+            "days": days
+        }
+
+    except Exception as e:
+        frappe.log_error(frappe.get_traceback(), "Team Leave Coverage Error")
+        return {"success": False, "error": str(e)}
+
+
+def _sweep_leave_coverage(leaves, from_date, to_date):
+    """
+    Turn leave intervals into one row per day between from_date and to_date.
+    Each leave adds a start event on its first day and an end event the day
+    after its last day; events are applied in date order while walking days.
+    """
+    one_day = timedelta(days=1)
+    events = []
+    for leave in leaves:
+        start = max(frappe.utils.getdate(leave.from_date), from_date)
+        end = min(frappe.utils.getdate(leave.to_date), to_date) + one_day
+        events.append((start, 1, leave))
+        events.append((end, -1, leave))
+    # End events (-1) sort before start events on the same day
+    events.sort(key=lambda e: (e[0], e[1]))
+
+    active = {}
+    days = []
+    i = 0
+    current = from_date
+    while current <= to_date:
+        while i < len(events) and events[i][0] <= current:
+            _event_date, delta, leave = events[i]
+            if delta > 0:
+                active[leave.name] = leave
+            else:
+                active.pop(leave.name, None)
+            i += 1
+
+        # An employee with two overlapping applications is counted once
+        on_leave = {}
+        for leave in active.values():
+            on_leave.setdefault(leave.employee, {
+                "employee": leave.employee,
+                "employee_name": leave.employee_name,
+                "leave_type": leave.leave_type,
+                "status": leave.status
+            })
+
+        days.append({
+            "date": str(current),
+            "absent_count": len(on_leave),
+            "employees": sorted(on_leave.values(), key=lambda e: e["employee_name"] or e["employee"])
+        })
+        current += one_day
+
+    return days
@@ -0,0 +1,259 @@
+# File: client_demo/services/leave_balance.py
+# Cached leave balance ledger per employee, leave type and period
+# ============================================================
+#
+# Each employee has one redis hash. Fields are
+#   "<leave_type>|<period_from>|<period_to>|<metric>"
+# where metric is allocated, taken or pending, plus BUILT_FIELD so an employee
+# without allocations is cached too. The hash is built from the database on
+# first read and then kept current with HINCRBYFLOAT from the Leave
+# Allocation / Leave Application doc events wired in hooks.py, applied only
+# once the saving transaction commits. It expires after LEDGER_TTL, which
+# bounds how long a build racing a concurrent submit can serve a stale total.
+
+from functools import partial
+
+import frappe
+from frappe.utils import date_diff, flt, getdate, today
+
+import client_demo.services.helper_functions as helpers
+import client_demo.services.reference_data as reference_data
+
+
+LEDGER_METRICS = ("allocated", "taken", "pending")
+LEDGER_TTL = 6 * 60 * 60
+BUILT_FIELD = "_built"
+
+
+# ============================================================
+# API
+# ============================================================
+
+@frappe.whitelist(allow_guest=True)
+def get_leave_balance(employee, date=None):
+    """
+    Get remaining leave per leave type for the allocation periods
+    covering the given date (today by default).
+    """
+    if not helpers.get_employee_context(employee):
+        return {"success": False, "message": f"Employee {employee} not found"}
+
+    on_date = getdate(date or today())
+    balances = [
+        entry for entry in get_ledger(employee)
+        if entry["from_date"] <= on_date <= entry["to_date"]
+    ]
+
+    return {
+        "success": True,
+        "date": str(on_date),
+        "data": [
+            {**entry, "from_date": str(entry["from_date"]), "to_date": str(entry["to_date"])}
+            for entry in sorted(balances, key=lambda e: e["leave_type"])
+        ]
+    }
+
+
+# ============================================================
+# PUBLIC HELPERS
+# ============================================================
+
+def get_ledger(employee):
+    """
+    Return ledger entries for an employee, building the cache if needed.
+    Each entry has leave_type, from_date, to_date, allocated, taken,
+    pending and balance (allocated - taken - pending).
+    """
+    raw = _redis("HGETALL", _ledger_key(employee))
+    if not raw:
+        raw = _build_ledger(employee)
+
+    entries = {}
+    for field, value in raw.items():
+        field = frappe.safe_decode(field)
+        if field == BUILT_FIELD:
+            continue
+        leave_type, from_date, to_date, metric = field.rsplit("|", 3)
+        entry = entries.setdefault((leave_type, from_date, to_date), {
+            "leave_type": leave_type,
+            "from_date": getdate(from_date),
+            "to_date": getdate(to_date),
+            **{m: 0.0 for m in LEDGER_METRICS}
+        })
+        entry[metric] = flt(frappe.safe_decode(value))
+
+    for entry in entries.values():
+        entry["balance"] = flt(entry["allocated"] - entry["taken"] - entry["pending"], 2)
+
+    return list(entries.values())
+
+
+def get_available_balance(employee, leave_type, on_date):
+    """
+    Balance available for a new application, or None when the leave type
+    has no allocation covering the date (the caller should not pre-check).
+    """
+    on_date = getdate(on_date)
+    for entry in get_ledger(employee):
+        if entry["leave_type"] == leave_type and entry["from_date"] <= on_date <= entry["to_date"]:
+            return entry["balance"]
+    return None
+
+
+def get_requested_leave_days(employee, from_date, to_date, half_day=False):
+    """
+    Approximate number of leave days an application will consume,
+    excluding the employee's holidays.
+    """
+    if half_day:
+        return 0.5
+
+    emp = helpers.get_employee_context(employee)
+    from_date, to_date = getdate(from_date), getdate(to_date)
+    holiday_count = sum(
+        1 for d in reference_data.get_holidays(emp.holiday_list if emp else None)
+        if from_date <= d <= to_date
+    )
+
+    return date_diff(to_date, from_date) + 1 - holiday_count
+
+
+def invalidate_ledger(employee):
+    _redis("DEL", _ledger_key(employee))
+
+
+# ============================================================
+# DOC EVENTS
+# ============================================================
+
+def on_allocation_submit(doc, method=None):
+    _increment(doc.employee, doc.leave_type, doc.from_date, "allocated", doc.total_leaves_allocated)
+
+
+def on_allocation_cancel(doc, method=None):
+    _increment(doc.employee, doc.leave_type, doc.from_date, "allocated", -flt(doc.total_leaves_allocated))
+
+
+def on_application_insert(doc, method=None):
+    if doc.docstatus == 0 and doc.status == "Open":
+        _increment(doc.employee, doc.leave_type, doc.from_date, "pending", doc.total_leave_days)
+
+
+def on_application_update(doc, method=None):
+    # Draft edits can change dates, type or days; rebuilding is simpler than diffing
+    if doc.docstatus == 0 and not doc.flags.in_insert:
+        _after_commit(invalidate_ledger, doc.employee)
+
+
+def on_application_submit(doc, method=None):
+    # Only an Open draft was counted as pending; a document inserted already
+    # submitted has no saved copy to tell, so rebuild instead
+    previous = doc.get_doc_before_save()
+    if not previous:
+        _after_commit(invalidate_ledger, doc.employee)
+        return
+    if previous.docstatus == 0 and previous.status == "Open":
+        _increment(doc.employee, doc.leave_type, doc.from_date, "pending", -flt(doc.total_leave_days))
+    if doc.status == "Approved":
+        _increment(doc.employee, doc.leave_type, doc.from_date, "taken", doc.total_leave_days)
+
+
+def on_application_cancel(doc, method=None):
+    # HRMS sets status to Cancelled before this runs; the saved copy tells whether days were taken
+    previous = doc.get_doc_before_save()
+    if not previous:
+        _after_commit(invalidate_ledger, doc.employee)
+    elif previous.status == "Approved":
+        _increment(doc.employee, doc.leave_type, doc.from_date, "taken", -flt(doc.total_leave_days))
+
+
+def on_application_trash(doc, method=None):
+    _after_commit(invalidate_ledger, doc.employee)
+
+
+# ============================================================
+# HELPER FUNCTIONS (Private)
+# ============================================================
+
+def _ledger_key(employee):
+    return frappe.cache().make_key(f"client_demo:leave_balance:{employee}")
+
+
+def _redis(command, *args):
+    # Raw commands: the cache wrapper's hash helpers pickle values, which
+    # would break HINCRBYFLOAT on the same fields
+    return frappe.cache().execute_command(command, *args)
+
+
+def _build_ledger(employee):
+    values = {"employee": employee}
+    allocations = frappe.db.sql("""
+        SELECT leave_type, from_date, to_date, SUM(total_leaves_allocated) AS allocated
+        FROM `tabLeave Allocation`
+        WHERE employee = %(employee)s
+          AND docstatus = 1
+        GROUP BY leave_type, from_date, to_date
+    """, values, as_dict=True)
+
+    applications = frappe.db.sql("""
+        SELECT leave_type, from_date,
+            CASE WHEN docstatus = 1 AND status = 'Approved' THEN total_leave_days ELSE 0 END AS taken,
+            CASE WHEN docstatus = 0 AND status = 'Open' THEN total_leave_days ELSE 0 END AS pending
+        FROM `tabLeave Application`
+        WHERE employee = %(employee)s
+          AND docstatus < 2
+    """, values, as_dict=True)
+
+    mapping = {BUILT_FIELD: 1}
+    for allocation in allocations:
+        in_period = [
+            app for app in applications
+            if app.leave_type == allocation.leave_type
+            and allocation.from_date <= app.from_date <= allocation.to_date
+        ]
+        prefix = f"{allocation.leave_type}|{allocation.from_date}|{allocation.to_date}"
+        mapping[f"{prefix}|allocated"] = flt(allocation.allocated)
+        mapping[f"{prefix}|taken"] = sum(flt(app.taken) for app in in_period)
+        mapping[f"{prefix}|pending"] = sum(flt(app.pending) for app in in_period)
+
+    key = _ledger_key(employee)
+    pipe = frappe.cache().pipeline()
+    pipe.execute_command("HSET", key, *[item for pair in mapping.items() for item in pair])
+    pipe.execute_command("EXPIRE", key, LEDGER_TTL)
+    pipe.execute()
+    return mapping
+
+
+def _increment(employee, leave_type, on_date, metric, amount):
+    """
+    Apply a delta to the cached period that contains on_date once the
+    current transaction commits, so a rolled-back save leaves no trace.
+    """
+    _after_commit(_apply_increment, employee, leave_type, on_date, metric, amount)
+
+
+def _apply_increment(employee, leave_type, on_date, metric, amount):
+    """
+    When the ledger is not cached there is nothing to update; it is built on read.
+    """
+    key = _ledger_key(employee)
+    on_date = getdate(on_date)
+
+    fields = [frappe.safe_decode(f) for f in _redis("HKEYS", key)]
+    if not fields:
+        return
+
+    for field in fields:
+        if field == BUILT_FIELD:
+            continue
+        field_type, from_date, to_date, field_metric = field.rsplit("|", 3)
+        if field_type == leave_type and field_metric == metric and getdate(from_date) <= on_date <= getdate(to_date):
+            _redis("HINCRBYFLOAT", key, field, flt(amount))
+            return
+
+    # A period we have not seen yet (e.g. a new allocation); rebuild on next read
+    invalidate_ledger(employee)
+
+
+def _after_commit(fn, *args):
+    frappe.db.after_commit.add(partial(fn, *args))
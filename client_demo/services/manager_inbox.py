@@ -0,0 +1,127 @@
+# File: client_demo/services/manager_inbox.py
+# Unified approval inbox for managers
+# ============================================================
+
+import heapq
+
+import frappe
+from frappe.utils import cint, get_datetime, now_datetime
+
+import client_demo.services.helper_functions as helpers
+
+
+# ============================================================
+# MANAGER APIs
+# ============================================================
+
+@frappe.whitelist(allow_guest=True)
+def get_manager_inbox(user_id, page_length=20):
+    """
+    Pending remote attendance and leave approvals for a manager's reportees.
+    Returns per-queue counts, the oldest pending age for SLA display and the
+    first page of both queues merged oldest first.
+    """
+    manager = helpers.get_employee_context_by("user_id", user_id)
+    if not manager:
+        return {"success": False, "message": f"No employee found for user {user_id}"}
+
+    page_length = min(max(cint(page_length) or 20, 1), 100)
+    reportee_ids = [r.name for r in helpers.get_reportee_contexts(manager.name)]
+
+    if not reportee_ids:
+        return {
+            "success": True,
+            "manager": manager.name,
+            "reportees_count": 0,
+            "remote_attendance_count": 0,
+            "leave_count": 0,
+            "total_pending": 0,
+            "oldest_pending_age_hours": None,
+            "data": []
+        }
+
+    current_time = now_datetime()
+    remote_total, remote_items = _get_pending_remote_attendance(reportee_ids, page_length)
+    leave_total, leave_items = _get_pending_leaves(reportee_ids, page_length)
+
+    # Both pages are already sorted oldest first, so merge instead of re-sorting
+    merged = list(heapq.merge(remote_items, leave_items, key=lambda item: item["submitted_on"]))[:page_length]
+    for item in merged:
+        item["age_hours"] = _age_hours(item["submitted_on"], current_time)
+
+    oldest = [items[0]["submitted_on"] for items in (remote_items, leave_items) if items]
+
+    return {
+        "success": True,
+        "manager": manager.name,
+        "reportees_count": len(reportee_ids),
+        "remote_attendance_count": remote_total,
+        "leave_count": leave_total,
+        "total_pending": remote_total + leave_total,
+        "oldest_pending_age_hours": _age_hours(min(oldest), current_time) if oldest else None,
+        "data": merged
+    }
+
+
+# ============================================================
+# HELPER FUNCTIONS (Private)
+# ============================================================
+
+def _age_hours(submitted_on, current_time):
+    return round((current_time - get_datetime(submitted_on)).total_seconds() / 3600, 1)
+
+
+def _get_pending_remote_attendance(reportee_ids, page_length):
+    """
+    One query returning the total pending count (window function) and the
+    oldest `page_length` requests.
+    """
+    rows = frappe.db.sql("""
+        SELECT
+            name, employee, employee_name, log_type, time, location_type,
+            latitude, longitude, remarks,
+            COUNT(*) OVER () AS total_count
+        FROM `tabRemote Attendance`
+        WHERE employee IN %(employees)s
+          AND workflow_state = 'Pending'
+        ORDER BY time ASC
+        LIMIT %(page_length)s
+    """, {"employees": reportee_ids, "page_length": page_length}, as_dict=True)
+
+    total = rows[0].pop("total_count") if rows else 0
+    for row in rows[1:]:
+        row.pop("total_count")
+
+    return total, [
+        {"type": "Remote Attendance", "submitted_on": row.time, **row}
+        for row in rows
+    ]
+
+
+def _get_pending_leaves(reportee_ids, page_length):
+    """
+    Same filters as leave_application.get_unapproved_leaves, aged by when
+    the application was created.
+    """
+    rows = frappe.db.sql("""
+        SELECT
+            name, employee, employee_name, leave_type, from_date, to_date,
+            total_leave_days, creation,
+            COUNT(*) OVER () AS total_count
+        FROM `tabLeave Application`
+        WHERE employee IN %(employees)s
+          AND status = 'Open'
+          AND docstatus = 0
+          AND IFNULL(custom_approved_by, '') = ''
+        ORDER BY creation ASC
+        LIMIT %(page_length)s
+    """, {"employees": reportee_ids, "page_length": page_length}, as_dict=True)
+
+    total = rows[0].pop("total_count") if rows else 0
+    for row in rows[1:]:
+        row.pop("total_count")
+
+    return total, [
+        {"type": "Leave Application", "submitted_on": row.pop("creation"), **row}
+        for row in rows
+    ]
@@ -0,0 +1,271 @@
+# File: client_demo/services/metrics.py
+# Per-endpoint latency and query-count instrumentation
+# ============================================================
+#
+# before_request / after_request hooks (see hooks.py) time every call to a
+# whitelisted method in the instrumented service modules and record:
+#   wall_seconds, db_seconds, query_count, response_bytes
+# Each metric goes into a cumulative Prometheus-style histogram in redis and
+# every sample is also pushed to a per-endpoint ring buffer (last
+# RING_BUFFER_SIZE calls) that the bench command reads for top offenders.
+# Calls rejected by rate_limit are counted per endpoint and scope.
+
+import json
+import re
+import time
+
+import frappe
+from werkzeug.wrappers import Response
+
+
+INSTRUMENTED_MODULES = (
+    "client_demo.services.remote_attendance",
+    "client_demo.services.checkin_dummy",
+    "client_demo.services.leave_application",
+    "client_demo.services.biometric_checkin_demo"
+)
+
+RING_BUFFER_SIZE = 1000
+
+HISTOGRAM_BUCKETS = {
+    "wall_seconds": (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    "db_seconds": (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+    "query_count": (1, 2, 5, 10, 20, 50, 100, 200, 500),
+    "response_bytes": (1024, 10240, 102400, 1048576, 10485760)
+}
+
+_METHOD_PATH = re.compile(r"^/api/(?:v\d+/)?method/([\w.]+)")
+
+
+# ============================================================
+# API
+# ============================================================
+
+@frappe.whitelist()
+def prometheus():
+    """
+    Metrics in Prometheus text exposition format.
+    """
+    frappe.only_for("System Manager")
+
+    lines = []
+    for metric, buckets in HISTOGRAM_BUCKETS.items():
+        name = f"client_demo_endpoint_{metric}"
+        lines.append(f"# HELP {name} {metric.replace('_', ' ')} per client_demo endpoint call")
+        lines.append(f"# TYPE {name} histogram")
+
+        values = {
+            frappe.safe_decode(k): frappe.safe_decode(v)
+            for k, v in (_redis("HGETALL", _histogram_key(metric)) or {}).items()
+        }
+        for endpoint in sorted(get_endpoints()):
+            label = f'endpoint="{endpoint}"'
+            for le in buckets:
+                lines.append(f'{name}_bucket{{{label},le="{le}"}} {values.get(f"{endpoint}|{le}", 0)}')
+            lines.append(f'{name}_bucket{{{label},le="+Inf"}} {values.get(f"{endpoint}|count", 0)}')
+            lines.append(f"{name}_sum{{{label}}} {values.get(f'{endpoint}|sum', 0)}")
+            lines.append(f"{name}_count{{{label}}} {values.get(f'{endpoint}|count', 0)}")
+
+    name = "client_demo_endpoint_throttled_total"
+    lines.append(f"# HELP {name} calls rejected by the client_demo rate limiter")
+    lines.append(f"# TYPE {name} counter")
+    for (endpoint, scope), count in sorted(get_throttled().items()):
+        lines.append(f'{name}{{endpoint="{endpoint}",scope="{scope}"}} {count}')
+
+    return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
+
+
+# ============================================================
+# REQUEST HOOKS
+# ============================================================
+
+def before_request():
+    endpoint = get_request_endpoint()
+    if not endpoint:
+        return
+
+    frappe.local.client_demo_metrics = {
+        "endpoint": endpoint,
+        "started": time.perf_counter(),
+        "db_seconds": 0.0,
+        "query_count": 0
+    }
+    _track_queries(frappe.local.client_demo_metrics)
+
+
+def after_request(response=None, request=None):
+    state = getattr(frappe.local, "client_demo_metrics", None)
+    if not state:
+        return
+    frappe.local.client_demo_metrics = None
+
+    try:
+        record(state["endpoint"], {
+            "wall_seconds": time.perf_counter() - state["started"],
+            "db_seconds": state["db_seconds"],
+            "query_count": state["query_count"],
+            "response_bytes": _response_size(response)
+        })
+    except Exception:
+        # Metrics must never break the response
+        frappe.log_error(frappe.get_traceback(), "client_demo Metrics Error")
+
+
+# ============================================================
+# PUBLIC HELPERS
+# ============================================================
+
+def get_request_method():
+    """
+    The whitelisted method this request calls, if it is a method call.
+    """
+    request = getattr(frappe.local, "request", None)
+    if not request:
+        return None
+    match = _METHOD_PATH.match(request.path)
+    return match.group(1) if match else None
+
+
+def get_request_endpoint():
+    """
+    The whitelisted method being called, if it belongs to an instrumented module.
+    """
+    method = get_request_method()
+    if not method:
+        return None
+    return method if method.rsplit(".", 1)[0] in INSTRUMENTED_MODULES else None
+
+
+def track_db():
+    """
+    Count queries on the current frappe.db as well, after the request has
+    swapped connections (see replica).
+    """
+    state = getattr(frappe.local, "client_demo_metrics", None)
+    if state:
+        _track_queries(state)
+
+
+def record(endpoint, sample):
+    pipe = frappe.cache().pipeline()
+    pipe.sadd(_key("endpoints"), endpoint)
+
+    for metric, value in sample.items():
+        key = _histogram_key(metric)
+        for le in HISTOGRAM_BUCKETS[metric]:
+            if value <= le:
+                pipe.hincrby(key, f"{endpoint}|{le}", 1)
+        pipe.hincrby(key, f"{endpoint}|count", 1)
+        pipe.hincrbyfloat(key, f"{endpoint}|sum", value)
+
+    ring = _ring_key(endpoint)
+    pipe.lpush(ring, json.dumps({**sample, "at": time.time()}))
+    pipe.ltrim(ring, 0, RING_BUFFER_SIZE - 1)
+    pipe.execute()
+
+
+def record_throttle(endpoint, scope):
+    _redis("HINCRBY", _key("throttled"), f"{endpoint}|{scope}", 1)
+
+
+def get_throttled():
+    """
+    Rejected calls so far, {(endpoint, scope): count}.
+    """
+    throttled = {}
+    for field, count in (_redis("HGETALL", _key("throttled")) or {}).items():
+        endpoint, _, scope = frappe.safe_decode(field).rpartition("|")
+        throttled[(endpoint, scope)] = int(count)
+    return throttled
+
+
+def get_endpoints():
+    return {frappe.safe_decode(e) for e in _redis("SMEMBERS", _key("endpoints")) or []}
+
+
+def get_recent_samples(endpoint):
+    return [json.loads(s) for s in _redis("LRANGE", _ring_key(endpoint), 0, -1) or []]
+
+
+def get_top_offenders(sort_by="p95_wall_seconds", limit=10):
+    """
+    Summarise each endpoint's ring buffer and return the worst ones.
+    """
+    rows = []
+    for endpoint in get_endpoints():
+        samples = get_recent_samples(endpoint)
+        if not samples:
+            continue
+        walls = sorted(s["wall_seconds"] for s in samples)
+        rows.append({
+            "endpoint": endpoint,
+            "calls": len(samples),
+            "p50_wall_seconds": _percentile(walls, 50),
+            "p95_wall_seconds": _percentile(walls, 95),
+            "avg_db_seconds": sum(s["db_seconds"] for s in samples) / len(samples),
+            "avg_query_count": sum(s["query_count"] for s in samples) / len(samples),
+            "max_query_count": max(s["query_count"] for s in samples),
+            "max_response_bytes": max(s["response_bytes"] for s in samples)
+        })
+
+    rows.sort(key=lambda r: r[sort_by], reverse=True)
+    return rows[:limit]
+
+
+def reset():
+    keys = [_histogram_key(m) for m in HISTOGRAM_BUCKETS]
+    keys += [_ring_key(e) for e in get_endpoints()]
+    _redis("DEL", *keys, _key("endpoints"), _key("throttled"))
+
+
+# ============================================================
+# HELPER FUNCTIONS (Private)
+# ============================================================
+
+def _track_queries(state):
+    """
+    Wrap this request's frappe.db.sql to count statements and time spent
+    in the database. frappe.db is per request, so the patch goes away with it.
+    """
+    original_sql = frappe.db.sql
+
+    def sql(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return original_sql(*args, **kwargs)
+        finally:
+            state["db_seconds"] += time.perf_counter() - started
+            state["query_count"] += 1
+
+    frappe.db.sql = sql
+
+
+def _response_size(response):
+    if response is None:
+        return 0
+    if response.content_length is not None:
+        return response.content_length
+    if response.is_streamed:
+        return 0
+    return len(response.get_data())
+
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _key(name):
+    return frappe.cache().make_key(f"client_demo:metrics:{name}")
+
+
+def _histogram_key(metric):
+    return _key(f"hist:{metric}")
+
+
+def _ring_key(endpoint):
+    return _key(f"recent:{endpoint}")
+
+
+def _redis(command, *args):
+    return frappe.cache().execute_command(command, *args)
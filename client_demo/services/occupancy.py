@@ -0,0 +1,221 @@
+# File: client_demo/services/occupancy.py
+# Live count of who is currently IN, per location and department
+# ============================================================
+#
+# Every punch updates redis, atomically in one Lua script:
+#   state    hash employee -> {at, inside, location, department} of the
+#            latest punch seen today; a punch older than that is ignored,
+#            so late uploads and approvals cannot undo a newer punch
+#   counts   hash "location:<name>" / "department:<name>" / "total" -> people
+#            inside; fields that drop to zero are removed
+#   members  one set per location and department
+# get_occupancy reads the counts hash only: O(locations + departments),
+# whatever the number of employees or punches.
+#
+# Keys carry the date, so the counters start from zero at day rollover and
+# yesterday's expire. Punches dated another day are not counted. Biometric
+# punches are recorded by add_checkin; every other Employee Checkin insert
+# (approved Remote Attendance, desk entries) by the after_insert doc event.
+# Both record only once the inserting transaction commits, so a rolled-back
+# punch never reaches the counters.
+# Who is on site is physical-security data: get_occupancy is limited to
+# OCCUPANCY_ROLES.
+# When today's keys are missing (redis restarted), they are rebuilt once from
+# each employee's last Employee Checkin of the day.
+
+from functools import partial
+
+import frappe
+from frappe.utils import get_datetime, getdate, today
+
+import client_demo.services.helper_functions as helpers
+
+
+OCCUPANCY_ROLES = ["Security", "HR Manager", "HR User", "System Manager"]
+KEY_TTL = 2 * 24 * 60 * 60
+NO_LOCATION = "Unknown"
+NO_DEPARTMENT = "None"
+
+_RECORD_PUNCH = """
+local employee, inside, at = ARGV[1], ARGV[2] == "IN", tonumber(ARGV[3])
+local prefix, ttl = ARGV[6], tonumber(ARGV[7])
+
+local function move(location, department, delta)
+    for _, field in ipairs({"location:" .. location, "department:" .. department, "total"}) do
+        if redis.call("HINCRBY", KEYS[2], field, delta) <= 0 then
+            redis.call("HDEL", KEYS[2], field)
+        end
+    end
+    local command = delta > 0 and "SADD" or "SREM"
+    for _, set in ipairs({prefix .. "location:" .. location, prefix .. "department:" .. department}) do
+        redis.call(command, set, employee)
+        redis.call("EXPIRE", set, ttl)
+    end
+end
+
+local current = redis.call("HGET", KEYS[1], employee)
+if current then
+    current = cjson.decode(current)
+    if current.at > at then
+        return 0
+    end
+    if current.inside then
+        move(current.location, current.department, -1)
+    end
+end
+if inside then
+    move(ARGV[4], ARGV[5], 1)
+end
+
+redis.call("HSET", KEYS[1], employee, cjson.encode({
+    at = at, inside = inside, location = ARGV[4], department = ARGV[5]
+}))
+redis.call("EXPIRE", KEYS[1], ttl)
+redis.call("EXPIRE", KEYS[2], ttl)
+return 1
+"""
+
+_script = None
+
+
+# ============================================================
+# API
+# ============================================================
+
+@frappe.whitelist()
+def get_occupancy(location=None, department=None):
+    """
+    How many people are currently IN, per device location and department.
+    Pass location or department to also get the employees inside it.
+    """
+    frappe.only_for(OCCUPANCY_ROLES)
+
+    try:
+        date = today()
+        _ensure_built(date)
+
+        counts = {
+            frappe.safe_decode(field): int(value)
+            for field, value in frappe.cache().execute_command("HGETALL", _key(date, "counts")).items()
+        }
+        response = {
+            "success": True,
+            "date": date,
+            "total_inside": counts.pop("total", 0),
+            "locations": _group(counts, "location:"),
+            "departments": _group(counts, "department:")
+        }
+
+        for kind, value in (("location", location), ("department", department)):
+            if value:
+                members = frappe.cache().execute_command("SMEMBERS", _key(date, f"{kind}:{value}"))
+                response[f"{kind}_members"] = sorted(frappe.safe_decode(m) for m in members)
+
+        return response
+
+    except Exception as e:
+        frappe.log_error(frappe.get_traceback(), "Get Occupancy Error")
+        return {"success": False, "message": str(e)}
+
+
+# ============================================================
+# PUBLIC HELPERS
+# ============================================================
+
+def record_punch(employee, log_type, time, location=None, department=None):
+    """
+    Count a punch in today's occupancy. Never raises: a punch must not fail
+    because redis is unavailable.
+    """
+    time = get_datetime(time)
+    if str(getdate(time)) != today():
+        return
+    if department is None:
+        context = helpers.get_employee_context(employee)
+        department = context.department if context else None
+
+    try:
+        _record(today(), employee, log_type, time, location, department)
+    except Exception:
+        frappe.log_error(frappe.get_traceback(), "Occupancy Update Error")
+
+
+def record_punch_after_commit(employee, log_type, time, location=None, department=None):
+    """
+    record_punch once the current transaction commits; nothing if it rolls back.
+    """
+    frappe.db.after_commit.add(partial(record_punch, employee, log_type, time, location, department))
+
+
+def rebuild(date=None):
+    """
+    Replay each employee's last Employee Checkin of the day into the
+    counters. Safe to run at any time: punches already counted are newer
+    or equal and win.
+    """
+    date = str(getdate(date or today()))
+    location = "ec.custom_device_location" if frappe.db.has_column("Employee Checkin", "custom_device_location") else "NULL"
+
+    last_punches = frappe.db.sql(f"""
+        SELECT p.employee, p.log_type, p.time, p.location, em.department
+        FROM (
+            SELECT ec.employee, ec.log_type, ec.time, IFNULL({location}, ec.device_id) AS location,
+                ROW_NUMBER() OVER (PARTITION BY ec.employee ORDER BY ec.time DESC) AS position
+            FROM `tabEmployee Checkin` AS ec
+            WHERE ec.time >= %(day_start)s AND ec.time < %(day_end)s
+        ) AS p
+        JOIN `tabEmployee` AS em ON em.name = p.employee
+        WHERE p.position = 1
+    """, {
+        "day_start": f"{date} 00:00:00",
+        "day_end": f"{frappe.utils.add_days(date, 1)} 00:00:00"
+    }, as_dict=True)
+
+    for punch in last_punches:
+        _record(date, punch.employee, punch.log_type, punch.time, punch.location, punch.department)
+    frappe.cache().execute_command("SETEX", _key(date, "built"), KEY_TTL, 1)
+    return len(last_punches)
+
+
+# ============================================================
+# DOC EVENTS
+# ============================================================
+
+def on_checkin_insert(doc, method=None):
+    record_punch_after_commit(doc.employee, doc.log_type, doc.time, doc.get("custom_device_location") or doc.device_id)
+
+
+# ============================================================
+# HELPER FUNCTIONS (Private)
+# ============================================================
+
+def _record(date, employee, log_type, time, location, department):
+    _get_script()(
+        keys=[_key(date, "state"), _key(date, "counts")],
+        args=[
+            employee, log_type, get_datetime(time).timestamp(),
+            location or NO_LOCATION, department or NO_DEPARTMENT,
+            _key(date, ""), KEY_TTL
+        ]
+    )
+
+
+def _ensure_built(date):
+    if not frappe.cache().execute_command("EXISTS", _key(date, "built")):
+        rebuild(date)
+
+
+def _group(counts, prefix):
+    return {field[len(prefix):]: count for field, count in sorted(counts.items()) if field.startswith(prefix)}
+
+
+def _get_script():
+    # The Script object runs by SHA and reloads itself after a redis restart
+    global _script
+    if _script is None:
+        _script = frappe.cache().register_script(_RECORD_PUNCH)
+    return _script
+
+
+def _key(date, name):
+    return frappe.cache().make_key(f"client_demo:occupancy:{date}:{name}")
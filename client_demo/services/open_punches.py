@@ -0,0 +1,186 @@
+# File: client_demo/services/open_punches.py
+# Nightly detection and auto-closure of IN punches left without an OUT
+# ============================================================
+#
+# A forgotten OUT leaves the day's last pair open, which counts as zero hours.
+# Shortly after midnight, one window-function query finds every employee-day
+# of the last LOOKBACK_DAYS days whose final punch is an IN with no OUT
+# following within MAX_PAIR_HOURS (Employee Checkin plus Remote Attendance;
+# a pending remote OUT counts as an OUT). Each one is handled, in bulk, by
+# the rule configured for the employee's department:
+#   shift_end  insert an OUT Employee Checkin at the end of the day's shift
+#              (device AUTO_CLOSE_DEVICE). Falls back to flag when there is no
+#              shift or the IN came after it ended; skipped while the shift is
+#              still running, so a later run closes it.
+#   flag       open a ToDo for the employee's manager (or the reviewer in
+#              site config) referencing the IN
+# Both are idempotent: an auto-closed IN is no longer unpaired, and ToDo and
+# Checkin names are derived from the IN.
+#
+# Site config:
+#   client_demo_auto_close_rules     {"default": "shift_end", "<department>": "flag"}
+#   client_demo_auto_close_reviewer  default Administrator
+
+from datetime import datetime, timedelta
+
+import frappe
+from frappe.utils import add_days, getdate, now_datetime, today
+
+from client_demo.services.checkin_pairing import MAX_PAIR_HOURS
+from client_demo.services.shift_resolver import get_shift_schedules
+
+
+LOOKBACK_DAYS = 2
+AUTO_CLOSE_DEVICE = "auto-close"
+AUTO_CLOSE_RULES = ("shift_end", "flag")
+DEFAULT_RULE = "shift_end"
+
+CHECKIN_FIELDS = [
+    "name", "creation", "modified", "modified_by", "owner", "docstatus", "idx",
+    "employee", "employee_name", "time", "log_type", "device_id"
+]
+
+TODO_FIELDS = [
+    "name", "creation", "modified", "modified_by", "owner", "docstatus", "idx",
+    "status", "priority", "date", "allocated_to", "assigned_by", "description",
+    "reference_type", "reference_name"
+]
+
+
+# ============================================================
+# SCHEDULER ENTRY POINT
+# ============================================================
+
+def close_unpaired_punches():
+    """
+    Queue the auto-close job for the last LOOKBACK_DAYS days. Runs before
+    generate_daily_attendance, so yesterday's Attendance sees the closed pairs.
+    """
+    to_date = add_days(today(), -1)
+    frappe.enqueue(
+        "client_demo.services.open_punches.auto_close_unpaired",
+        queue="long",
+        job_id=f"client_demo::auto_close::{to_date}",
+        deduplicate=True,
+        from_date=str(add_days(to_date, -(LOOKBACK_DAYS - 1))),
+        to_date=str(to_date)
+    )
+
+
+# ============================================================
+# BACKGROUND JOB
+# ============================================================
+
+def auto_close_unpaired(from_date, to_date):
+    """
+    Apply the auto-close rules to every unpaired final IN between the two
+    dates (inclusive). Returns {"closed": n, "flagged": n, "skipped": n}.
+    """
+    open_ins = find_unpaired_ins(from_date, to_date)
+    if not open_ins:
+        return {"closed": 0, "flagged": 0, "skipped": 0}
+
+    rules = get_auto_close_rules()
+    schedules = get_shift_schedules(list({r.employee for r in open_ins}))
+    current_time = now_datetime()
+    checkins, todos, skipped = [], [], 0
+
+    for row in open_ins:
+        rule = rules.get(row.department) or rules["default"]
+        if rule == "shift_end":
+            schedule = schedules.get(row.employee)
+            shift = schedule.shift_for(getdate(row.time)) if schedule else None
+            if shift and shift.end > current_time:
+                skipped += 1
+                continue
+            if shift and shift.end > row.time:
+                checkins.append(_closing_checkin(row, shift.end, current_time))
+                continue
+        todos.append(_review_todo(row, current_time))
+
+    if checkins:
+        frappe.db.bulk_insert("Employee Checkin", CHECKIN_FIELDS, checkins, ignore_duplicates=True)
+    if todos:
+        frappe.db.bulk_insert("ToDo", TODO_FIELDS, todos, ignore_duplicates=True)
+    frappe.db.commit()
+
+    return {"closed": len(checkins), "flagged": len(todos), "skipped": skipped}
+
+
+# ============================================================
+# PUBLIC HELPERS
+# ============================================================
+
+def find_unpaired_ins(from_date, to_date):
+    """
+    Every employee-day between the two dates (inclusive) whose final punch
+    is an IN not followed by an OUT within MAX_PAIR_HOURS, in one query.
+    Rows: employee, employee_name, department, manager_user, doctype, name, time.
+    """
+    range_start = datetime.combine(getdate(from_date), datetime.min.time())
+    range_end = datetime.combine(add_days(getdate(to_date), 1), datetime.min.time())
+
+    return frappe.db.sql("""
+        SELECT p.employee, em.employee_name, IFNULL(em.department, '') AS department,
+            mgr.user_id AS manager_user, p.doctype, p.name, p.time
+        FROM (
+            SELECT l.*,
+                LEAD(l.log_type) OVER (PARTITION BY l.employee ORDER BY l.time) AS next_log_type,
+                LEAD(l.time) OVER (PARTITION BY l.employee ORDER BY l.time) AS next_time
+            FROM (
+                SELECT employee, 'Employee Checkin' AS doctype, name, time, log_type, 'Approved' AS state
+                FROM `tabEmployee Checkin`
+                WHERE time >= %(range_start)s AND time < %(read_until)s
+                UNION ALL
+                SELECT employee, 'Remote Attendance', name, time, log_type, workflow_state
+                FROM `tabRemote Attendance`
+                WHERE workflow_state IN ('Pending', 'Approved')
+                  AND IFNULL(linked_checkin, '') = ''
+                  AND time >= %(range_start)s AND time < %(read_until)s
+            ) AS l
+        ) AS p
+        JOIN `tabEmployee` AS em ON em.name = p.employee
+        LEFT JOIN `tabEmployee` AS mgr ON mgr.name = em.reports_to
+        WHERE p.log_type = 'IN'
+          AND p.state = 'Approved'
+          AND p.time >= %(range_start)s AND p.time < %(range_end)s
+          AND (p.next_time IS NULL OR DATE(p.next_time) > DATE(p.time))
+          AND NOT (p.next_log_type <=> 'OUT' AND p.next_time <= p.time + INTERVAL %(max_hours)s HOUR)
+        ORDER BY p.employee, p.time
+    """, {
+        "range_start": range_start,
+        "range_end": range_end,
+        "read_until": range_end + timedelta(hours=MAX_PAIR_HOURS),
+        "max_hours": MAX_PAIR_HOURS
+    }, as_dict=True)
+
+
+def get_auto_close_rules():
+    """
+    department -> rule, with a "default" entry. Unknown rules fall back to flag.
+    """
+    rules = {"default": DEFAULT_RULE, **(frappe.conf.get("client_demo_auto_close_rules") or {})}
+    return {department: rule if rule in AUTO_CLOSE_RULES else "flag" for department, rule in rules.items()}
+
+
+# ============================================================
+# HELPER FUNCTIONS (Private)
+# ============================================================
+
+def _closing_checkin(row, out_time, current_time):
+    return (
+        f"CHKIN-AUTO-{row.time:%Y%m%d}-{row.employee}", current_time, current_time,
+        "Administrator", "Administrator", 0, 0,
+        row.employee, row.employee_name, out_time, "OUT", AUTO_CLOSE_DEVICE
+    )
+
+
+def _review_todo(row, current_time):
+    reviewer = row.manager_user or frappe.conf.get("client_demo_auto_close_reviewer") or "Administrator"
+    return (
+        f"client-demo-open-in-{row.name}", current_time, current_time,
+        "Administrator", "Administrator", 0, 0,
+        "Open", "Medium", getdate(row.time), reviewer, "Administrator",
+        f"{row.employee_name or row.employee} punched IN at {row.time:%Y-%m-%d %H:%M} with no OUT.",
+        row.doctype, row.name
+    )
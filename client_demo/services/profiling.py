@@ -0,0 +1,266 @@
+# File: client_demo/services/profiling.py
+# On-demand per-request profiling for client_demo endpoints
+# ============================================================
+#
+# A request to an instrumented endpoint (see metrics.INSTRUMENTED_MODULES)
+# is profiled when either
+#   - it carries a valid X-Client-Demo-Profile header, "<expires>.<signature>"
+#     signed for the session user with the site's profiling secret, or
+#   - the session user has been flagged with set_user_profiling.
+# The request runs under cProfile, every SQL statement is captured with its
+# timing and the result is stored in redis as a profile artifact for
+# PROFILE_TTL seconds. The captured SELECTs are EXPLAINed by a job on the
+# short queue, which adds the plans to the stored profile; the profiled
+# request itself never pays for them.
+#
+# Site config:
+#   client_demo_profiling_secret       required for signed headers
+#   client_demo_profiling_max_per_hour default 20, across the site
+#   client_demo_profiling_sample_rate  default 1.0, for flagged users
+
+import cProfile
+import hashlib
+import hmac
+import io
+import json
+import pstats
+import random
+import time
+
+import frappe
+
+from client_demo.services.metrics import get_request_endpoint
+
+
+PROFILE_HEADER = "X-Client-Demo-Profile"
+PROFILE_TTL = 24 * 60 * 60
+MAX_STATEMENTS = 500
+MAX_EXPLAINS = 50
+MAX_PROFILE_LIST = 100
+
+
+# ============================================================
+# API
+# ============================================================
+
+@frappe.whitelist()
+def get_profiling_token(user=None, ttl=600):
+    """
+    Signed header value that enables profiling for `user` for `ttl` seconds.
+    """
+    frappe.only_for("System Manager")
+    user = user or frappe.session.user
+    expires = int(time.time()) + min(frappe.utils.cint(ttl) or 600, 3600)
+    return {"header": PROFILE_HEADER, "value": f"{expires}.{_sign(user, expires)}", "user": user}
+
+
+@frappe.whitelist()
+def set_user_profiling(user, enabled=1, ttl=3600):
+    """
+    Flag (or unflag) a user so their client_demo requests are profiled.
+    """
+    frappe.only_for("System Manager")
+    key = _key(f"user:{user}")
+    if frappe.utils.cint(enabled):
+        frappe.cache().execute_command("SETEX", key, min(frappe.utils.cint(ttl) or 3600, 86400), 1)
+    else:
+        frappe.cache().execute_command("DEL", key)
+    return {"success": True, "user": user, "enabled": bool(frappe.utils.cint(enabled))}
+
+
+@frappe.whitelist()
+def get_profiles():
+    """
+    Most recent profile artifacts (id, endpoint, user, wall time).
+    """
+    frappe.only_for("System Manager")
+    profiles = []
+    for profile_id in frappe.cache().execute_command("LRANGE", _key("index"), 0, MAX_PROFILE_LIST - 1) or []:
+        profile = get_profile(frappe.safe_decode(profile_id))
+        if profile:
+            profiles.append({k: profile[k] for k in ("id", "endpoint", "user", "started_at", "wall_seconds", "query_count")})
+    return profiles
+
+
+@frappe.whitelist()
+def get_profile(profile_id):
+    frappe.only_for("System Manager")
+    raw = frappe.cache().execute_command("GET", _key(f"profile:{profile_id}"))
+    return json.loads(raw) if raw else None
+
+
+# ============================================================
+# REQUEST HOOKS
+# ============================================================
+
+def before_request():
+    endpoint = get_request_endpoint()
+    if not endpoint or not _should_profile():
+        return
+
+    state = {
+        "endpoint": endpoint,
+        "user": frappe.session.user,
+        "started_at": frappe.utils.now(),
+        "started": time.perf_counter(),
+        "statements": [],
+        "profiler": cProfile.Profile()
+    }
+    _capture_queries(state)
+
+    try:
+        state["profiler"].enable()
+    except ValueError:
+        # Another profiler is already active in this thread
+        state["profiler"] = None
+
+    frappe.local.client_demo_profile = state
+
+
+def after_request(response=None, request=None):
+    state = getattr(frappe.local, "client_demo_profile", None)
+    if not state:
+        return
+    frappe.local.client_demo_profile = None
+
+    try:
+        wall_seconds = time.perf_counter() - state["started"]
+        if state["profiler"]:
+            state["profiler"].disable()
+        frappe.db.sql = state["original_sql"]
+        _save_profile(state, wall_seconds, response)
+    except Exception:
+        frappe.log_error(frappe.get_traceback(), "client_demo Profiling Error")
+
+
+# ============================================================
+# BACKGROUND JOB
+# ============================================================
+
+def explain_profile(profile_id):
+    """
+    EXPLAIN the first MAX_EXPLAINS SELECTs of a stored profile and save the
+    plans with it, keeping the profile's remaining TTL.
+    """
+    key = _key(f"profile:{profile_id}")
+    cache = frappe.cache()
+    raw = cache.execute_command("GET", key)
+    if not raw:
+        return
+
+    profile = json.loads(raw)
+    explained = 0
+    for statement in profile["statements"]:
+        if explained >= MAX_EXPLAINS:
+            break
+        if statement["query"].lstrip().upper().startswith("SELECT"):
+            try:
+                statement["explain"] = frappe.db.sql(f"EXPLAIN {statement['query']}", as_dict=True)
+            except Exception as e:
+                statement["explain"] = str(e)
+            explained += 1
+    profile["explain_status"] = "done"
+
+    ttl = cache.execute_command("TTL", key)
+    if ttl and ttl > 0:
+        cache.execute_command("SETEX", key, ttl, json.dumps(profile, default=str))
+
+
+# ============================================================
+# HELPER FUNCTIONS (Private)
+# ============================================================
+
+def _should_profile():
+    header = frappe.get_request_header(PROFILE_HEADER)
+    if header:
+        if not _valid_token(header):
+            return False
+    elif frappe.cache().execute_command("EXISTS", _key(f"user:{frappe.session.user}")):
+        if random.random() > frappe.utils.flt(frappe.conf.get("client_demo_profiling_sample_rate", 1.0)):
+            return False
+    else:
+        return False
+
+    # Site-wide cap so a stuck flag cannot profile every request
+    hour_key = _key(f"count:{int(time.time() // 3600)}")
+    count = frappe.cache().execute_command("INCR", hour_key)
+    frappe.cache().execute_command("EXPIRE", hour_key, 3600)
+    return count <= frappe.utils.cint(frappe.conf.get("client_demo_profiling_max_per_hour", 20))
+
+
+def _valid_token(value):
+    try:
+        expires, signature = value.split(".", 1)
+        expires = int(expires)
+    except ValueError:
+        return False
+    if expires < time.time():
+        return False
+    expected = _sign(frappe.session.user, expires)
+    return bool(expected) and hmac.compare_digest(expected, signature)
+
+
+def _sign(user, expires):
+    secret = frappe.conf.get("client_demo_profiling_secret")
+    if not secret:
+        return None
+    return hmac.new(secret.encode(), f"{user}:{expires}".encode(), hashlib.sha256).hexdigest()
+
+
+def _capture_queries(state):
+    original_sql = frappe.db.sql
+    state["original_sql"] = original_sql
+
+    def sql(query, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return original_sql(query, *args, **kwargs)
+        finally:
+            if len(state["statements"]) < MAX_STATEMENTS:
+                state["statements"].append({
+                    # last_query has the values interpolated
+                    "query": str(frappe.db.last_query or query),
+                    "seconds": round(time.perf_counter() - started, 6)
+                })
+
+    frappe.db.sql = sql
+
+
+def _save_profile(state, wall_seconds, response):
+    stats_text = ""
+    if state["profiler"]:
+        stream = io.StringIO()
+        pstats.Stats(state["profiler"], stream=stream).sort_stats("cumulative").print_stats(60)
+        stats_text = stream.getvalue()
+
+    profile_id = frappe.generate_hash(length=12)
+    profile = {
+        "id": profile_id,
+        "endpoint": state["endpoint"],
+        "user": state["user"],
+        "started_at": state["started_at"],
+        "wall_seconds": round(wall_seconds, 6),
+        "db_seconds": round(sum(s["seconds"] for s in state["statements"]), 6),
+        "query_count": len(state["statements"]),
+        "status_code": response.status_code if response is not None else None,
+        "statements": state["statements"],
+        "explain_status": "queued",
+        "cprofile": stats_text
+    }
+
+    cache = frappe.cache()
+    cache.execute_command("SETEX", _key(f"profile:{profile_id}"), PROFILE_TTL, json.dumps(profile, default=str))
+    cache.execute_command("LPUSH", _key("index"), profile_id)
+    cache.execute_command("LTRIM", _key("index"), 0, MAX_PROFILE_LIST - 1)
+
+    frappe.enqueue(
+        "client_demo.services.profiling.explain_profile",
+        queue="short",
+        job_id=f"client_demo::explain_profile::{profile_id}",
+        deduplicate=True,
+        profile_id=profile_id
+    )
+
+
+def _key(name):
+    return frappe.cache().make_key(f"client_demo:profiling:{name}")
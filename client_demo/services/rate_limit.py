@@ -0,0 +1,185 @@
+# File: client_demo/services/rate_limit.py
+# Token-bucket rate limiting for the guest-callable client_demo endpoints
+# ============================================================
+#
+# before_request (see hooks.py) charges one token per call to a method in
+# client_demo.services. Each endpoint has a budget: the scope the bucket is
+# keyed by, the bucket capacity (burst) and the refill rate per second.
+#   device    the device_id parameter (biometric devices)
+#   employee  the employee / user_id / manager parameter (mobile app)
+#   ip        the client address
+# The parameters are whatever the caller sends, so they only split a client's
+# budget and are never trusted alone: a logged-in caller is keyed by the
+# session user, a guest by "<ip>:<parameter>" (so nobody can drain another
+# employee's bucket by sending their id), and every call is also charged to
+# the DEFAULT_BUDGET bucket of its IP (so rotating ids does not lift the limit).
+# When a device or employee parameter is missing the caller's IP is used.
+# An empty bucket raises TooManyRequestsError (HTTP 429); after_request adds
+# a Retry-After header with the seconds until the next token. Rejections are
+# counted in metrics.
+#
+# Site config:
+#   client_demo_rate_limiting  default 1, set 0 to disable
+#   client_demo_rate_limits    {method: {"scope": ..., "capacity": ..., "per_second": ...}}
+#                              overrides or extends ENDPOINT_BUDGETS
+
+import math
+import time
+
+import frappe
+from frappe import _
+
+from client_demo.services.metrics import get_request_method, record_throttle
+
+
+SERVICES_PREFIX = "client_demo.services."
+
+# method -> (scope, capacity, tokens per second)
+ENDPOINT_BUDGETS = {
+    # A device uploads its buffered punches in bursts after reconnecting
+    "client_demo.services.biometric_checkin_demo.add_checkin": ("device", 300, 5),
+    "client_demo.services.remote_attendance.mark_remote_attendance": ("employee", 10, 0.1),
+    "client_demo.services.leave_application.apply_leave": ("employee", 10, 0.05),
+    # Heavy reads: a screen refresh now and then, not a polling loop
+    "client_demo.services.checkin_dummy.get_employee_details": ("employee", 10, 0.2),
+    "client_demo.services.checkin_dummy.get_employee_checkins": ("employee", 10, 0.2),
+    "client_demo.services.remote_attendance.get_remote_attendance_history": ("employee", 10, 0.2),
+    "client_demo.services.remote_attendance.get_approval_history": ("employee", 10, 0.2),
+    "client_demo.services.attendance_export.export_company_attendance": ("employee", 3, 0.01),
+    # Managers approve in batches
+    "client_demo.services.remote_attendance.approve_remote_attendance": ("employee", 60, 1),
+    "client_demo.services.leave_application.approve_leaves": ("employee", 20, 0.5),
+}
+DEFAULT_BUDGET = ("ip", 120, 2)
+
+SCOPE_PARAMS = {
+    "device": ("device_id",),
+    "employee": ("employee", "user_id", "manager")
+}
+
+_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call("HMGET", KEYS[1], "tokens", "at")
+local tokens = tonumber(state[1]) or capacity
+local at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - at) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call("HSET", KEYS[1], "tokens", tokens, "at", now)
+redis.call("EXPIRE", KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(retry_after)
+"""
+
+_script = None
+
+
+# ============================================================
+# REQUEST HOOKS
+# ============================================================
+
+def before_request():
+    method = get_request_method()
+    if not method or not method.startswith(SERVICES_PREFIX):
+        return
+    if not frappe.utils.cint(frappe.conf.get("client_demo_rate_limiting", 1)):
+        return
+
+    scope, capacity, per_second = get_budget(method)
+    scope, identity = _identify(scope)
+    ip = frappe.local.request_ip or "unknown"
+
+    try:
+        retry_after = take_token(f"{method}:{scope}:{identity}", capacity, per_second)
+        if scope != "ip":
+            _ip_scope, ip_capacity, ip_per_second = DEFAULT_BUDGET
+            retry_after = max(retry_after, take_token(f"{method}:ip_all:{ip}", ip_capacity, ip_per_second))
+    except Exception:
+        # Fail open: an unreachable redis must not take the endpoints down
+        return
+
+    if retry_after:
+        frappe.local.client_demo_retry_after = retry_after
+        record_throttle(method, scope)
+        frappe.throw(
+            _("Too many requests. Please retry in {0} seconds.").format(retry_after),
+            frappe.TooManyRequestsError,
+            title=_("Rate Limited")
+        )
+
+
+def after_request(response=None, request=None):
+    retry_after = getattr(frappe.local, "client_demo_retry_after", None)
+    if not retry_after:
+        return
+    frappe.local.client_demo_retry_after = None
+    if response is not None:
+        response.headers["Retry-After"] = str(retry_after)
+
+
+# ============================================================
+# PUBLIC HELPERS
+# ============================================================
+
+def get_budget(method):
+    """
+    (scope, capacity, per_second) for a method, site config first.
+    """
+    override = (frappe.conf.get("client_demo_rate_limits") or {}).get(method)
+    scope, capacity, per_second = ENDPOINT_BUDGETS.get(method, DEFAULT_BUDGET)
+    if override:
+        scope = override.get("scope", scope)
+        capacity = frappe.utils.flt(override.get("capacity", capacity))
+        per_second = frappe.utils.flt(override.get("per_second", per_second))
+    return scope, capacity, per_second
+
+
+def take_token(bucket, capacity, per_second):
+    """
+    Take one token from `bucket`. Returns 0 when allowed, else the whole
+    seconds until a token is available.
+    """
+    script = _get_script()
+    retry_after = float(script(keys=[_key(bucket)], args=[capacity, per_second, time.time()]))
+    return math.ceil(retry_after) if retry_after > 0 else 0
+
+
+# ============================================================
+# HELPER FUNCTIONS (Private)
+# ============================================================
+
+def _identify(scope):
+    """
+    The value the bucket is keyed by: the session user when logged in,
+    else the client IP qualified by the scope's parameter, or the IP alone
+    when the request does not carry it.
+    """
+    ip = frappe.local.request_ip or "unknown"
+    if scope == "ip":
+        return "ip", ip
+    if frappe.session.user and frappe.session.user != "Guest":
+        return "user", frappe.session.user
+
+    form_dict = frappe.local.form_dict or {}
+    for param in SCOPE_PARAMS.get(scope, ()):
+        value = form_dict.get(param)
+        if value:
+            return scope, f"{ip}:{value}"
+    return "ip", ip
+
+
+def _get_script():
+    # The Script object runs by SHA and reloads itself after a redis restart
+    global _script
+    if _script is None:
+        _script = frappe.cache().register_script(_TOKEN_BUCKET)
+    return _script
+
+
+def _key(name):
+    return frappe.cache().make_key(f"client_demo:rate_limit:{name}")
@@ -0,0 +1,191 @@
+# File: client_demo/services/reference_data.py
+# Versioned reference-data cache and app bootstrap endpoint
+# ============================================================
+#
+# Small, rarely changing datasets are cached in redis together with a
+# version stamp. Doc events (see hooks.py) drop the cached value and bump
+# the stamp once the saving transaction commits, so the app can ask for only
+# the datasets that changed.
+
+import time
+from functools import partial
+
+import frappe
+
+
+LOCATION_TYPES = ["Work From Home", "Field", "Service Center"]
+
+# Datasets returned by the bootstrap endpoint
+APP_DATASETS = ("leave_types", "location_types", "hr_manager_user", "shift_types")
+
+# Which datasets each doctype feeds
+DOCTYPE_DATASETS = {
+    "Leave Type": ["leave_types"],
+    "User": ["hr_manager_user"],
+    "Shift Type": ["shift_types"],
+    "Holiday List": ["holiday_lists"],
+    "Biometric Device Mapping": ["device_locations"]
+}
+
+
+# ============================================================
+# API
+# ============================================================
+
+@frappe.whitelist(allow_guest=True)
+def bootstrap(versions=None):
+    """
+    Everything the app needs at startup in one call.
+    Pass the `versions` dict from the previous response to receive only
+    the datasets whose version has changed since.
+    """
+    if isinstance(versions, str):
+        versions = frappe.parse_json(versions)
+    versions = versions or {}
+
+    current_versions = {name: get_version(name) for name in APP_DATASETS}
+    changed = [name for name in APP_DATASETS if str(versions.get(name)) != str(current_versions[name])]
+
+    return {
+        "success": True,
+        "versions": current_versions,
+        "data": {name: get_dataset(name) for name in changed}
+    }
+
+
+# ============================================================
+# PUBLIC HELPERS
+# ============================================================
+
+def get_dataset(name):
+    return frappe.cache().get_value(_data_key(name), generator=_LOADERS[name])
+
+
+def get_version(name):
+    cache = frappe.cache()
+    version = cache.get_value(_version_key(name))
+    if not version:
+        version = _new_version()
+        cache.set_value(_version_key(name), version)
+    return version
+
+
+def get_holidays(holiday_list):
+    """
+    All holiday dates of a holiday list, cached per list.
+    """
+    if not holiday_list:
+        return []
+    return frappe.cache().get_value(
+        _data_key(f"holiday_lists:{holiday_list}"),
+        generator=lambda: frappe.get_all(
+            "Holiday",
+            filters={"parent": holiday_list},
+            pluck="holiday_date",
+            order_by="holiday_date asc"
+        )
+    )
+
+
+def get_shift(shift_type):
+    return get_dataset("shift_types").get(shift_type) if shift_type else None
+
+
+def get_device_location(serial_number):
+    return get_dataset("device_locations").get(serial_number)
+
+
+def invalidate(name, *keys):
+    """
+    Drop a cached dataset (and any per-record keys under it) and bump its version.
+    """
+    cache = frappe.cache()
+    cache.delete_value([_data_key(name), *[_data_key(f"{name}:{k}") for k in keys]])
+    cache.set_value(_version_key(name), _new_version())
+
+
+# ============================================================
+# DOC EVENTS
+# ============================================================
+
+def invalidate_for_doc(doc, method=None):
+    if method == "on_update" and not _dataset_fields_changed(doc):
+        return
+    # After commit: invalidating earlier lets a concurrent read cache the old rows under the new version
+    for name in DOCTYPE_DATASETS.get(doc.doctype, []):
+        frappe.db.after_commit.add(partial(invalidate, name, doc.name))
+
+
+# ============================================================
+# HELPER FUNCTIONS (Private)
+# ============================================================
+
+def _dataset_fields_changed(doc):
+    # Users are saved on every login and profile edit; only the HR Manager role feeds a dataset
+    if doc.doctype != "User":
+        return True
+    before = doc.get_doc_before_save()
+    return not before or _is_hr_manager(before) != _is_hr_manager(doc)
+
+
+def _is_hr_manager(user):
+    return user.enabled and any(r.role == "HR Manager" for r in user.get("roles") or [])
+
+
+def _data_key(name):
+    return f"client_demo:refdata:{name}"
+
+
+def _version_key(name):
+    return f"client_demo:refdata_version:{name}"
+
+
+def _new_version():
+    return int(time.time() * 1000)
+
+
+def _load_leave_types():
+    return frappe.db.get_all("Leave Type", pluck="name")
+
+
+def _load_location_types():
+    return list(LOCATION_TYPES)
+
+
+def _load_hr_manager_user():
+    return frappe.get_all(
+        "Has Role",
+        filters={"role": "HR Manager", "parenttype": "User"},
+        fields=["parent"],
+        limit_page_length=1
+    ) or None
+
+
+def _load_shift_types():
+    shifts = frappe.get_all(
+        "Shift Type",
+        fields=["name", "start_time", "end_time", "late_entry_grace_period", "early_exit_grace_period"]
+    )
+    return {
+        s.name: {
+            "start_time": str(s.start_time),
+            "end_time": str(s.end_time),
+            "late_entry_grace_period": s.late_entry_grace_period or 0,
+            "early_exit_grace_period": s.early_exit_grace_period or 0
+        }
+        for s in shifts
+    }
+
+
+def _load_device_locations():
+    device_doc = frappe.get_single("Biometric Device Mapping")
+    return {row.serial_number: row.location for row in device_doc.table_sgvh}
+
+
+_LOADERS = {
+    "leave_types": _load_leave_types,
+    "location_types": _load_location_types,
+    "hr_manager_user": _load_hr_manager_user,
+    "shift_types": _load_shift_types,
+    "device_locations": _load_device_locations
+}
@@ -7,10 +7,18 @@ from frappe import _
 from frappe.utils import now_datetime, getdate, today, get_datetime
 from datetime import datetime, timedelta
 import client_demo.services.helper_functions as helpers
+import client_demo.services.reference_data as reference_data
+from client_demo.services.fast_response import datetime_field, fast_json
+from client_demo.services.replica import mark_write, replica_read
+import client_demo.services.archival as archival
+import client_demo.services.checkin_pairing as checkin_pairing
+
+
+MAX_PAIR_RANGE_DAYS = 93
 
 
 # ============================================================
-# EMPLOYEE APIs (7 APIs)
+# EMPLOYEE APIs (8 APIs)
 # ============================================================
 
 @frappe.whitelist(allow_guest=True)
@@ -23,7 +31,7 @@ def mark_remote_attendance(employee, latitude, longitude, location_type=None, de
     Optional: device_info, remarks
     """
     # Validate employee
-    if not frappe.db.exists("Employee", employee):
+    if not helpers.get_employee_context(employee):
         return {"success": False, "message": f"Employee {employee} not found"}
     
     # Get today's date
@@ -35,7 +43,7 @@ def mark_remote_attendance(employee, latitude, longitude, location_type=None, de
     
     # Validate location_type for IN
     if next_log_type == "IN":
-        valid_location_types = ["Work From Home", "Field", "Service Center"]
+        valid_location_types = reference_data.get_dataset("location_types")
         if not location_type or location_type not in valid_location_types:
             return {
                 "success": False, 
@@ -43,7 +51,7 @@ def mark_remote_attendance(employee, latitude, longitude, location_type=None, de
             }
     
     # Get manager (reports_to) for approval message
-    manager = frappe.db.get_value("Employee", employee, "reports_to")
+    manager = helpers.get_employee_context(employee).reports_to
     
     try:
         # Create Remote Attendance document
@@ -61,6 +69,7 @@ def mark_remote_attendance(employee, latitude, longitude, location_type=None, de
         })
         doc.insert(ignore_permissions=True)
         frappe.db.commit()
+        mark_write(employee)
         
         return {
             "success": True,
@@ -78,19 +87,17 @@ def mark_remote_attendance(employee, latitude, longitude, location_type=None, de
 
 
 @frappe.whitelist(allow_guest=True)
+@replica_read
 def get_today_attendance_status(employee):
     """
     Get today's attendance status for an employee.
     Returns next log type (IN/OUT) and current status.
     """
-    if not frappe.db.exists("Employee", employee):
+    if not helpers.get_employee_context(employee):
         return {"success": False, "message": f"Employee {employee} not found"}
     
     today_date = getdate(today())
-    next_log_type = _get_next_log_type(employee, today_date)
-    
-    # Count today's checkins
-    total_checkins = _count_today_checkins(employee, today_date)
+    remote_today, checkins_today = get_today_logs(employee, today_date)
     
     # Count pending approvals
     pending_count = frappe.db.count("Remote Attendance", {
@@ -98,18 +105,7 @@ def get_today_attendance_status(employee):
         "workflow_state": "Pending"
     })
     
-    # Get last checkin
-    last_checkin = _get_last_checkin(employee)
-    
-    return {
-        "success": True,
-        "date": str(today_date),
-        "next_log_type": next_log_type,
-        "total_checkins_today": total_checkins,
-        "pending_approvals": pending_count,
-        "last_checkin": last_checkin,
-        "is_first_of_day": total_checkins == 0
-    }
+    return build_today_status(employee, today_date, remote_today, checkins_today, pending_count)
 
 
 @frappe.whitelist(allow_guest=True)
@@ -117,7 +113,7 @@ def get_location_type_options():
     """
     Get available location type options for IN attendance.
     """
-    return ["Work From Home", "Field", "Service Center"]
+    return reference_data.get_dataset("location_types")
 
 
 @frappe.whitelist(allow_guest=True)
@@ -125,18 +121,10 @@ def get_pending_remote_attendance(employee):
     """
     Get all pending remote attendance requests for an employee.
     """
-    if not frappe.db.exists("Employee", employee):
+    if not helpers.get_employee_context(employee):
         return {"success": False, "message": f"Employee {employee} not found"}
     
-    pending = frappe.get_all(
-        "Remote Attendance",
-        filters={
-            "employee": employee,
-            "workflow_state": "Pending"
-        },
-        fields=["name", "log_type", "time", "location_type", "workflow_state", "latitude", "longitude", "remarks"],
-        order_by="time desc"
-    )
+    pending = get_pending_list(employee)
     
     return {
         "success": True,
@@ -146,12 +134,14 @@ def get_pending_remote_attendance(employee):
 
 
 @frappe.whitelist(allow_guest=True)
+@fast_json
+@replica_read
 def get_remote_attendance_history(employee, from_date=None, to_date=None):
     """
     Get remote attendance history for an employee.
     Optional date filter.
     """
-    if not frappe.db.exists("Employee", employee):
+    if not helpers.get_employee_context(employee):
         return {"success": False, "message": f"Employee {employee} not found"}
     
     filters = {"employee": employee}
@@ -164,16 +154,25 @@ def get_remote_attendance_history(employee, from_date=None, to_date=None):
     elif to_date:
         filters["time"] = ["<=", to_date + " 23:59:59"]
     
-    records = frappe.get_all(
-        "Remote Attendance",
-        filters=filters,
-        fields=[
-            "name", "log_type", "time", "location_type", 
-            "workflow_state", "approved_by", "approved_on",
-            "rejection_reason", "linked_checkin", "latitude", "longitude"
-        ],
-        order_by="time desc"
-    )
+    fields = [
+        "name", "log_type", datetime_field("time"), "location_type",
+        "workflow_state", "approved_by", datetime_field("approved_on"),
+        "rejection_reason", "linked_checkin", "latitude", "longitude"
+    ]
+    
+    # Decided requests older than the retention window are in the archive table
+    if archival.reaches_archive("Remote Attendance", from_date):
+        records = archival.get_history(
+            "Remote Attendance", fields, employee,
+            from_date, to_date + " 23:59:59" if to_date else None, order="desc"
+        )
+    else:
+        records = frappe.get_all(
+            "Remote Attendance",
+            filters=filters,
+            fields=fields,
+            order_by="time desc"
+        )
     
     return {
         "success": True,
@@ -208,6 +207,7 @@ def cancel_remote_attendance(name, employee):
         # Use db_set to bypass workflow state machine validation
         frappe.db.set_value("Remote Attendance", name, "workflow_state", "Cancelled")
         frappe.db.commit()
+        mark_write(employee)
         
         return {
             "success": True,
@@ -220,97 +220,84 @@ def cancel_remote_attendance(name, employee):
 
 
 @frappe.whitelist(allow_guest=True)
+@replica_read
 def get_today_checkin_pairs(employee):
     """
     Get today's IN/OUT pairs with duration for an employee.
     Combines both Remote Attendance (approved) and Employee Checkin.
     """
-    if not frappe.db.exists("Employee", employee):
+    if not helpers.get_employee_context(employee):
         return {"success": False, "message": f"Employee {employee} not found"}
     
     today_date = getdate(today())
-    today_start = f"{today_date} 00:00:00"
-    today_end = f"{today_date} 23:59:59"
-    
-    # Get approved Remote Attendance
-    remote_checkins = frappe.get_all(
-        "Remote Attendance",
-        filters={
-            "employee": employee,
-            "workflow_state": "Approved",
-            "time": ["between", [today_start, today_end]]
-        },
-        fields=["log_type", "time", "location_type"],
-        order_by="time asc"
-    )
+    remote_today, checkins_today = get_today_logs(employee, today_date)
+    pairs, total_hours = build_checkin_pairs(remote_today, checkins_today)
     
-    # Get Employee Checkins (from biometric/other sources)
-    employee_checkins = frappe.get_all(
-        "Employee Checkin",
-        filters={
-            "employee": employee,
-            "time": ["between", [today_start, today_end]]
-        },
-        fields=["log_type", "time"],
-        order_by="time asc"
-    )
-    
-    # Combine and sort all checkins
-    all_checkins = []
-    for r in remote_checkins:
-        all_checkins.append({
-            "log_type": r.log_type,
-            "time": r.time,
-            "location_type": r.location_type,
-            "source": "remote"
-        })
-    for e in employee_checkins:
-        all_checkins.append({
-            "log_type": e.log_type,
-            "time": e.time,
-            "location_type": None,
-            "source": "biometric"
-        })
+    return {
+        "success": True,
+        "date": str(today_date),
+        "pairs": pairs,
+        "total_hours": total_hours
+    }
+
+
+@frappe.whitelist(allow_guest=True)
+@fast_json
+@replica_read
+def get_checkin_pairs(employee, from_date, to_date):
+    """
+    IN/OUT pairs with duration for an employee over a date range, from
+    approved Remote Attendance and Employee Checkin. A pair belongs to the
+    day of its IN, so overnight pairs are complete.
+    """
+    if not helpers.get_employee_context(employee):
+        return {"success": False, "message": f"Employee {employee} not found"}
     
-    all_checkins.sort(key=lambda x: x["time"])
+    from_date, to_date = getdate(from_date), getdate(to_date)
+    if from_date > to_date:
+        return {"success": False, "message": "from_date cannot be after to_date"}
+    if (to_date - from_date).days >= MAX_PAIR_RANGE_DAYS:
+        return {"success": False, "message": f"Date range cannot exceed {MAX_PAIR_RANGE_DAYS} days"}
+    
+    # Read past to_date far enough to find the OUT of an overnight pair
+    range_start = datetime.combine(from_date, datetime.min.time())
+    range_end = datetime.combine(to_date, datetime.min.time()) + timedelta(days=1)
+    read_until = range_end + timedelta(hours=checkin_pairing.MAX_PAIR_HOURS)
+    
+    remote_logs = [
+        r for r in _get_logs_between(
+            "Remote Attendance", ["name", "log_type", "time", "location_type", "workflow_state", "linked_checkin"],
+            employee, range_start, read_until
+        )
+        if r.workflow_state == "Approved"
+    ]
+    checkins = _get_logs_between("Employee Checkin", ["name", "log_type", "time"], employee, range_start, read_until)
     
-    # Build pairs
     pairs = []
-    total_hours = 0.0
-    i = 0
-    
-    while i < len(all_checkins):
-        if all_checkins[i]["log_type"] == "IN":
-            in_time = all_checkins[i]["time"]
-            location_type = all_checkins[i].get("location_type")
-            source = all_checkins[i]["source"]
-            out_time = None
-            duration = None
-            
-            # Look for matching OUT
-            if i + 1 < len(all_checkins) and all_checkins[i + 1]["log_type"] == "OUT":
-                out_time = all_checkins[i + 1]["time"]
-                duration = round((out_time - in_time).total_seconds() / 3600, 2)
-                total_hours += duration
-                i += 2
-            else:
-                i += 1
-            
-            pairs.append({
-                "in_time": in_time.strftime("%H:%M") if in_time else None,
-                "out_time": out_time.strftime("%H:%M") if out_time else None,
-                "location_type": location_type,
-                "duration_hours": duration,
-                "source": source
-            })
-        else:
-            i += 1
+    daily_hours = {}
+    for pair in checkin_pairing.iter_pairs(_merged_punches(remote_logs, checkins)):
+        if pair.check_in is None or pair.check_in.time >= range_end:
+            continue
+        day = str(pair.check_in.time.date())
+        duration = round(pair.hours, 2) if pair.check_out else None
+        daily_hours[day] = round(daily_hours.get(day, 0.0) + (duration or 0.0), 2)
+        pairs.append({
+            "date": day,
+            "in_time": str(pair.check_in.time),
+            "out_time": str(pair.check_out.time) if pair.check_out else None,
+            "location_type": pair.check_in.row.get("location_type"),
+            "duration_hours": duration,
+            "source": pair.check_in.source
+        })
     
     return {
         "success": True,
-        "date": str(today_date),
-        "pairs": pairs,
-        "total_hours": round(total_hours, 2)
+        "from_date": str(from_date),
+        "to_date": str(to_date),
+        "count": len(pairs),
+        "total_hours": round(sum(daily_hours.values()), 2),
+        "daily_hours": daily_hours,
+        "pairs": pairs
     }
 
 
@@ -319,22 +306,20 @@ def get_today_checkin_pairs(employee):
 # ============================================================
 
 @frappe.whitelist(allow_guest=True)
+@fast_json
 def get_pending_approvals(user_id):
     """
     Get all pending remote attendance requests for manager's reportees.
     """
     # Get manager's employee ID
-    manager_id = frappe.db.get_value("Employee", {"user_id": user_id}, "name")
+    manager_employee = helpers.get_employee_context_by("user_id", user_id)
     
-    if not manager_id:
+    if not manager_employee:
         return {"success": False, "message": f"No employee found for user {user_id}"}
+    manager_id = manager_employee.name
     
     # Get all reportees
-    reportees = frappe.get_all(
-        "Employee",
-        filters={"reports_to": manager_id, "status": "Active"},
-        fields=["name", "employee_name"]
-    )
+    reportees = helpers.get_reportee_contexts(manager_id, active_only=True)
     
     if not reportees:
         return {
@@ -355,7 +340,7 @@ def get_pending_approvals(user_id):
             "workflow_state": "Pending"
         },
         fields=[
-            "name", "employee", "employee_name", "log_type", "time",
+            "name", "employee", "employee_name", "log_type", datetime_field("time"),
             "location_type", "latitude", "longitude", "remarks", "device_info"
         ],
         order_by="time asc"
@@ -379,7 +364,7 @@ def approve_remote_attendance(name, manager):
     if not frappe.db.exists("Remote Attendance", name):
         return {"success": False, "message": f"Remote Attendance {name} not found"}
     
-    if not frappe.db.exists("Employee", manager):
+    if not helpers.get_employee_context(manager):
         return {"success": False, "message": f"Manager {manager} not found"}
     
     # Set ignore permissions for guest access
@@ -392,7 +377,8 @@ def approve_remote_attendance(name, manager):
         return {"success": False, "message": f"Cannot approve. Current status is {doc.workflow_state}"}
     
     # Validate manager has authority
-    employee_manager = frappe.db.get_value("Employee", doc.employee, "reports_to")
+    employee = helpers.get_employee_context(doc.employee)
+    employee_manager = employee.reports_to if employee else None
     if employee_manager != manager:
         return {"success": False, "message": f"You are not authorized to approve this request. Expected manager: {employee_manager}"}
     
@@ -406,7 +392,7 @@ def approve_remote_attendance(name, manager):
             "log_type": doc.log_type,
             "time": doc.time,
             "device_id": f"Remote-{doc.location_type or 'Mobile'}",
-            "shift": frappe.db.get_value("Employee", doc.employee, "default_shift")
+            "shift": employee.default_shift
         })
         checkin.insert(ignore_permissions=True)
         
@@ -420,6 +406,7 @@ def approve_remote_attendance(name, manager):
         })
         
         frappe.db.commit()
+        mark_write(doc.employee)
         
         return {
             "success": True,
@@ -441,7 +428,7 @@ def reject_remote_attendance(name, manager, reason):
     if not frappe.db.exists("Remote Attendance", name):
         return {"success": False, "message": f"Remote Attendance {name} not found"}
     
-    if not frappe.db.exists("Employee", manager):
+    if not helpers.get_employee_context(manager):
         return {"success": False, "message": f"Manager {manager} not found"}
     
     if not reason or not reason.strip():
@@ -457,7 +444,8 @@ def reject_remote_attendance(name, manager, reason):
         return {"success": False, "message": f"Cannot reject. Current status is {doc.workflow_state}"}
     
     # Validate manager has authority
-    employee_manager = frappe.db.get_value("Employee", doc.employee, "reports_to")
+    employee = helpers.get_employee_context(doc.employee)
+    employee_manager = employee.reports_to if employee else None
     if employee_manager != manager:
         return {"success": False, "message": f"You are not authorized to reject this request. Expected manager: {employee_manager}"}
     
@@ -471,6 +459,7 @@ def reject_remote_attendance(name, manager, reason):
         })
         
         frappe.db.commit()
+        mark_write(doc.employee)
         
         return {
             "success": True,
@@ -484,15 +473,18 @@ def reject_remote_attendance(name, manager, reason):
 
 
 @frappe.whitelist(allow_guest=True)
+@fast_json
+@replica_read
 def get_approval_history(user_id, from_date=None, to_date=None):
     """
     Get manager's approval/rejection history with optional date filter.
     """
     # Get manager's employee ID
-    manager_id = frappe.db.get_value("Employee", {"user_id": user_id}, "name")
+    manager_employee = helpers.get_employee_context_by("user_id", user_id)
     
-    if not manager_id:
+    if not manager_employee:
         return {"success": False, "message": f"No employee found for user {user_id}"}
+    manager_id = manager_employee.name
     
     filters = {
         "approved_by": manager_id,
@@ -507,15 +499,26 @@ def get_approval_history(user_id, from_date=None, to_date=None):
     elif to_date:
         filters["approved_on"] = ["<=", to_date + " 23:59:59"]
     
-    records = frappe.get_all(
-        "Remote Attendance",
-        filters=filters,
-        fields=[
-            "name", "employee", "employee_name", "log_type", "time",
-            "location_type", "workflow_state", "approved_on", "rejection_reason"
-        ],
-        order_by="approved_on desc"
-    )
+    fields = [
+        "name", "employee", "employee_name", "log_type", datetime_field("time"),
+        "location_type", "workflow_state", datetime_field("approved_on"), "rejection_reason"
+    ]
+    
+    # Decisions on requests past the retention window are in the archive table
+    if archival.reaches_archive("Remote Attendance"):
+        records = archival.get_history(
+            "Remote Attendance", fields, manager_id,
+            from_date, to_date + " 23:59:59" if to_date else None, order="desc",
+            time_field="approved_on", owner_field="approved_by",
+            filters={"workflow_state": ["Approved", "Rejected"]}
+        )
+    else:
+        records = frappe.get_all(
+            "Remote Attendance",
+            filters=filters,
+            fields=fields,
+            order_by="approved_on desc"
+        )
     
     # Count approved and rejected
     approved_count = len([r for r in records if r.workflow_state == "Approved"])
@@ -535,98 +538,153 @@ def get_approval_history(user_id, from_date=None, to_date=None):
 # HELPER FUNCTIONS (Private)
 # ============================================================
 
-def _get_next_log_type(employee, target_date):
+def get_today_logs(employee, target_date, checkins_today=None):
     """
-    Determine next log type (IN/OUT) based on existing checkins today.
-    Checks both Remote Attendance (approved) and Employee Checkin.
+    Fetch the day's pending/approved Remote Attendance and Employee Checkins,
+    both sorted by time. Shared by the status, pairs and home-screen APIs.
+    Pass checkins_today when the caller already has them.
     """
     today_start = f"{target_date} 00:00:00"
     today_end = f"{target_date} 23:59:59"
     
-    # Get last approved Remote Attendance today
-    last_remote = frappe.db.get_value(
+    remote_today = frappe.get_all(
         "Remote Attendance",
         filters={
             "employee": employee,
-            "workflow_state": "Approved",
+            "workflow_state": ["in", ["Pending", "Approved"]],
             "time": ["between", [today_start, today_end]]
         },
-        fieldname="log_type",
-        order_by="time desc"
+        fields=["name", "log_type", "time", "location_type", "workflow_state", "linked_checkin"],
+        order_by="time asc"
     )
     
-    # Get last Employee Checkin today
-    last_checkin = frappe.db.get_value(
+    if checkins_today is not None:
+        return remote_today, checkins_today
+    
+    checkins_today = frappe.get_all(
         "Employee Checkin",
         filters={
             "employee": employee,
             "time": ["between", [today_start, today_end]]
         },
-        fieldname="log_type",
-        order_by="time desc"
+        fields=["name", "log_type", "time"],
+        order_by="time asc"
     )
     
-    # Also check pending Remote Attendance (treat as if already logged)
-    last_pending = frappe.db.get_value(
+    return remote_today, checkins_today
+
+
+def get_pending_list(employee):
+    """
+    All pending remote attendance requests for an employee, newest first.
+    """
+    return frappe.get_all(
         "Remote Attendance",
         filters={
             "employee": employee,
-            "workflow_state": "Pending",
-            "time": ["between", [today_start, today_end]]
+            "workflow_state": "Pending"
         },
-        fieldname="log_type",
+        fields=["name", "log_type", "time", "location_type", "workflow_state", "latitude", "longitude", "remarks"],
         order_by="time desc"
     )
+
+
+def build_today_status(employee, today_date, remote_today, checkins_today, pending_count):
+    """
+    Build the get_today_attendance_status payload from already fetched logs.
+    """
+    total_checkins = len(remote_today) + len(checkins_today)
+    
+    # Today's logs already hold the most recent entry when there are any
+    last_checkin = _last_checkin_from(remote_today, checkins_today) or _get_last_checkin(employee)
     
-    # Get the most recent log_type from all sources
-    # For simplicity, if any pending exists, use that as reference
-    if last_pending:
-        return "OUT" if last_pending == "IN" else "IN"
+    return {
+        "success": True,
+        "date": str(today_date),
+        "next_log_type": _next_log_type_from(remote_today, checkins_today),
+        "total_checkins_today": total_checkins,
+        "pending_approvals": pending_count,
+        "last_checkin": last_checkin,
+        "is_first_of_day": total_checkins == 0
+    }
+
+
+def build_checkin_pairs(remote_today, checkins_today):
+    """
+    Build today's IN/OUT pairs from approved Remote Attendance and Employee Checkins.
+    Both lists are already ordered by time. Returns (pairs, total_hours).
+    """
+    pairs = []
+    total_hours = 0.0
+    
+    for pair in checkin_pairing.iter_pairs(_merged_punches(remote_today, checkins_today)):
+        if pair.check_in is None:
+            continue
+        duration = round(pair.hours, 2) if pair.check_out else None
+        if duration is not None:
+            total_hours += duration
+        pairs.append({
+            "in_time": pair.check_in.time.strftime("%H:%M"),
+            "out_time": pair.check_out.time.strftime("%H:%M") if pair.check_out else None,
+            "location_type": pair.check_in.row.get("location_type"),
+            "duration_hours": duration,
+            "source": pair.check_in.source
+        })
+    
+    return pairs, round(total_hours, 2)
+
+
+def _get_next_log_type(employee, target_date):
+    """
+    Determine next log type (IN/OUT) based on existing checkins today.
+    Checks both Remote Attendance (approved) and Employee Checkin.
+    """
+    remote_today, checkins_today = get_today_logs(employee, target_date)
+    return _next_log_type_from(remote_today, checkins_today)
+
+
+def _next_log_type_from(remote_today, checkins_today):
+    """
+    Pending Remote Attendance is treated as if already logged and wins;
+    otherwise approved Remote Attendance, then Employee Checkin.
+    """
+    pending = [r for r in remote_today if r.workflow_state == "Pending"]
+    approved = [r for r in remote_today if r.workflow_state == "Approved"]
     
-    # Otherwise check approved/actual checkins
-    if last_remote or last_checkin:
-        # Determine which is more recent
-        last_log = last_remote or last_checkin
-        return "OUT" if last_log == "IN" else "IN"
+    for logs in (pending, approved, checkins_today):
+        if logs:
+            return "OUT" if logs[-1].log_type == "IN" else "IN"
     
     # No checkins today, first should be IN
     return "IN"
 
 
-def _count_today_checkins(employee, target_date):
+def _last_checkin_from(remote_today, checkins_today):
     """
-    Count total checkins today (approved Remote + Employee Checkin).
+    Most recent entry among today's logs, shaped like _get_last_checkin.
     """
-    today_start = f"{target_date} 00:00:00"
-    today_end = f"{target_date} 23:59:59"
-    
-    remote_count = frappe.db.count(
-        "Remote Attendance",
-        filters={
-            "employee": employee,
-            "workflow_state": "Approved",
-            "time": ["between", [today_start, today_end]]
-        }
-    )
+    last_remote = remote_today[-1] if remote_today else None
+    last_checkin = checkins_today[-1] if checkins_today else None
     
-    checkin_count = frappe.db.count(
-        "Employee Checkin",
-        filters={
-            "employee": employee,
-            "time": ["between", [today_start, today_end]]
+    if last_remote and (not last_checkin or last_remote.time > last_checkin.time):
+        return {
+            "name": last_remote.name,
+            "log_type": last_remote.log_type,
+            "time": str(last_remote.time),
+            "status": last_remote.workflow_state,
+            "source": "remote"
         }
-    )
     
-    pending_count = frappe.db.count(
-        "Remote Attendance",
-        filters={
-            "employee": employee,
-            "workflow_state": "Pending",
-            "time": ["between", [today_start, today_end]]
+    if last_checkin:
+        return {
+            "name": last_checkin.name,
+            "log_type": last_checkin.log_type,
+            "time": str(last_checkin.time),
+            "status": "Approved",
+            "source": "biometric"
         }
-    )
     
-    return remote_count + checkin_count + pending_count
+    return None
 
 
 def _get_last_checkin(employee):
@@ -691,3 +749,37 @@ def _get_last_checkin(employee):
         "status": "Approved",
         "source": "biometric"
     }
+
+
+def _merged_punches(remote_logs, checkins):
+    """
+    Approved Remote Attendance and Employee Checkins, both ordered by time,
+    as one time-ordered punch stream. Approval inserts an Employee Checkin
+    for the request, so requests with a linked_checkin are already there.
+    """
+    approved = (r for r in remote_logs if r.workflow_state == "Approved" and not r.get("linked_checkin"))
+    return checkin_pairing.merge_punches(
+        checkin_pairing.punches(approved, "remote"),
+        checkin_pairing.punches(checkins, "biometric")
+    )
+
+
+def _get_logs_between(doctype, fields, employee, from_time, to_time):
+    """
+    An employee's rows with from_time <= time < to_time, ordered by time,
+    including archived rows when the range reaches the archive.
+    """
+    if archival.reaches_archive(doctype, from_time):
+        rows = archival.get_history(doctype, fields, employee, from_time, to_time)
+        return [r for r in rows if r.time < to_time]
+    
+    return frappe.get_all(
+        doctype,
+        filters=[
+            ["employee", "=", employee],
+            ["time", ">=", from_time],
+            ["time", "<", to_time]
+        ],
+        fields=fields,
+        order_by="time asc"
+    )
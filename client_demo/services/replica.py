@@ -0,0 +1,168 @@
+# File: client_demo/services/replica.py
+# Read-replica routing for the read-only client_demo endpoints
+# ============================================================
+#
+# Endpoints decorated with @replica_read run against the replica configured
+# in site config (read_from_replica, replica_host, replica_db_port, same as
+# frappe.read_only) unless
+#   - the replica is more than client_demo_replica_max_lag seconds behind
+#     (default 5). Lag is read with SHOW SLAVE STATUS at most every
+#     LAG_CHECK_SECONDS and shared through redis; a stopped replication
+#     thread or a failed check counts as too far behind. A server that is
+#     not replicating at all (e.g. a second local MariaDB loaded from a dump
+#     for testing) reports no status and counts as current.
+#   - the employee or user in the request wrote recently. Write paths call
+#     mark_write(employee) after committing, which pins that employee's
+#     reads to the primary for longer than the allowed lag.
+# The replica user needs the REPLICATION CLIENT privilege for the lag check.
+
+import functools
+import inspect
+
+import frappe
+
+from client_demo.services import metrics
+import client_demo.services.helper_functions as helpers
+
+
+DEFAULT_MAX_LAG = 5
+LAG_CHECK_SECONDS = 5
+REQUEST_PARAMS = ("employee", "user_id")
+
+
+# ============================================================
+# PUBLIC HELPERS
+# ============================================================
+
+def replica_read(fn):
+    """
+    Run the endpoint on the replica when it is safe to. Goes below
+    @frappe.whitelist.
+    """
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if getattr(frappe.local, "client_demo_on_replica", False):
+            return fn(*args, **kwargs)
+        if not _should_use_replica(signature.bind_partial(*args, **kwargs).arguments):
+            return fn(*args, **kwargs)
+        if not _switch_to_replica():
+            return fn(*args, **kwargs)
+
+        frappe.local.client_demo_on_replica = True
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            frappe.local.client_demo_on_replica = False
+            _switch_to_primary()
+
+    return wrapper
+
+
+def mark_write(employee):
+    """
+    Pin the employee's reads (by employee id and login) to the primary for
+    long enough for the write to reach the replica.
+    """
+    if not is_enabled() or not employee:
+        return
+    ttl = int(get_max_lag() + LAG_CHECK_SECONDS + 1)
+    context = helpers.get_employee_context(employee)
+    pipe = frappe.cache().pipeline()
+    for identity in {employee, context.user_id if context else None} - {None}:
+        pipe.setex(_key(f"write:{identity}"), ttl, 1)
+    pipe.execute()
+
+
+def is_enabled():
+    return bool(frappe.utils.cint(frappe.conf.get("read_from_replica")))
+
+
+def get_max_lag():
+    return frappe.utils.flt(frappe.conf.get("client_demo_replica_max_lag", DEFAULT_MAX_LAG))
+
+
+def get_replica_lag():
+    """
+    Seconds the replica is behind, from redis or measured on the current
+    (replica) connection. None when unknown.
+    """
+    cached = frappe.cache().execute_command("GET", _key("lag"))
+    if cached is not None:
+        lag = frappe.safe_decode(cached)
+        return None if lag == "unknown" else float(lag)
+
+    lag = _measure_lag()
+    frappe.cache().execute_command("SETEX", _key("lag"), LAG_CHECK_SECONDS, "unknown" if lag is None else lag)
+    return lag
+
+
+# ============================================================
+# HELPER FUNCTIONS (Private)
+# ============================================================
+
+def _should_use_replica(arguments):
+    if not is_enabled():
+        return False
+
+    identities = [str(arguments[p]) for p in REQUEST_PARAMS if arguments.get(p)]
+    if identities and frappe.cache().execute_command("EXISTS", *(_key(f"write:{i}") for i in identities)):
+        return False
+
+    # A lag already known to be too high saves connecting to the replica at all
+    cached = frappe.cache().execute_command("GET", _key("lag"))
+    return cached is None or _lag_ok(frappe.safe_decode(cached))
+
+
+def _switch_to_replica():
+    """
+    Swap frappe.db for a replica connection. Returns False, keeping the
+    primary, when the replica cannot be reached or is lagging.
+    """
+    try:
+        frappe.connect_replica()
+    except Exception:
+        frappe.log_error(frappe.get_traceback(), "client_demo Replica Connect Error")
+        return False
+
+    lag = get_replica_lag()
+    if not _lag_ok(lag):
+        _switch_to_primary()
+        return False
+
+    # Keep query counts in metrics covering replica reads
+    metrics.track_db()
+    return True
+
+
+def _switch_to_primary():
+    if not hasattr(frappe.local, "primary_db"):
+        return
+    frappe.local.db.close()
+    frappe.local.db = frappe.local.primary_db
+    # connect_replica() only swaps again when these are gone
+    del frappe.local.primary_db
+    del frappe.local.replica_db
+
+
+def _measure_lag():
+    try:
+        status = frappe.db.sql("SHOW SLAVE STATUS", as_dict=True)
+    except Exception:
+        return None
+    if not status:
+        # Not a replica; a standalone copy is as current as it will get
+        return 0.0
+    lag = status[0].get("Seconds_Behind_Master")
+    return None if lag is None else float(lag)
+
+
+def _lag_ok(lag):
+    if lag is None or lag == "unknown":
+        return False
+    return float(lag) <= get_max_lag()
+
+
+def _key(name):
+    return frappe.cache().make_key(f"client_demo:replica:{name}")
@@ -0,0 +1,139 @@
+# File: client_demo/services/shift_resolver.py
+# Which shift an employee works on a given day
+# ============================================================
+#
+# An employee's submitted, active Shift Assignments are loaded once, sorted
+# by start date and cached in redis per employee (dropped by the Shift
+# Assignment doc events in hooks.py). ShiftSchedule.shift_for(day) finds the
+# assignment covering a day with a binary search and falls back to the
+# employee's default_shift. Shift times come from the reference-data cache,
+# read once by get_shift_schedules and held by the schedules, so resolving a
+# shift never queries (exports resolve shifts while a cursor is streaming).
+
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+import frappe
+from frappe.utils import get_time, getdate
+
+import client_demo.services.helper_functions as helpers
+import client_demo.services.reference_data as reference_data
+
+
+ASSIGNMENT_CACHE_KEY = "client_demo:shift_assignments"
+
+
+class ShiftSchedule:
+    """
+    Shift Assignment intervals of one employee, sorted by start date.
+    """
+
+    def __init__(self, default_shift, assignments, shift_types=None):
+        self.default_shift = default_shift
+        self.shift_types = shift_types
+        self.assignments = sorted(assignments, key=lambda a: a["start_date"])
+        self.starts = [a["start_date"] for a in self.assignments]
+
+    def shift_type_for(self, day):
+        # Latest assignment starting on or before the day, if it has not ended
+        index = bisect_right(self.starts, day) - 1
+        if index >= 0:
+            end_date = self.assignments[index]["end_date"]
+            if end_date is None or end_date >= day:
+                return self.assignments[index]["shift_type"]
+        return self.default_shift
+
+    def shift_for(self, day):
+        """
+        The day's shift as datetimes: start, end (next day for overnight
+        shifts) and grace minutes. None when the employee has no shift.
+        """
+        day = getdate(day)
+        shift_type = self.shift_type_for(day)
+        if self.shift_types is not None:
+            shift = self.shift_types.get(shift_type) if shift_type else None
+        else:
+            shift = reference_data.get_shift(shift_type)
+        if not shift:
+            return None
+
+        start = datetime.combine(day, get_time(shift["start_time"]))
+        end = datetime.combine(day, get_time(shift["end_time"]))
+        if end <= start:
+            end += timedelta(days=1)
+
+        return frappe._dict(
+            shift_type=shift_type,
+            start=start,
+            end=end,
+            late_entry_grace_minutes=shift.get("late_entry_grace_period") or 0,
+            early_exit_grace_minutes=shift.get("early_exit_grace_period") or 0
+        )
+
+
+# ============================================================
+# PUBLIC HELPERS
+# ============================================================
+
+def get_shift_schedule(employee):
+    return get_shift_schedules([employee]).get(employee)
+
+
+def get_shift_schedules(employees=None):
+    """
+    {employee: ShiftSchedule} for a list of Employee docnames, or for every
+    employee when `employees` is None (exports; read in two queries, not cached).
+    """
+    shift_types = reference_data.get_dataset("shift_types")
+    if employees is None:
+        defaults = dict(frappe.db.sql("SELECT name, default_shift FROM `tabEmployee`"))
+        assignments = {}
+        for row in _load_assignments():
+            assignments.setdefault(row.pop("employee"), []).append(row)
+        return {
+            e: ShiftSchedule(shift, assignments.get(e, []), shift_types) for e, shift in defaults.items()
+        }
+
+    contexts = helpers.get_employee_contexts(employees)
+    cache = frappe.cache()
+    cached = {e: cache.hget(ASSIGNMENT_CACHE_KEY, e) for e in contexts}
+
+    missing = [e for e, value in cached.items() if value is None]
+    if missing:
+        loaded = {e: [] for e in missing}
+        for row in _load_assignments(missing):
+            loaded[row.pop("employee")].append(row)
+        for employee, rows in loaded.items():
+            cache.hset(ASSIGNMENT_CACHE_KEY, employee, rows)
+        cached.update(loaded)
+
+    return {
+        e: ShiftSchedule(context.default_shift, cached[e], shift_types) for e, context in contexts.items()
+    }
+
+
+# ============================================================
+# DOC EVENTS
+# ============================================================
+
+def invalidate_for_doc(doc, method=None):
+    frappe.cache().hdel(ASSIGNMENT_CACHE_KEY, doc.employee)
+
+
+# ============================================================
+# HELPER FUNCTIONS (Private)
+# ============================================================
+
+def _load_assignments(employees=None):
+    filters = {"docstatus": 1, "status": "Active"}
+    if employees is not None:
+        filters["employee"] = ["in", employees]
+    return [
+        {"employee": a.employee, "shift_type": a.shift_type, "start_date": a.start_date, "end_date": a.end_date}
+        for a in frappe.get_all(
+            "Shift Assignment",
+            filters=filters,
+            fields=["employee", "shift_type", "start_date", "end_date"],
+            order_by="start_date asc"
+        )
+    ]
@@ -0,0 +1,43 @@
+# Copyright (c) 2026, sil and Contributors
+# See license.txt
+
+from datetime import datetime, time
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate
+
+from client_demo.services import attendance_scheduler
+
+
+class TestAttendanceScheduler(FrappeTestCase):
+	def test_night_shift_is_one_present_day(self):
+		day = getdate("2026-01-14")
+		rows = [
+			frappe._dict(time=datetime.combine(day, time(22)), log_type="IN", location_type=None),
+			frappe._dict(time=datetime.combine(add_days(day, 1), time(6)), log_type="OUT", location_type=None),
+		]
+
+		pairs = attendance_scheduler.pairs_for_day(rows, day)
+		status, hours, in_time, out_time = attendance_scheduler._resolve_attendance(pairs, False, False, 4)
+		self.assertEqual((status, hours), ("Present", 8.0))
+		self.assertEqual(out_time, datetime.combine(add_days(day, 1), time(6)))
+
+		# The OUT belongs to the night before, not to a day of its own
+		self.assertEqual(attendance_scheduler.pairs_for_day(rows, add_days(day, 1)), [])
+
+	def test_night_shift_still_running_is_left_for_later(self):
+		day = getdate("2026-01-14")
+		pairs = attendance_scheduler.pairs_for_day(
+			[frappe._dict(time=datetime.combine(day, time(22)), log_type="IN", location_type=None)], day
+		)
+		shift = frappe._dict(
+			start=datetime.combine(day, time(22)), end=datetime.combine(add_days(day, 1), time(6))
+		)
+		at_quarter_past_midnight = datetime.combine(add_days(day, 1), time(0, 15))
+
+		self.assertTrue(attendance_scheduler._day_still_open(pairs, shift, at_quarter_past_midnight))
+		self.assertTrue(attendance_scheduler._day_still_open(pairs, None, at_quarter_past_midnight))
+		self.assertFalse(
+			attendance_scheduler._day_still_open(pairs, shift, datetime.combine(add_days(day, 2), time(0, 15)))
+		)
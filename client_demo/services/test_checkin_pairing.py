@@ -0,0 +1,63 @@
+# Copyright (c) 2026, sil and Contributors
+# See license.txt
+
+from datetime import datetime, time
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate
+
+from client_demo.services import checkin_dummy, remote_attendance, shift_resolver
+
+
+class TestCheckinPairing(FrappeTestCase):
+	def test_approved_remote_pair_is_counted_once(self):
+		# Approval inserts an Employee Checkin for each request and links it
+		day = getdate("2026-01-14")
+		remote = [
+			frappe._dict(
+				name="RA-1", log_type="IN", time=datetime.combine(day, time(9)), location_type="Field",
+				workflow_state="Approved", linked_checkin="CHKIN-1",
+			),
+			frappe._dict(
+				name="RA-2", log_type="OUT", time=datetime.combine(day, time(13)), location_type=None,
+				workflow_state="Approved", linked_checkin="CHKIN-2",
+			),
+		]
+		checkins = [
+			frappe._dict(name="CHKIN-1", log_type="IN", time=datetime.combine(day, time(9))),
+			frappe._dict(name="CHKIN-2", log_type="OUT", time=datetime.combine(day, time(13))),
+		]
+
+		pairs, total_hours = remote_attendance.build_checkin_pairs(remote, checkins)
+		self.assertEqual([(p["in_time"], p["out_time"]) for p in pairs], [("09:00", "13:00")])
+		self.assertEqual(total_hours, 4.0)
+
+	def test_overnight_pair_counts_for_the_day_of_its_in(self):
+		day = getdate("2026-01-14")
+		schedules = {
+			"_T-NIGHT": shift_resolver.ShiftSchedule(
+				"_T-Night",
+				[],
+				{
+					"_T-Night": {
+						"start_time": "22:00:00",
+						"end_time": "06:00:00",
+						"late_entry_grace_period": 10,
+						"early_exit_grace_period": 0,
+					}
+				},
+			)
+		}
+		rows = [
+			frappe._dict(employee="_T-NIGHT", time=datetime.combine(day, time(22, 25)), log_type="IN"),
+			frappe._dict(employee="_T-NIGHT", time=datetime.combine(add_days(day, 1), time(7, 30)), log_type="OUT"),
+		]
+
+		summaries = checkin_dummy.process_daily_summaries(rows, schedules, day, add_days(day, 1))
+		self.assertEqual([s["date"] for s in summaries], [day.isoformat()])
+		self.assertEqual(summaries[0]["daily_working_hours"], 9.08)
+		self.assertEqual(summaries[0]["exit_time"], "07:30")
+		self.assertEqual(summaries[0]["late_minutes"], 25)
+		self.assertEqual(summaries[0]["early_exit_minutes"], 0)
+		self.assertEqual(summaries[0]["overtime_hours"], 1.5)
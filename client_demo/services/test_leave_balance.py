@@ -0,0 +1,159 @@
+# Copyright (c) 2026, sil and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, get_year_start, getdate, now_datetime, today
+
+from client_demo.services import leave_balance
+
+EMPLOYEE = "_T-LEDGER-E"
+LEAVE_TYPE = "Casual Leave"
+COMMON = ["name", "creation", "modified", "modified_by", "owner", "docstatus"]
+
+
+class TestLeaveBalance(FrappeTestCase):
+	"""
+	Every doc event must leave the cached ledger equal to a fresh
+	_build_ledger of the same rows.
+	"""
+
+	def setUp(self):
+		self.clear()
+		self.period_start = get_year_start(today())
+		self.period_end = add_days(self.period_start, 364)
+		self.leave_date = add_days(self.period_start, 30)
+		current_time = now_datetime()
+
+		frappe.db.bulk_insert(
+			"Employee",
+			[*COMMON, "first_name", "employee_name", "company", "status", "gender", "date_of_birth",
+			"date_of_joining"],
+			[(EMPLOYEE, current_time, current_time, "Administrator", "Administrator", 0, EMPLOYEE, EMPLOYEE,
+			frappe.db.get_value("Company", {}, "name"), "Active", "Male", "1990-01-01", "2020-01-01")],
+		)
+		self.insert_allocation("_T-LEDGER-LAL-0", self.period_start, self.period_end, 12)
+		frappe.db.commit()
+
+		# Cache the ledger, as a first read would
+		leave_balance.invalidate_ledger(EMPLOYEE)
+		leave_balance.get_ledger(EMPLOYEE)
+
+	def tearDown(self):
+		self.clear()
+
+	def clear(self):
+		for doctype, field in (
+			("Leave Application", "employee"),
+			("Leave Allocation", "employee"),
+			("Employee", "name"),
+		):
+			frappe.db.delete(doctype, {field: EMPLOYEE})
+		frappe.db.commit()
+		leave_balance.invalidate_ledger(EMPLOYEE)
+
+	def insert_allocation(self, name, from_date, to_date, leaves):
+		current_time = now_datetime()
+		frappe.db.bulk_insert(
+			"Leave Allocation",
+			[*COMMON, "employee", "employee_name", "leave_type", "from_date", "to_date",
+			"new_leaves_allocated", "total_leaves_allocated"],
+			[(name, current_time, current_time, "Administrator", "Administrator", 1, EMPLOYEE, EMPLOYEE,
+			LEAVE_TYPE, from_date, to_date, leaves, leaves)],
+		)
+		return event_doc(name=name, from_date=from_date, to_date=to_date, total_leaves_allocated=leaves)
+
+	def insert_application(self, name, docstatus, status, days=2):
+		current_time = now_datetime()
+		frappe.db.bulk_insert(
+			"Leave Application",
+			[*COMMON, "employee", "employee_name", "leave_type", "from_date", "to_date", "total_leave_days",
+			"status", "posting_date"],
+			[(name, current_time, current_time, "Administrator", "Administrator", docstatus, EMPLOYEE,
+			EMPLOYEE, LEAVE_TYPE, self.leave_date, add_days(self.leave_date, days - 1), days, status,
+			self.period_start)],
+		)
+		return event_doc(
+			name=name, docstatus=docstatus, status=status, from_date=self.leave_date, total_leave_days=days
+		)
+
+	def save(self, doc, **changes):
+		# What the saving transaction writes; returns the document as the hooks see it
+		frappe.db.set_value("Leave Application", doc.name, changes, update_modified=False)
+		fields = {key: value for key, value in doc.items() if key not in ("flags", "get_doc_before_save")}
+		return event_doc(before=doc, **{**fields, **changes})
+
+	def assertLedgerMatchesDatabase(self):
+		frappe.db.commit()  # runs the after_commit updates
+		cached = leave_balance.get_ledger(EMPLOYEE)
+		leave_balance.invalidate_ledger(EMPLOYEE)
+		self.assertEqual(sort_ledger(cached), sort_ledger(leave_balance.get_ledger(EMPLOYEE)))
+		return cached
+
+	def test_submitting_an_open_draft_moves_pending_to_taken(self):
+		draft = self.insert_application("_T-LEDGER-LA-0", 0, "Open")
+		leave_balance.on_application_insert(draft)
+		self.assertEqual(self.assertLedgerMatchesDatabase()[0]["pending"], 2)
+
+		leave_balance.on_application_submit(self.save(draft, docstatus=1, status="Approved"))
+		ledger = self.assertLedgerMatchesDatabase()
+		self.assertEqual((ledger[0]["pending"], ledger[0]["taken"], ledger[0]["balance"]), (0, 2, 10))
+
+	def test_submitting_a_draft_that_was_not_open_leaves_pending_alone(self):
+		# An Open draft elsewhere keeps pending above zero, so a wrong decrement shows
+		self.insert_application("_T-LEDGER-LA-0", 0, "Open")
+		draft = self.insert_application("_T-LEDGER-LA-1", 0, "Approved", days=3)
+		leave_balance.invalidate_ledger(EMPLOYEE)
+		leave_balance.get_ledger(EMPLOYEE)
+
+		leave_balance.on_application_submit(self.save(draft, docstatus=1))
+		ledger = self.assertLedgerMatchesDatabase()
+		self.assertEqual((ledger[0]["pending"], ledger[0]["taken"]), (2, 3))
+
+	def test_submitting_a_rejected_application_only_clears_pending(self):
+		draft = self.insert_application("_T-LEDGER-LA-0", 0, "Open")
+		leave_balance.on_application_insert(draft)
+
+		leave_balance.on_application_submit(self.save(draft, docstatus=1, status="Rejected"))
+		ledger = self.assertLedgerMatchesDatabase()
+		self.assertEqual((ledger[0]["pending"], ledger[0]["taken"]), (0, 0))
+
+	def test_cancelling_an_approved_application_returns_the_days(self):
+		submitted = self.insert_application("_T-LEDGER-LA-0", 1, "Approved")
+		leave_balance.invalidate_ledger(EMPLOYEE)
+		leave_balance.get_ledger(EMPLOYEE)
+
+		leave_balance.on_application_cancel(self.save(submitted, docstatus=2, status="Cancelled"))
+		ledger = self.assertLedgerMatchesDatabase()
+		self.assertEqual((ledger[0]["taken"], ledger[0]["balance"]), (0, 12))
+
+	def test_allocations_in_known_and_new_periods(self):
+		top_up = self.insert_allocation("_T-LEDGER-LAL-1", self.period_start, self.period_end, 3)
+		leave_balance.on_allocation_submit(top_up)
+		self.assertEqual(self.assertLedgerMatchesDatabase()[0]["allocated"], 15)
+
+		next_start = add_days(self.period_end, 1)
+		next_year = self.insert_allocation("_T-LEDGER-LAL-2", next_start, add_days(next_start, 364), 10)
+		leave_balance.on_allocation_submit(next_year)
+		ledger = self.assertLedgerMatchesDatabase()
+		self.assertEqual([entry["allocated"] for entry in sort_ledger(ledger)], [15, 10])
+
+		frappe.db.set_value("Leave Allocation", top_up.name, "docstatus", 2, update_modified=False)
+		leave_balance.on_allocation_cancel(top_up)
+		ledger = self.assertLedgerMatchesDatabase()
+		self.assertEqual([entry["allocated"] for entry in sort_ledger(ledger)], [12, 10])
+
+
+def event_doc(before=None, **fields):
+	"""
+	Enough of a Leave Application / Leave Allocation for the doc event handlers.
+	"""
+	doc = frappe._dict({"employee": EMPLOYEE, "leave_type": LEAVE_TYPE, **fields})
+	doc.from_date = getdate(doc.from_date)
+	doc.flags = frappe._dict()
+	doc.get_doc_before_save = lambda: before
+	return doc
+
+
+def sort_ledger(ledger):
+	return sorted(ledger, key=lambda entry: (entry["leave_type"], entry["from_date"]))
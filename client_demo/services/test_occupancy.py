@@ -0,0 +1,57 @@
+# Copyright (c) 2026, sil and Contributors
+# See license.txt
+
+from datetime import datetime, time
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from client_demo.services import occupancy
+
+# A day long past, so these counters never mix with a live site's
+DAY = getdate("2000-01-03")
+EMPLOYEE = "_T-OCC-E"
+LOCATION = "_T-Gate"
+DEPARTMENT = "_T-Security"
+
+
+class TestOccupancy(FrappeTestCase):
+	def setUp(self):
+		self.clear()
+
+	def tearDown(self):
+		self.clear()
+
+	def clear(self):
+		frappe.cache().execute_command(
+			"DEL",
+			*(
+				occupancy._key(str(DAY), name)
+				for name in ("state", "counts", f"location:{LOCATION}", f"department:{DEPARTMENT}")
+			),
+		)
+
+	def punch(self, log_type, minute):
+		occupancy._record(
+			str(DAY), EMPLOYEE, log_type, datetime.combine(DAY, time(0, minute)), LOCATION, DEPARTMENT
+		)
+
+	def inside(self):
+		counts = frappe.cache().execute_command("HGETALL", occupancy._key(str(DAY), "counts"))
+		members = frappe.cache().execute_command("SMEMBERS", occupancy._key(str(DAY), f"location:{LOCATION}"))
+		return (
+			{frappe.safe_decode(field): int(value) for field, value in counts.items()},
+			sorted(frappe.safe_decode(m) for m in members),
+		)
+
+	def test_occupancy_follows_the_latest_punch(self):
+		self.punch("IN", 2)
+		self.punch("OUT", 1)  # uploaded late, older than the IN
+		self.assertEqual(
+			self.inside(),
+			({f"location:{LOCATION}": 1, f"department:{DEPARTMENT}": 1, "total": 1}, [EMPLOYEE]),
+		)
+
+		self.punch("OUT", 3)
+		self.assertEqual(self.inside(), ({}, []))
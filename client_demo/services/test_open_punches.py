@@ -0,0 +1,56 @@
+# Copyright (c) 2026, sil and Contributors
+# See license.txt
+
+from datetime import datetime, time
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate, now_datetime, today
+
+from client_demo.services import open_punches
+
+EMPLOYEE = "_T-OPEN-E"
+COMMON = ["name", "creation", "modified", "modified_by", "owner", "docstatus"]
+
+
+class TestOpenPunches(FrappeTestCase):
+	def setUp(self):
+		self.clear()
+		current_time = now_datetime()
+		frappe.db.bulk_insert(
+			"Employee",
+			[*COMMON, "first_name", "employee_name", "company", "status", "gender", "date_of_birth",
+			"date_of_joining"],
+			[(EMPLOYEE, current_time, current_time, "Administrator", "Administrator", 0, EMPLOYEE, EMPLOYEE,
+			frappe.db.get_value("Company", {}, "name"), "Active", "Male", "1990-01-01", "2020-01-01")],
+		)
+
+		# The day before yesterday ends with an OUT; yesterday's last IN was never closed
+		self.yesterday = getdate(add_days(today(), -1))
+		punches = [(add_days(self.yesterday, -1), "IN", 9), (add_days(self.yesterday, -1), "OUT", 17),
+			(self.yesterday, "IN", 9), (self.yesterday, "OUT", 13), (self.yesterday, "IN", 19)]
+		frappe.db.bulk_insert(
+			"Employee Checkin",
+			[*COMMON, "employee", "employee_name", "time", "log_type"],
+			[(f"{EMPLOYEE}-{day}-{hour}", current_time, current_time, "Administrator", "Administrator", 0,
+			EMPLOYEE, EMPLOYEE, datetime.combine(day, time(hour)), log_type) for day, log_type, hour in punches],
+		)
+		frappe.db.commit()
+
+	def tearDown(self):
+		self.clear()
+
+	def clear(self):
+		frappe.db.delete("Employee Checkin", {"employee": EMPLOYEE})
+		frappe.db.delete("Employee", {"name": EMPLOYEE})
+		frappe.db.commit()
+
+	def test_unpaired_final_ins_are_found_per_employee_day(self):
+		found = [
+			row
+			for row in open_punches.find_unpaired_ins(add_days(self.yesterday, -1), self.yesterday)
+			if row.employee == EMPLOYEE
+		]
+		self.assertEqual(
+			[(row.doctype, row.name) for row in found], [("Employee Checkin", f"{EMPLOYEE}-{self.yesterday}-19")]
+		)
@@ -0,0 +1,41 @@
+# Copyright (c) 2026, sil and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from client_demo.services import replica
+
+EMPLOYEE = "_T-REPLICA-E"
+OTHER_EMPLOYEE = "_T-REPLICA-OTHER"
+
+
+class TestReplica(FrappeTestCase):
+	def setUp(self):
+		# Point read_from_replica / replica_host / replica_db_port at a second
+		# MariaDB (a replica, or a copy of this site's database) to run these
+		if not replica.is_enabled():
+			self.skipTest("read_from_replica is not configured for this site")
+		self.clear()
+
+	def tearDown(self):
+		self.clear()
+
+	def clear(self):
+		frappe.cache().execute_command(
+			"DEL", replica._key("lag"), replica._key(f"write:{EMPLOYEE}"), replica._key(f"write:{OTHER_EMPLOYEE}")
+		)
+
+	def test_replica_routing_keeps_read_your_writes(self):
+		primary = frappe.db
+
+		@replica.replica_read
+		def read(employee):
+			return frappe.db is not primary
+
+		self.assertTrue(read(EMPLOYEE), msg="read did not go to the replica")
+		self.assertIs(frappe.db, primary)
+
+		replica.mark_write(EMPLOYEE)
+		self.assertFalse(read(EMPLOYEE), msg="read after a write went to the replica")
+		self.assertTrue(read(OTHER_EMPLOYEE))
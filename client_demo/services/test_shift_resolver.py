@@ -0,0 +1,38 @@
+# Copyright (c) 2026, sil and Contributors
+# See license.txt
+
+from datetime import datetime, time
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate
+
+from client_demo.services import checkin_dummy, shift_resolver
+
+
+class TestShiftResolver(FrappeTestCase):
+	def test_shift_metrics_follow_assignments(self):
+		day = getdate("2026-01-14")
+		schedule = shift_resolver.ShiftSchedule(
+			None,
+			[{"shift_type": "_T-Night", "start_date": add_days(day, -3), "end_date": add_days(day, 3)}],
+		)
+		shift = frappe._dict(
+			start=datetime.combine(day, time(22)),
+			end=datetime.combine(add_days(day, 1), time(6)),
+			late_entry_grace_minutes=10,
+			early_exit_grace_minutes=0,
+		)
+		self.assertEqual(schedule.shift_type_for(day), "_T-Night")
+		self.assertIsNone(schedule.shift_type_for(add_days(day, 4)))
+
+		summary = checkin_dummy.calculate_daily_work_hours(
+			[
+				frappe._dict(time=datetime.combine(day, time(22, 25)), log_type="IN"),
+				frappe._dict(time=datetime.combine(add_days(day, 1), time(7, 30)), log_type="OUT"),
+			],
+			shift=shift,
+		)
+		self.assertEqual(summary["late_minutes"], 25)
+		self.assertEqual(summary["early_exit_minutes"], 0)
+		self.assertEqual(summary["overtime_hours"], 1.5)